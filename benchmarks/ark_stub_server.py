@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+本地火山引擎ARK（OpenAI 兼容 chat/completions）替身服务
+按提示词生成与真实模型格式一致的输出（批量分析、单个产品分析、评分、翻译、每日总结），
+支持普通响应与 stream: true 的 SSE 流式响应（stream_options.include_usage 时在结束前单独发送 usage），并可模拟：
+- 首个token延迟分布（固定、均匀、对数正态、帕累托长尾）与输出吞吐（tokens/s）
+- 按比例注入 429（带 Retry-After）与 5xx 错误
+- 按比例截断输出（finish_reason 为 length，流式响应不发送 [DONE]）
+
+使用方法:
+python benchmarks/ark_stub_server.py --port 8766                 # 启动替身服务
+# 然后将 config.yaml 中 ai.base_url 指向 http://127.0.0.1:8766/api/v3
+
+python benchmarks/ark_stub_server.py --port 8766 --latency-dist lognormal --rate-limit-rate 0.1 --truncate-rate 0.05
+python benchmarks/ark_stub_server.py --selftest --products 20    # 对比普通与流式调用的首个产品到达时间
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+PRODUCT_PATTERN = re.compile(r'^产品 (\d+):\n- 名称: (.*)$', re.M)
+SINGLE_PRODUCT_PATTERN = re.compile(r'^产品名称: (.*)$', re.M)
+SEGMENT_PATTERN = re.compile(r'^\d+\. (.*)$', re.M)
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal', 'pareto')
+
+
+@dataclass
+class StubProfile:
+    """替身服务的延迟、吞吐与故障注入配置"""
+    first_token_latency: float = 0.2  # 首个token前延迟的中位数（秒）
+    latency_dist: str = 'fixed'
+    latency_jitter: float = 0.5  # uniform 为相对幅度，lognormal 为 sigma，pareto 越大尾部越长
+    tokens_per_second: float = 500.0
+    rate_limit_rate: float = 0.0  # 返回 429 的比例
+    retry_after: float = 1.0  # 429 响应的 Retry-After（秒）
+    error_rate: float = 0.0  # 返回 500/503 的比例
+    truncate_rate: float = 0.0  # 输出被截断的比例
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"未知的延迟分布: {self.latency_dist}")
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def sample_latency(self) -> float:
+        """按分布采样首个token前的延迟"""
+        base = self.first_token_latency
+        with self._lock:
+            if self.latency_dist == 'uniform':
+                return max(0.0, self._random.uniform(base * (1 - self.latency_jitter), base * (1 + self.latency_jitter)))
+            if self.latency_dist == 'lognormal':
+                return base * self._random.lognormvariate(0, self.latency_jitter)
+            if self.latency_dist == 'pareto':
+                # 中位数为 base 的帕累托分布
+                alpha = 1 / max(self.latency_jitter, 0.05)
+                return base / 2 ** (1 / alpha) * self._random.paretovariate(alpha)
+            return base
+
+    def roll(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def truncate_at(self, count: int) -> int:
+        """截断位置：保留 30%-90% 的输出"""
+        with self._lock:
+            return max(1, int(count * self._random.uniform(0.3, 0.9)))
+
+
+def build_completion(prompt: str) -> str:
+    """根据提示词生成模型输出"""
+    products = PRODUCT_PATTERN.findall(prompt)
+    if products:
+        return json.dumps({"products": [{
+            "index": int(index),
+            "ai_relevance_score": 0.8,
+            "translated_description": f"{name} 是一款面向团队的人工智能工具，帮助用户自动完成日常工作流程。",
+            "application_scenarios": ["团队协作", "流程自动化", "数据分析"],
+            "founder_insights": f"创始人希望通过 {name} 解决重复劳动的问题。"
+        } for index, name in products]}, ensure_ascii=False, indent=2)
+
+    single = SINGLE_PRODUCT_PATTERN.search(prompt)
+    if single and '"ai_relevance_score"' in prompt:
+        name = single.group(1)
+        return json.dumps({
+            "ai_relevance_score": 0.8,
+            "translated_description": f"{name} 是一款面向团队的人工智能工具，帮助用户自动完成日常工作流程。",
+            "application_scenarios": ["团队协作", "流程自动化", "数据分析"],
+            "founder_insights": f"创始人希望通过 {name} 解决重复劳动的问题。"
+        }, ensure_ascii=False, indent=2)
+    if single and '直接返回数字评分' in prompt:
+        return "0.8"
+    if '个英文句子分别翻译为中文' in prompt:
+        return json.dumps([f"译文：{segment}" for segment in SEGMENT_PATTERN.findall(prompt)], ensure_ascii=False)
+    if prompt.startswith('请将以下英文翻译为中文'):
+        return "这是一段中文译文。"
+    return "今日AI产品集中在智能助手与开发者工具方向，多模态与智能体应用持续增多。"
+
+
+def split_tokens(text: str, size: int = 4):
+    """按固定字符数切分，近似模型逐token输出"""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class ArkStubHandler(BaseHTTPRequestHandler):
+    """chat/completions 替身"""
+
+    profile = StubProfile()
+    stats: Counter = Counter()
+    stats_lock = threading.Lock()
+
+    @classmethod
+    def count(cls, key: str, value: int = 1):
+        with cls.stats_lock:
+            cls.stats[key] += value
+
+    def do_POST(self):
+        self.count("requests")
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            return self._send_json(404, {"error": {"message": "Not found"}})
+
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        profile = self.profile
+
+        if profile.roll(profile.rate_limit_rate):
+            self.count("rate_limited")
+            return self._send_json(429, {"error": {"message": "Too many requests"}},
+                                   {"Retry-After": f"{profile.retry_after:g}"})
+        if profile.roll(profile.error_rate):
+            self.count("errors")
+            return self._send_json(random.choice((500, 503)), {"error": {"message": "Internal error"}})
+
+        prompt = "\n".join(message.get('content', '') for message in payload.get('messages', []))
+        tokens = split_tokens(build_completion(prompt))
+        finish_reason = "stop"
+        if profile.roll(profile.truncate_rate):
+            self.count("truncated")
+            tokens = tokens[:profile.truncate_at(len(tokens))]
+            finish_reason = "length"
+        self.count("completion_tokens", len(tokens))
+
+        time.sleep(profile.sample_latency())
+        token_latency = 1 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(tokens),
+                 "total_tokens": len(prompt) // 4 + len(tokens)}
+        if payload.get('stream'):
+            include_usage = (payload.get('stream_options') or {}).get('include_usage')
+            return self._send_stream(payload.get('model', ''), tokens, token_latency, finish_reason,
+                                     usage if include_usage else None)
+
+        time.sleep(token_latency * len(tokens))
+        self._send_json(200, {
+            "id": "stub",
+            "object": "chat.completion",
+            "model": payload.get('model', ''),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                         "finish_reason": finish_reason}],
+            "usage": usage
+        })
+
+    def _send_stream(self, model: str, tokens, token_latency: float, finish_reason: str, usage: dict = None):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        # 约每 10ms 发送一组，避免逐token睡眠时精度不足
+        group = max(1, int(0.01 / token_latency)) if token_latency else max(1, len(tokens))
+        for start in range(0, len(tokens), group):
+            for token in tokens[start:start + group]:
+                chunk = {"id": "stub", "object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(token_latency * len(tokens[start:start + group]))
+        if finish_reason == "length":
+            # 模拟输出中途断开：不发送结束标记
+            return
+        final = {"id": "stub", "object": "chat.completion.chunk", "model": model,
+                 "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}]}
+        self.wfile.write(f"data: {json.dumps(final)}\n\n".encode('utf-8'))
+        if usage:
+            # 与 OpenAI 兼容接口一致：usage 单独作为最后一个数据块，choices 为空
+            chunk = {"id": "stub", "object": "chat.completion.chunk", "model": model, "choices": [], "usage": usage}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port: int, profile: StubProfile = None) -> ThreadingHTTPServer:
+    ArkStubHandler.profile = profile or StubProfile()
+    ArkStubHandler.stats = Counter()
+    server = ThreadingHTTPServer(('127.0.0.1', port), ArkStubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """替身服务的延迟与故障注入参数，负载测试脚本共用"""
+    parser.add_argument('--first-token-latency', type=float, default=0.2, help='首个token前延迟的中位数（秒）')
+    parser.add_argument('--latency-dist', choices=LATENCY_DISTRIBUTIONS, default='fixed', help='首个token延迟分布')
+    parser.add_argument('--latency-jitter', type=float, default=0.5,
+                        help='延迟离散程度（uniform 为相对幅度，lognormal 为 sigma，pareto 越大尾部越长）')
+    parser.add_argument('--tokens-per-second', type=float, default=500, help='输出吞吐（tokens/s）')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='返回 429 的比例')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='429 响应的 Retry-After（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回 500/503 的比例')
+    parser.add_argument('--truncate-rate', type=float, default=0.0, help='输出被截断的比例')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+
+
+def profile_from_args(args) -> StubProfile:
+    return StubProfile(
+        first_token_latency=args.first_token_latency,
+        latency_dist=args.latency_dist,
+        latency_jitter=args.latency_jitter,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        truncate_rate=args.truncate_rate,
+        seed=args.seed
+    )
+
+
+def selftest(product_count: int) -> int:
+    import asyncio
+    from src import ai_analyzer
+    from src.llm_client import AsyncLLMClient
+    from src.models import ProductInfo
+
+    # 替身测试不读写本地缓存
+    ai_analyzer.llm_cache = None
+    server = start_server(0)
+    analyzer = ai_analyzer.AsyncAIAnalyzer()
+    analyzer.provider = 'volcengine_ark'
+    analyzer.client = AsyncLLMClient(f"http://127.0.0.1:{server.server_address[1]}/api/v3/chat/completions",
+                                     "stub-key")
+
+    def make_products():
+        return [ProductInfo(name=f"Product {i}", tagline="AI workflow assistant",
+                            description="An AI assistant that automates team workflows.",
+                            url=f"https://product{i}.example.com",
+                            original_url=f"https://www.producthunt.com/posts/product-{i}",
+                            ranking=i, votes=100 - i) for i in range(1, product_count + 1)]
+
+    async def run():
+        results = {}
+        async with analyzer:
+            for stream in (False, True):
+                analyzer.stream = stream
+                products = make_products()
+                start = time.perf_counter()
+                first = None
+                analyzed = []
+                if stream:
+                    async for product in analyzer.iter_batch_analysis(products):
+                        first = first or time.perf_counter() - start
+                        analyzed.append(product)
+                else:
+                    analyzed = await analyzer._analyze_batch(products)
+                    first = time.perf_counter() - start
+                results[stream] = (first, time.perf_counter() - start, analyzed)
+                mode = "流式" if stream else "普通"
+                print(f"{mode}: {len(analyzed)} 个产品，首个产品 {first * 1000:.0f} ms，全部完成 "
+                      f"{results[stream][1] * 1000:.0f} ms")
+        return results
+
+    results = asyncio.run(run())
+    server.shutdown()
+    ok = (all(len(result[2]) == product_count for result in results.values())
+          and results[True][2][0].translated_description.startswith("Product 1 ")
+          and results[True][0] < results[False][0])
+    print("✅ 自检通过" if ok else "❌ 自检失败")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地火山引擎ARK替身服务")
+    parser.add_argument('--port', type=int, default=8766)
+    add_profile_arguments(parser)
+    parser.add_argument('--products', type=int, default=20, help='自检时的产品数量')
+    parser.add_argument('--selftest', action='store_true', help='启动服务并对比普通与流式调用')
+    args = parser.parse_args()
+
+    if args.selftest:
+        return selftest(args.products)
+
+    server = start_server(args.port, profile_from_args(args))
+    print(f"ARK 替身服务已启动: http://127.0.0.1:{args.port}/api/v3/chat/completions")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"请求统计: {dict(ArkStubHandler.stats)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
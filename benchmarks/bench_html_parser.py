@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Product Hunt 首页解析基准测试
+对比流式解析器（lxml HTMLPullParser）与原 BeautifulSoup(response.content, 'lxml') 路径
+的单页解析耗时与峰值内存
+
+使用方法:
+python benchmarks/bench_html_parser.py                      # 使用 benchmarks/snapshots/*.html
+python benchmarks/bench_html_parser.py --snapshots 目录      # 指定首页快照目录
+python benchmarks/bench_html_parser.py --synthetic 500      # 无快照时生成含500个产品的模拟首页
+python benchmarks/bench_html_parser.py --archive .cache/snapshots  # 使用抓取时归档的真实页面
+
+每个 (解析器, 页面) 组合在独立子进程中运行，峰值内存取 ru_maxrss 增量（含 libxml2 的C层分配），
+同时给出 tracemalloc 统计的 Python 堆峰值。
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'snapshots')
+PARSERS = ('streaming', 'beautifulsoup')
+
+
+def build_synthetic_homepage(product_count: int) -> bytes:
+    """生成结构接近真实首页的模拟页面（内嵌Apollo状态 + post-item区块）"""
+    posts = []
+    sections = []
+    for i in range(1, product_count + 1):
+        slug = f"product-{i}"
+        posts.append({
+            "__typename": "Post",
+            "id": str(i),
+            "name": f"Product {i}",
+            "tagline": f"AI-powered tool number {i} for modern teams",
+            "slug": slug,
+            "votesCount": 1000 - i,
+            "dailyRank": i,
+            "thumbnailImageUuid": f"uuid-{i}.png",
+            "topics": {"edges": [{"node": {"__typename": "Topic", "name": "Artificial Intelligence"}},
+                                 {"node": {"__typename": "Topic", "name": "Productivity"}}]}
+        })
+        sections.append(
+            f'<section data-test="post-item-{i}"><div class="flex">'
+            f'<img src="https://ph-files.imgix.net/uuid-{i}.png" alt="Product {i}"/>'
+            f'<div><a data-test="post-name-{i}" href="/posts/{slug}">{i}. Product {i}</a>'
+            f'<a data-test="post-tagline-{i}" href="/posts/{slug}">AI-powered tool number {i} for modern teams</a>'
+            f'<div><a href="/topics/artificial-intelligence">Artificial Intelligence</a>'
+            f'<a href="/topics/productivity">Productivity</a></div></div>'
+            f'<button data-test="vote-button"><div>{1000 - i}</div></button>'
+            f'</div></section>'
+        )
+
+    state = {"rehydrate": {}, "events": [{"type": "next", "value": {"data": {"homefeed": {
+        "edges": [{"node": {"items": posts}}]}}}}]}
+    script = ('(window[Symbol.for("ApolloSSRDataTransport")] ??= []).push('
+              + json.dumps(state) + ');')
+    html = ('<!DOCTYPE html><html><head><title>Product Hunt – The best new products in tech.</title>'
+            + '<style>' + ('.x{color:red}' * 2000) + '</style></head><body><main>'
+            + ''.join(sections)
+            + f'</main><script>{script}</script></body></html>')
+    return html.encode('utf-8')
+
+
+def export_archive_pages(archive_dir: str, target_dir: str) -> list:
+    """将快照归档中的列表页（去重后）导出为 HTML 文件"""
+    from src.scrapers.snapshot_archive import SnapshotArchive
+
+    archive = SnapshotArchive(archive_dir)
+    paths = []
+    seen = set()
+    for entry in archive.iter_entries():
+        if entry.get("status") != 200 or "/posts/" in entry["url"] or entry["digest"] in seen:
+            continue
+        seen.add(entry["digest"])
+        path = os.path.join(target_dir, f"archive_{entry['digest'][:12]}.html")
+        with open(path, 'wb') as f:
+            f.write(archive.read(entry["digest"], entry.get("compression")))
+        paths.append(path)
+    return paths
+
+
+def _run_streaming(content: bytes) -> int:
+    from src.scrapers.ph_html_parser import parse_products_html
+    return len(parse_products_html(content))
+
+
+def _run_beautifulsoup(content: bytes) -> int:
+    # 原实现的解析路径：构建完整文档树
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, 'lxml')
+    return len(soup.select('section[data-test^="post-item-"]'))
+
+
+def run_worker(parser_name: str, path: str) -> dict:
+    """在当前进程内完成一次解析并输出测量结果"""
+    # 预先导入依赖，避免把模块加载计入峰值内存
+    import lxml.etree  # noqa: F401
+    import bs4  # noqa: F401
+    from src.scrapers import ph_html_parser  # noqa: F401
+
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    runner = _run_streaming if parser_name == 'streaming' else _run_beautifulsoup
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = runner(content)
+    elapsed = time.perf_counter() - start
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "parser": parser_name,
+        "page": os.path.basename(path),
+        "bytes": len(content),
+        "products": count,
+        "seconds": elapsed,
+        "py_peak_kb": py_peak / 1024,
+        "rss_peak_kb": max(0, rss_after - rss_before),
+    }
+
+
+def measure(parser_name: str, path: str) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), '--worker', parser_name, path],
+        cwd=ROOT_DIR
+    )
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Product Hunt 首页解析基准测试")
+    arg_parser.add_argument('--snapshots', default=DEFAULT_SNAPSHOT_DIR, help='首页快照目录 (*.html)')
+    arg_parser.add_argument('--synthetic', type=int, default=0, help='生成含N个产品的模拟首页')
+    arg_parser.add_argument('--archive', help='快照归档目录（使用其中的列表页）')
+    arg_parser.add_argument('--worker', nargs=2, metavar=('PARSER', 'PATH'), help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return 0
+
+    pages = sorted(glob.glob(os.path.join(args.snapshots, '*.html')))
+    temp_dir = tempfile.TemporaryDirectory()
+    if args.archive:
+        archived = export_archive_pages(args.archive, temp_dir.name)
+        print(f"使用归档页面: {len(archived)} 个")
+        pages.extend(archived)
+    if args.synthetic or not pages:
+        count = args.synthetic or 200
+        path = os.path.join(temp_dir.name, f'synthetic_{count}.html')
+        with open(path, 'wb') as f:
+            f.write(build_synthetic_homepage(count))
+        pages.append(path)
+        print(f"使用模拟首页: {count} 个产品")
+
+    print(f"{'页面':<28}{'解析器':<15}{'大小KB':>10}{'产品数':>8}{'耗时ms':>10}{'Py峰值KB':>12}{'RSS峰值KB':>12}")
+    totals = {name: [0.0, 0.0] for name in PARSERS}
+    for path in pages:
+        for parser_name in PARSERS:
+            result = measure(parser_name, path)
+            totals[parser_name][0] += result['seconds']
+            totals[parser_name][1] = max(totals[parser_name][1], result['rss_peak_kb'])
+            print(f"{result['page'][:27]:<28}{parser_name:<15}{result['bytes'] / 1024:>10.1f}"
+                  f"{result['products']:>8}{result['seconds'] * 1000:>10.1f}"
+                  f"{result['py_peak_kb']:>12.0f}{result['rss_peak_kb']:>12.0f}")
+
+    print("-" * 95)
+    for parser_name, (seconds, rss_peak) in totals.items():
+        print(f"{parser_name:<15} 总耗时 {seconds * 1000:.1f} ms, 最大RSS增量 {rss_peak:.0f} KB")
+
+    temp_dir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
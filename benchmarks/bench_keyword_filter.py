@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+关键词预筛选吞吐基准
+在 N 条模拟产品文本上对比 KeywordMatcher（带词边界、支持中文）与原实现的逐个关键词子串查找
+
+使用方法:
+python benchmarks/bench_keyword_filter.py            # 默认 100000 条
+python benchmarks/bench_keyword_filter.py --count 500000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.config import config
+from src.keyword_filter import KeywordMatcher
+
+WORDS = ("team workflow platform startup design notes calendar finance restaurant booking "
+         "analytics dashboard mobile photo video music travel fitness email docs sales crm "
+         "developer api open source browser extension said maintain plain").split()
+AI_PHRASES = ["AI-powered", "machine learning", "LLM agents", "GPT", "智能助手", "人工智能", "automation"]
+CJK_WORDS = ["团队", "协作", "日程", "餐厅", "管理", "照片", "设计", "工具"]
+
+
+def build_texts(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(20, 60))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(AI_PHRASES))
+        if rng.random() < 0.2:
+            words.append("".join(rng.choices(CJK_WORDS, k=6)))
+        texts.append(" ".join(words))
+    return texts
+
+
+def naive_match(texts, keywords, exclude_keywords):
+    """原实现方式：小写后逐个关键词做子串查找"""
+    keywords = [k.lower() for k in keywords]
+    exclude_keywords = [k.lower() for k in exclude_keywords]
+    hits = 0
+    for text in texts:
+        lowered = text.lower()
+        if any(k in lowered for k in exclude_keywords):
+            continue
+        if any(k in lowered for k in keywords):
+            hits += 1
+    return hits
+
+
+def compiled_match(texts, matcher):
+    return sum(1 for text in texts if matcher.matches(text))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="关键词预筛选吞吐基准")
+    parser.add_argument('--count', type=int, default=100000, help='模拟产品文本数量')
+    args = parser.parse_args()
+
+    keywords = config.filtering.ai_keywords
+    exclude_keywords = config.filtering.exclude_keywords
+    texts = build_texts(args.count)
+    total_mb = sum(len(t.encode('utf-8')) for t in texts) / 1024 / 1024
+    print(f"{len(texts)} 条文本 ({total_mb:.1f} MB)，{len(keywords)} 个关键词，{len(exclude_keywords)} 个排除词")
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(keywords, exclude_keywords)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    for name, runner in (("子串查找(原实现)", lambda: naive_match(texts, keywords, exclude_keywords)),
+                         ("KeywordMatcher", lambda: compiled_match(texts, matcher))):
+        start = time.perf_counter()
+        hits = runner()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16} 命中 {hits:>7}  耗时 {elapsed * 1000:>8.1f} ms  "
+              f"吞吐 {len(texts) / elapsed:>10.0f} 条/s  {total_mb / elapsed:>6.1f} MB/s")
+
+    print(f"正则编译耗时 {compile_ms:.2f} ms")
+    print("注: 子串查找不区分词边界（如 \"AI\" 会命中 \"said\"），命中数偏高")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
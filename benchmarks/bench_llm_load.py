@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+大模型分析负载测试
+启动本地ARK替身服务（benchmarks/ark_stub_server.py），用 AIAnalyzer.analyze_products
+分别分析 10/100/1000 个模拟产品，输出总耗时、调用次数、重试与延迟分位数。
+响应缓存、分析备忘、翻译记忆和本地相关性模型均关闭，每次都走完整的大模型调用路径。
+延迟为客户端单次调用（含重试）的耗时；流式调用只计到收到响应头为止。
+另按调用点输出遥测汇总（token用量与完整耗时，流式调用计到流结束）
+
+使用方法:
+python benchmarks/bench_llm_load.py
+python benchmarks/bench_llm_load.py --sizes 100,1000 --stream --latency-dist lognormal --rate-limit-rate 0.05
+python benchmarks/bench_llm_load.py --truncate-rate 0.1 --error-rate 0.05 --json load.json
+python benchmarks/bench_llm_load.py --sizes 100 --summary-mode serial      # 计入每日总结，对比 concurrent
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from ark_stub_server import ArkStubHandler, add_profile_arguments, profile_from_args, start_server
+
+from src import ai_analyzer
+from src.config import config
+from src.llm_client import AsyncLLMClient
+from src.models import ProductInfo
+from src.stats import percentile
+
+FEATURES = ("meeting notes", "code review", "sales emails", "customer support", "data dashboards",
+            "video editing", "legal contracts", "recruiting", "travel planning", "personal finance")
+VERBS = ("automates", "summarizes", "drafts", "analyzes", "organizes", "translates")
+AUDIENCES = ("startups", "remote teams", "developers", "marketers", "students", "small businesses")
+
+
+def build_products(count: int, seed: int = 42):
+    """生成描述与创始人评论长度各异的模拟产品"""
+    rng = random.Random(seed)
+    products = []
+    for i in range(1, count + 1):
+        feature = rng.choice(FEATURES)
+        sentences = [f"An AI agent that {rng.choice(VERBS)} {feature} for {rng.choice(AUDIENCES)}."
+                     for _ in range(rng.randint(1, 4))]
+        comment = None
+        if rng.random() < 0.6:
+            comment = " ".join(f"Hi Product Hunt! We built product {i} because {feature} took us hours every week."
+                               for _ in range(rng.randint(1, 6)))
+        products.append(ProductInfo(
+            name=f"Product {i}",
+            tagline=f"AI copilot for {feature}",
+            description=" ".join(sentences),
+            url=f"https://product{i}.example.com",
+            original_url=f"https://www.producthunt.com/posts/product-{i}",
+            ranking=i,
+            votes=count * 10 - i,
+            maker_comment=comment
+        ))
+    return products
+
+
+def make_analyzer(url: str, args) -> ai_analyzer.AIAnalyzer:
+    wrapper = ai_analyzer.AIAnalyzer()
+    analyzer = wrapper.analyzer
+    analyzer.provider = 'volcengine_ark'
+    analyzer.stream = args.stream
+    analyzer.batch_concurrency = args.batch_concurrency
+    analyzer.single_concurrency = args.single_concurrency
+    if args.summary_mode != 'off':
+        analyzer.summary_mode = args.summary_mode
+    analyzer.client = AsyncLLMClient(
+        url, "stub-key",
+        pool_size=max(args.batch_concurrency, args.single_concurrency),
+        max_retries=args.max_retries,
+        backoff_base=args.backoff,
+        backoff_max=args.backoff_max,
+        timeout=config.ai.timeout
+    )
+    return wrapper
+
+
+def run_size(url: str, count: int, args) -> dict:
+    ArkStubHandler.stats.clear()
+    analyzer = make_analyzer(url, args)
+    products = build_products(count)
+
+    start = time.perf_counter()
+    with analyzer:
+        if args.summary_mode == 'off':
+            analyzed = analyzer.analyze_products(products)
+        else:
+            analyzed, _ = analyzer.analyze_products_with_summary(products)
+    wall = time.perf_counter() - start
+
+    client = analyzer.analyzer.client
+    stats = client.get_stats()
+    server = dict(ArkStubHandler.stats)
+    return {
+        "products": count,
+        "analyzed": len(analyzed),
+        "wall_seconds": wall,
+        "calls": stats["calls"],
+        "failures": stats["failures"],
+        "retries": stats["retries"],
+        "retry_reasons": stats["retry_reasons"],
+        "http_requests": server.get("requests", 0),
+        "injected_429": server.get("rate_limited", 0),
+        "injected_5xx": server.get("errors", 0),
+        "truncated": server.get("truncated", 0),
+        "p50": stats["p50"],
+        "p90": stats["p90"],
+        "p99": percentile(client.latencies, 99),
+        "max": stats["max"],
+        "call_sites": analyzer.telemetry.summary()["call_sites"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大模型分析负载测试")
+    parser.add_argument('--sizes', default='10,100,1000', help='产品数量，逗号分隔')
+    parser.add_argument('--stream', action=argparse.BooleanOptionalAction, default=config.ai.stream,
+                        help='批量分析是否使用流式输出（默认取 ai.stream）')
+    parser.add_argument('--batch-concurrency', type=int, default=config.ai.batch_concurrency)
+    parser.add_argument('--single-concurrency', type=int, default=config.ai.single_concurrency)
+    parser.add_argument('--max-retries', type=int, default=config.ai.max_retries)
+    parser.add_argument('--backoff', type=float, default=0.2, help='退避基数（秒），默认比线上小以缩短测试时间')
+    parser.add_argument('--backoff-max', type=float, default=config.ai.retry_backoff_max)
+    parser.add_argument('--summary-mode', choices=('off', 'serial', 'concurrent'), default='off',
+                        help='同时生成每日总结及其生成方式（默认只分析产品）')
+    parser.add_argument('--json', help='将结果写入JSON文件')
+    parser.add_argument('--verbose', '-v', action='store_true', help='输出分析器日志')
+    add_profile_arguments(parser)
+    parser.set_defaults(tokens_per_second=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # 每次都走完整的大模型调用路径
+    ai_analyzer.llm_cache = None
+    ai_analyzer.analysis_memo = None
+    ai_analyzer.translation_memory = None
+    ai_analyzer.relevance_scorer = None
+    config.filtering.prefilter = False
+
+    profile = profile_from_args(args)
+    server = start_server(0, profile)
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/v3/chat/completions"
+    print(f"替身服务: 首token {profile.first_token_latency}s ({profile.latency_dist}), "
+          f"{profile.tokens_per_second:g} tokens/s, 429 {profile.rate_limit_rate:.0%}, "
+          f"5xx {profile.error_rate:.0%}, 截断 {profile.truncate_rate:.0%}; "
+          f"{'流式' if args.stream else '普通'}调用，批量并发 {args.batch_concurrency}")
+
+    results = []
+    try:
+        for count in (int(size) for size in args.sizes.split(',') if size.strip()):
+            result = run_size(url, count, args)
+            results.append(result)
+            reasons = ", ".join(f"{reason}×{n}" for reason, n in result["retry_reasons"].items()) or "无"
+            print(f"{count:>5} 个产品: 完成 {result['analyzed']:>5}  耗时 {result['wall_seconds']:>6.2f}s  "
+                  f"调用 {result['calls']:>4} 次 (HTTP {result['http_requests']})  失败 {result['failures']}  "
+                  f"重试 {result['retries']} ({reasons})  截断 {result['truncated']}  "
+                  f"延迟 p50={result['p50']:.2f}s p90={result['p90']:.2f}s p99={result['p99']:.2f}s "
+                  f"max={result['max']:.2f}s")
+            for site, usage in result["call_sites"].items():
+                print(f"        [{site}] {usage['calls']} 次  提示词 {usage['prompt_tokens']} / "
+                      f"输出 {usage['completion_tokens']} tokens  累计耗时 {usage['latency_total']:.1f}s  重试 {usage['retries']}  "
+                      f"解析 {usage['parse'] or '-'}")
+    finally:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"profile": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.json}")
+    return 0 if all(result["analyzed"] == result["products"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+本地 Product Hunt GraphQL 替身服务
+实现 posts(postedAfter, postedBefore, first, after) 的游标分页，用于离线验证 GraphQL 采集路径
+
+使用方法:
+python benchmarks/ph_graphql_stub.py --port 8765 --posts 300   # 启动替身服务
+# 然后将 config.yaml 中 sources.product_hunt.api_url 指向 http://127.0.0.1:8765/graphql
+
+python benchmarks/ph_graphql_stub.py --selftest --posts 300    # 启动服务并用客户端拉取一整天数据
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+
+def build_posts(count: int, day: str):
+    return [{
+        "id": str(i),
+        "name": f"Launch {i}",
+        "tagline": f"AI assistant #{i} launched on {day}",
+        "description": f"Launch {i} helps teams automate workflows with machine learning.",
+        "slug": f"launch-{day}-{i}",
+        "url": f"https://www.producthunt.com/posts/launch-{day}-{i}?utm_source=graphql",
+        "website": f"https://launch{i}.example.com",
+        "votesCount": count * 10 - i,
+        "thumbnail": {"url": f"https://ph-files.imgix.net/launch-{i}.png"},
+        "topics": {"edges": [{"node": {"name": "Artificial Intelligence"}}]},
+    } for i in range(1, count + 1)]
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.b64encode(str(offset).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    return int(base64.b64decode(cursor.encode()).decode())
+
+
+class GraphQLStubHandler(BaseHTTPRequestHandler):
+    """只识别 posts 查询的 GraphQL 替身"""
+
+    posts_per_day = 100
+    latency = 0.0
+    token = None
+    requests_served = 0
+
+    def do_POST(self):
+        type(self).requests_served += 1
+        if self.token and self.headers.get('Authorization') != f"Bearer {self.token}":
+            return self._send(401, {"errors": [{"message": "Unauthorized"}]})
+
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        variables = payload.get('variables') or {}
+
+        if 'posts(' not in payload.get('query', ''):
+            return self._send(200, {"errors": [{"message": "Unsupported query"}]})
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        day = str(variables.get('postedAfter', ''))[:10] or datetime.now().strftime('%Y-%m-%d')
+        posts = build_posts(self.posts_per_day, day)
+        first = min(int(variables.get('first') or 20), 50)
+        offset = decode_cursor(variables['after']) + 1 if variables.get('after') else 0
+        page = posts[offset:offset + first]
+        end = offset + len(page) - 1
+
+        self._send(200, {"data": {"posts": {
+            "pageInfo": {"hasNextPage": end + 1 < len(posts), "endCursor": encode_cursor(end) if page else None},
+            "edges": [{"cursor": encode_cursor(offset + i), "node": node} for i, node in enumerate(page)]
+        }}})
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port: int, posts: int, latency: float = 0.0) -> ThreadingHTTPServer:
+    GraphQLStubHandler.posts_per_day = posts
+    GraphQLStubHandler.latency = latency
+    server = ThreadingHTTPServer(('127.0.0.1', port), GraphQLStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def selftest(posts: int, page_size: int) -> int:
+    from src.scrapers.product_hunt_api import ProductHuntGraphQLClient
+
+    server = start_server(0, posts)
+    api_url = f"http://127.0.0.1:{server.server_address[1]}/graphql"
+    client = ProductHuntGraphQLClient(api_url, "stub-token", page_size=page_size)
+
+    start = time.perf_counter()
+    records = client.fetch_daily_posts(datetime(2025, 7, 1), max_posts=posts)
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    ok = (len(records) == posts
+          and [r['rank'] for r in records] == list(range(1, posts + 1))
+          and all('?' not in r['post_url'] for r in records)
+          and records[0]['slug'].startswith('launch-2025-07-01'))
+    print(f"拉取 {len(records)} 个产品，{client.requests_made} 次请求，耗时 {elapsed * 1000:.1f} ms")
+    print("✅ 自检通过" if ok else "❌ 自检失败")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 Product Hunt GraphQL 替身服务")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--posts', type=int, default=100, help='每天的产品数量')
+    parser.add_argument('--latency', type=float, default=0.0, help='每次请求的模拟延迟（秒）')
+    parser.add_argument('--token', default=None, help='要求的Bearer令牌')
+    parser.add_argument('--page-size', type=int, default=50, help='自检时客户端的分页大小')
+    parser.add_argument('--selftest', action='store_true', help='启动服务并运行客户端自检')
+    args = parser.parse_args()
+
+    if args.selftest:
+        return selftest(args.posts, args.page_size)
+
+    GraphQLStubHandler.token = args.token
+    server = start_server(args.port, args.posts, args.latency)
+    print(f"GraphQL 替身服务已启动: http://127.0.0.1:{args.port}/graphql")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,13 +8,17 @@ python main.py --mode scheduler  # 启动定时任务模式
 python main.py --mode once       # 执行一次完整任务
 python main.py --mode test       # 发送测试消息
 python main.py --mode status     # 查看系统状态
+python main.py --mode backfill --from 2025-04-01 --to 2025-06-30  # 回填历史日报
+python main.py --mode replay       # 离线重新解析已归档的页面快照
+python main.py --mode poll --interval 15  # 日内增量轮询
+python main.py --mode train      # 用历史日报训练本地相关性模型
 """
 
 import argparse
 import logging
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, date
 
 # 添加src目录到Python路径
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -65,12 +69,27 @@ def run_scheduler():
         print(f"系统异常: {e}")
         logging.error(f"系统异常: {e}")
 
+def run_poll(interval: int):
+    """启动日内增量轮询模式"""
+    print(f"🌈 启动增量轮询模式，间隔 {interval} 分钟...")
+    
+    scheduler = TaskScheduler()
+    try:
+        scheduler.start_polling(interval)
+    except KeyboardInterrupt:
+        print("\n收到停止信号，正在关闭...")
+        scheduler.stop()
+    return 0
+
 def run_once():
     """执行一次完整任务"""
     print("🌈 执行一次完整的彩虹一号任务")
     
     service = RainbowOneService()
-    success = service.run_complete_workflow()
+    try:
+        success = service.run_complete_workflow()
+    finally:
+        service.close()
     
     if success:
         print("✅ 任务执行成功")
@@ -93,6 +112,76 @@ def send_test():
         print("❌ 测试消息发送失败，请检查飞书配置")
         return 1
 
+def run_backfill(date_from: str, date_to: str, workers: int, force: bool):
+    """回填历史日报"""
+    from src.backfill import BackfillRunner
+    
+    try:
+        start = date.fromisoformat(date_from)
+        end = date.fromisoformat(date_to or date_from)
+    except (TypeError, ValueError):
+        print("❌ 请使用 --from/--to 指定日期，格式为 YYYY-MM-DD")
+        return 1
+    
+    print(f"🌈 回填历史日报: {start} ~ {end}，并发 {workers}")
+    
+    runner = BackfillRunner(workers=workers, force=force)
+    result = runner.run(start, end)
+    
+    print(f"✅ 成功 {len(result['succeeded'])} 天，跳过 {result['skipped']} 天，耗时 {result['elapsed']:.1f}s")
+    if result['failed']:
+        print(f"❌ 失败 {len(result['failed'])} 天: {', '.join(str(d) for d in result['failed'])}")
+        return 1
+    return 0
+
+def run_replay(archive_dir: str = None):
+    """使用当前解析器离线重放页面快照归档"""
+    from src.scrapers.product_hunt import ProductHuntScraper
+    from src.scrapers.snapshot_archive import SnapshotArchive
+    
+    archive_dir = archive_dir or os.path.join(config.cache.dir, "snapshots")
+    if not os.path.exists(os.path.join(archive_dir, "manifest.jsonl")):
+        print(f"❌ 未找到快照归档: {archive_dir}")
+        return 1
+    
+    archive = SnapshotArchive(archive_dir)
+    stats = archive.get_stats()
+    print(f"🌈 重放快照归档: {archive_dir}")
+    print(f"抓取记录 {stats['fetches']} 条，去重后 {stats['unique_snapshots']} 个快照，"
+          f"原始 {stats['raw_bytes'] / 1024:.1f} KB，压缩后 {stats['stored_bytes'] / 1024:.1f} KB")
+    
+    results = ProductHuntScraper().replay_snapshots(archive)
+    for result in results:
+        top = result['products'][0].name if result['products'] else '-'
+        print(f"{result['timestamp'][:19]}  {result['digest'][:12]}  {len(result['products']):>3} 个产品  "
+              f"{result['parse_seconds'] * 1000:>7.1f} ms  {result['url']}  首位: {top}")
+    
+    empty = [result for result in results if not result['products']]
+    print(f"✅ 重放 {len(results)} 次列表页抓取，其中 {len(empty)} 次未解析到产品")
+    return 0
+
+def run_train(reports_dir: str = None):
+    """用历史日报中的大模型评分训练本地相关性模型"""
+    from src.relevance_model import train_from_reports, default_model_path
+    
+    reports_dir = reports_dir or "reports"
+    model_path = default_model_path()
+    print(f"🌈 训练本地相关性模型: {reports_dir}/*.json")
+    try:
+        report = train_from_reports(reports_dir, model_path, config.filtering.relevance_threshold,
+                                    config.filtering.relevance_skip_below)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    
+    print(f"样本 {report['samples']} 个（相关 {report['positives']}，无关 {report['negatives']}），"
+          f"{report['folds']} 折交叉验证")
+    print(f"与大模型评分一致率: {report['agreement']:.1%}")
+    print(f"概率低于 {report['skip_below']} 不再调用大模型: {report['skipped']} 个产品"
+          f"（其中 {report['skipped_correct']} 个大模型同样判为无关）")
+    print(f"✅ 模型已保存: {model_path}")
+    return 0
+
 def show_status():
     """显示系统状态"""
     print("🌈 彩虹一号系统状态")
@@ -156,21 +245,70 @@ def main():
   test         发送测试消息到飞书
   status       显示系统当前状态
   config       检查配置文件
+  backfill     按日期区间回填历史日报（只保存不推送，已存在的日报自动跳过）
+  replay       使用当前解析器离线重新解析快照归档中的页面（不访问网络）
+  poll         日内增量轮询，每隔 --interval 分钟重新抓取，只分析新上线的产品
+  train        用历史日报中的大模型评分训练本地相关性模型（不访问网络）
 
 示例:
   python main.py --mode scheduler
   python main.py --mode once
   python main.py --mode test
+  python main.py --mode backfill --from 2025-04-01 --to 2025-06-30 --workers 8
+  python main.py --mode replay --archive .cache/snapshots
+  python main.py --mode poll --interval 15
+  python main.py --mode train --reports reports
         """
     )
     
     parser.add_argument(
         '--mode',
-        choices=['scheduler', 'once', 'test', 'status', 'config'],
+        choices=['scheduler', 'once', 'test', 'status', 'config', 'backfill', 'replay', 'poll', 'train'],
         default='scheduler',
         help='运行模式 (默认: scheduler)'
     )
     
+    parser.add_argument(
+        '--from',
+        dest='date_from',
+        help='回填起始日期 (YYYY-MM-DD，backfill 模式)'
+    )
+    
+    parser.add_argument(
+        '--to',
+        dest='date_to',
+        help='回填结束日期 (YYYY-MM-DD，默认与起始日期相同)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='回填并发数 (默认: 4)'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='回填时覆盖已存在的日报'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=int,
+        help='增量轮询间隔分钟数 (poll 模式，默认使用配置 schedule.poll_interval_minutes 或 15)'
+    )
+    
+    parser.add_argument(
+        '--archive',
+        help='快照归档目录 (replay 模式，默认: <缓存目录>/snapshots)'
+    )
+    
+    parser.add_argument(
+        '--reports',
+        help='历史日报目录 (train 模式，默认: reports)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -195,6 +333,13 @@ def main():
         if args.mode == 'config':
             return 0 if check_config() else 1
         
+        # 重放和训练只使用本地数据，不需要AI与飞书配置
+        if args.mode == 'replay':
+            return run_replay(args.archive)
+        
+        if args.mode == 'train':
+            return run_train(args.reports)
+        
         # 检查基本配置
         if not check_config():
             return 1
@@ -208,6 +353,10 @@ def main():
             return send_test()
         elif args.mode == 'status':
             return show_status()
+        elif args.mode == 'poll':
+            return run_poll(args.interval or config.schedule.poll_interval_minutes or 15)
+        elif args.mode == 'backfill':
+            return run_backfill(args.date_from, args.date_to, args.workers, args.force)
         else:
             parser.print_help()
             return 1
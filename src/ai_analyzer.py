@@ -2,22 +2,48 @@
 AI 分析器
 负责分析产品的AI相关性、翻译内容和生成详细分析
 支持火山引擎ARK平台的DeepSeek-V3模型
+
+AsyncAIAnalyzer 基于 aiohttp，多次大模型调用可在同一事件循环内并发；
+AIAnalyzer 是其同步包装（在专用线程的事件循环中运行），供定时任务等同步代码调用
 """
 
-import requests
 import json
+import time
+import asyncio
 import logging
 import re
-from typing import List, Dict, Any, Tuple
+import threading
+from typing import List, Dict, Any, Tuple, AsyncIterator, Optional
 from datetime import datetime
 
+import aiohttp
+
 from .models import ProductInfo, DailyReport
 from .config import config
+from .keyword_filter import keyword_matcher
+from .llm_cache import llm_cache
+from .analysis_memo import analysis_memo
+from .json_stream import IncrementalArrayParser
+from .llm_client import AsyncLLMClient
+from .translation_memory import translation_memory, is_chinese, split_segments
+from .relevance_model import relevance_scorer
+from .prompt_budget import estimate_tokens, summarize
+from .dedup import dedup_engine
+from .llm_telemetry import LLMCall, LLMTelemetry, mark_parse
 
 logger = logging.getLogger(__name__)
 
-class AIAnalyzer:
-    """AI分析器 - 支持火山引擎ARK平台"""
+# 批量分析输出token预估：每个产品的固定开销（JSON结构、评分、应用场景）
+OUTPUT_TOKENS_PER_PRODUCT = 200
+# 有创始人评论时洞察分析的预估输出
+OUTPUT_TOKENS_FOUNDER_INSIGHTS = 150
+# 英文描述翻译为中文后每个字符的预估输出token
+OUTPUT_TOKENS_PER_DESCRIPTION_CHAR = 0.4
+# 预估偏差的安全余量，单批预估输出不超过预算的该比例
+OUTPUT_BUDGET_RATIO = 0.75
+
+class AsyncAIAnalyzer:
+    """异步AI分析器 - 支持火山引擎ARK平台"""
     
     def __init__(self):
         self.provider = config.ai.provider
@@ -27,22 +53,55 @@ class AIAnalyzer:
         self.api_key = config.ai.api_key
         self.base_url = config.ai.base_url
         self.endpoint_id = config.ai.endpoint_id
+        self.batch_output_tokens = config.ai.batch_output_tokens
+        self.batch_concurrency = max(1, config.ai.batch_concurrency)
+        self.stream = config.ai.stream
+        self.single_concurrency = max(1, config.ai.single_concurrency)
+        self.prompt_description_tokens = config.ai.prompt_description_tokens
+        self.prompt_comment_tokens = config.ai.prompt_comment_tokens
+        self.summary_mode = config.ai.summary_mode
+        
+        # 提示词token统计，批次并发构建时共用
+        self._stats_lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.prompt_tokens_saved = 0
+        
+        # 逐次调用遥测（调用点、token、耗时、重试、缓存与解析结果），每轮运行开始时重置
+        self.telemetry = LLMTelemetry(config.ai.prompt_price, config.ai.completion_price)
         
         if self.provider == 'volcengine_ark':
             self.api_url = f"{self.base_url}/chat/completions"
+            # 复用连接并对可重试错误自动重试
+            self.client = AsyncLLMClient(
+                self.api_url,
+                self.api_key,
+                pool_size=max(config.ai.pool_size, self.batch_concurrency, self.single_concurrency),
+                max_retries=config.ai.max_retries,
+                backoff_base=config.ai.retry_backoff,
+                backoff_max=config.ai.retry_backoff_max,
+                timeout=config.ai.timeout
+            )
         else:
             # 保持对OpenAI的兼容性
             import openai
             openai.api_key = self.api_key
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self):
+        """关闭当前事件循环中的连接池"""
+        if self.provider == 'volcengine_ark':
+            await self.client.close()
         
-    def _call_volcengine_ark_api(self, messages: List[Dict], temperature: float = None, max_tokens: int = None) -> str:
-        """调用火山引擎ARK平台API"""
+    async def _call_volcengine_ark_api(self, messages: List[Dict], temperature: float = None, max_tokens: int = None,
+                                       call: Optional[LLMCall] = None) -> str:
+        """调用火山引擎ARK平台API，token用量、重试次数与结果记入 call"""
+        call = call or LLMCall("other")
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             payload = {
                 "model": self.endpoint_id,  # 使用endpoint_id作为model参数
                 "messages": messages,
@@ -50,31 +109,82 @@ class AIAnalyzer:
                 "max_tokens": max_tokens or self.max_tokens
             }
             
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            
-            response.raise_for_status()
-            result = response.json()
+            async with await self.client.post(payload) as response:
+                call.retries = response.attempts - 1
+                result = await response.json(content_type=None)
             
+            self._apply_usage(call, result.get('usage'))
             if 'choices' in result and len(result['choices']) > 0:
-                return result['choices'][0]['message']['content'].strip()
+                choice = result['choices'][0]
+                if choice.get('finish_reason') == 'length':
+                    call.outcome = "truncated"
+                return choice['message']['content'].strip()
             else:
                 logger.error(f"火山引擎ARK API返回格式异常: {result}")
+                call.outcome = "error"
                 return ""
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"火山引擎ARK API请求失败: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"火山引擎ARK API请求失败: {type(e).__name__} {e}")
+            call.outcome = "error"
+            call.retries = getattr(e, 'attempts', call.retries + 1) - 1
             return ""
         except Exception as e:
             logger.error(f"火山引擎ARK API调用异常: {e}")
+            call.outcome = "error"
             return ""
     
-    def _call_openai_api(self, messages: List[Dict], temperature: float = None, max_tokens: int = None) -> str:
+    @staticmethod
+    def _apply_usage(call: LLMCall, usage: Optional[Dict[str, Any]]):
+        """记录响应中 usage 给出的实际token数"""
+        if usage:
+            call.prompt_tokens = usage.get('prompt_tokens') or 0
+            call.completion_tokens = usage.get('completion_tokens') or 0
+    
+    async def _stream_volcengine_ark_api(self, messages: List[Dict], temperature: float = None,
+                                         max_tokens: int = None,
+                                         call: Optional[LLMCall] = None) -> AsyncIterator[Optional[str]]:
+        """
+        以流式（SSE）调用火山引擎ARK平台API，逐段返回生成的文本
+        
+        收到结束标记 [DONE] 时最后返回一个 None；最后一个数据块中的 usage 与重试次数记入 call
+        """
+        call = call or LLMCall("other")
+        payload = {
+            "model": self.endpoint_id,
+            "messages": messages,
+            "temperature": temperature or self.temperature,
+            "max_tokens": max_tokens or self.max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        
+        # 读超时作用于相邻两段数据之间，而不是整个响应
+        async with await self.client.post(payload) as response:
+            call.retries = response.attempts - 1
+            # SSE 固定为 UTF-8；按字节切行后再解码，避免缺省编码下误判换行
+            async for raw_line in response.content:
+                line = raw_line.decode('utf-8').strip()
+                if not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    yield None
+                    return
+                chunk = json.loads(data)
+                self._apply_usage(call, chunk.get('usage'))
+                for choice in chunk.get('choices') or []:
+                    # 达到 max_tokens 时仍会正常发送 [DONE]，需按 finish_reason 识别截断
+                    if choice.get('finish_reason') == 'length':
+                        call.outcome = "truncated"
+                    content = (choice.get('delta') or {}).get('content')
+                    if content:
+                        yield content
+    
+    def _call_openai_api(self, messages: List[Dict], temperature: float = None, max_tokens: int = None,
+                         call: Optional[LLMCall] = None) -> str:
         """调用OpenAI API（保持兼容性）"""
+        call = call or LLMCall("other")
         try:
             import openai
             response = openai.ChatCompletion.create(
@@ -83,68 +193,363 @@ class AIAnalyzer:
                 temperature=temperature or self.temperature,
                 max_tokens=max_tokens or self.max_tokens
             )
+            self._apply_usage(call, response.get('usage'))
+            if response.choices[0].get('finish_reason') == 'length':
+                call.outcome = "truncated"
             return response.choices[0].message.content.strip()
         except Exception as e:
             logger.error(f"OpenAI API调用失败: {e}")
+            call.outcome = "error"
             return ""
     
-    def _call_ai_api(self, messages: List[Dict], temperature: float = None, max_tokens: int = None) -> str:
-        """统一的AI API调用接口"""
+    async def _call_ai_api(self, messages: List[Dict], temperature: float = None, max_tokens: int = None,
+                           call_site: str = "other") -> str:
+        """
+        统一的AI API调用接口，相同请求优先使用响应缓存
+        
+        每次调用按 call_site（batch/combined/relevance/single/translate/summary）记入遥测
+        """
+        call = self.telemetry.start(call_site)
+        start = time.perf_counter()
+        cache_key = None
+        if llm_cache:
+            model = self.endpoint_id if self.provider == 'volcengine_ark' else self.model
+            cache_key = llm_cache.make_key(self.provider, model, messages,
+                                           temperature or self.temperature, max_tokens or self.max_tokens)
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                call.cache_hit = True
+                self._record_call(call, start, messages, cached)
+                return cached
+        
         if self.provider == 'volcengine_ark':
-            return self._call_volcengine_ark_api(messages, temperature, max_tokens)
+            response = await self._call_volcengine_ark_api(messages, temperature, max_tokens, call)
         else:
-            return self._call_openai_api(messages, temperature, max_tokens)
+            # openai SDK 为同步调用，放到线程中执行，不阻塞事件循环
+            response = await asyncio.to_thread(self._call_openai_api, messages, temperature, max_tokens, call)
+        self._record_call(call, start, messages, response)
         
-    def analyze_products(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        # 只缓存完整的响应：调用失败、返回为空或因 max_tokens 截断的响应不写入缓存，下次重新请求
+        if cache_key and call.outcome == "ok":
+            llm_cache.set(cache_key, response)
+        return response
+        
+    async def _stream_ai_api(self, messages: List[Dict], temperature: float = None,
+                             max_tokens: int = None, call_site: str = "other") -> AsyncIterator[str]:
+        """流式AI API调用接口，命中响应缓存时一次性返回；非ARK平台退化为普通调用"""
+        if self.provider != 'volcengine_ark':
+            response = await self._call_ai_api(messages, temperature, max_tokens, call_site)
+            if response:
+                yield response
+            return
+        
+        call = self.telemetry.start(call_site)
+        start = time.perf_counter()
+        cache_key = None
+        if llm_cache:
+            cache_key = llm_cache.make_key(self.provider, self.endpoint_id, messages,
+                                           temperature or self.temperature, max_tokens or self.max_tokens)
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                call.cache_hit = True
+                self._record_call(call, start, messages, cached)
+                yield cached
+                return
+        
+        parts = []
+        finished = False
+        try:
+            try:
+                async for content in self._stream_volcengine_ark_api(messages, temperature, max_tokens, call):
+                    if content is None:
+                        finished = True
+                        break
+                    parts.append(content)
+                    yield content
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"火山引擎ARK流式请求失败: {type(e).__name__} {e}")
+                call.outcome = "error"
+                call.retries = getattr(e, 'attempts', call.retries + 1) - 1
+                return
+            except ValueError as e:
+                logger.error(f"火山引擎ARK流式响应格式异常: {e}")
+                call.outcome = "error"
+                return
+            
+            # 只缓存完整结束的响应
+            if not finished:
+                logger.warning("火山引擎ARK流式响应未收到结束标记")
+                call.outcome = "truncated"
+            elif call.outcome == "truncated":
+                logger.warning("火山引擎ARK流式响应达到输出token上限被截断")
+            elif cache_key and parts:
+                llm_cache.set(cache_key, "".join(parts).strip())
+        finally:
+            # 耗时计到流结束（或调用方提前停止读取）为止
+            self._record_call(call, start, messages, "".join(parts))
+    
+    def _record_call(self, call: LLMCall, start: float, messages: List[Dict], response: str):
+        """补全耗时与结果后保存调用记录；响应未带 usage 时按文本估算token"""
+        call.latency = time.perf_counter() - start
+        if not call.cache_hit:
+            if call.outcome == "ok" and not response:
+                call.outcome = "empty"
+            if not call.prompt_tokens and call.outcome != "error":
+                call.prompt_tokens = sum(estimate_tokens(message.get('content', '')) for message in messages)
+                call.completion_tokens = estimate_tokens(response)
+                call.estimated = True
+        self.telemetry.record(call)
+        
+    async def analyze_products(self, products: List[ProductInfo]) -> List[ProductInfo]:
         """
         批量分析产品列表，提高效率并减少API调用次数
         """
+        return await self._analyze_candidates(self._select_candidates(products))
+    
+    async def analyze_products_with_summary(self, products: List[ProductInfo]) -> Tuple[List[ProductInfo], str]:
+        """
+        分析产品列表并生成每日总结
+        
+        summary_mode 为 concurrent 时，总结只需要产品名称与标语，筛选出待分析的产品后即与批量分析并发生成，
+        不再在全部分析结束后串行多等一次调用；有产品未能完成分析时按实际结果重新生成总结。
+        serial 时在分析完成后再生成总结
+        """
+        candidates = self._select_candidates(products)
+        if self.summary_mode != 'concurrent':
+            analyzed_products = await self._analyze_candidates(candidates)
+            return analyzed_products, await self._summarize_products(analyzed_products)
+        
+        analyzed_products, summary = await asyncio.gather(
+            self._analyze_candidates(candidates), self._summarize_products(candidates))
+        if len(analyzed_products) < len(candidates):
+            logger.info(f"{len(candidates) - len(analyzed_products)} 个产品未完成分析，按分析结果重新生成每日总结")
+            summary = await self._summarize_products(analyzed_products)
+        return analyzed_products, summary
+    
+    def _select_candidates(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        """筛选需要大模型分析的产品：关键词预筛选与本地相关性模型跳过明显无关的产品"""
+        if not products:
+            return []
+        
+        # 关键词预筛选，明显无关的产品不进入大模型分析
+        if config.filtering.prefilter:
+            products, dropped = keyword_matcher.split_products(products)
+            if dropped:
+                logger.info(f"关键词预筛选跳过 {len(dropped)} 个产品: {', '.join(p.name for p in dropped)}")
+            if not products:
+                return []
+        
+        # 本地相关性模型有把握判为无关的产品不进入大模型分析
+        if relevance_scorer:
+            candidates, skipped = relevance_scorer.split_products(products)
+            if skipped:
+                saved_calls = len(self._split_batches(products)) - len(self._split_batches(candidates))
+                logger.info(f"本地相关性模型跳过 {len(skipped)} 个产品（预计少调用 {saved_calls} 次）: "
+                            f"{', '.join(p.name for p in skipped)}")
+            products = candidates
+        return products
+    
+    async def _analyze_candidates(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        """对筛选后的产品做大模型分析，内容未变化的产品复用之前的结果"""
         if not products:
             return []
         
-        logger.info(f"开始批量分析 {len(products)} 个产品...")
+        # 内容未变化的产品复用之前的分析结果
+        pending = products
+        if analysis_memo:
+            reused, pending = analysis_memo.split_products(products)
+            if reused:
+                logger.info(f"复用已有分析 {len(reused)} 个产品，需分析 {len(pending)} 个")
+            if not pending:
+                return products
+        
+        logger.info(f"开始批量分析 {len(pending)} 个产品...")
         
         try:
             # 批量分析所有产品
-            analyzed_products = self._batch_analyze_products(products)
+            analyzed_products = await self._batch_analyze_products(pending)
             
             logger.info(f"批量分析完成，成功分析 {len(analyzed_products)} 个产品")
-            return analyzed_products
             
         except Exception as e:
             logger.error(f"批量分析失败，回退到单个分析: {e}")
             # 如果批量分析失败，回退到原来的单个分析方式
-            return self._fallback_single_analysis(products)
+            analyzed_products = await self._fallback_single_analysis(pending)
+        
+        if analysis_memo:
+            analysis_memo.store(analyzed_products)
+        if relevance_scorer:
+            relevance_scorer.record(analyzed_products)
+        
+        # 按原顺序合并复用结果与新分析结果
+        analyzed_ids = {id(product) for product in analyzed_products}
+        pending_ids = {id(product) for product in pending}
+        return [product for product in products if id(product) not in pending_ids or id(product) in analyzed_ids]
+    
+    def _estimate_output_tokens(self, product: ProductInfo) -> int:
+        """预估单个产品在批量分析结果中的输出token数"""
+        tokens = OUTPUT_TOKENS_PER_PRODUCT
+        if self._known_translation(product) is None:
+            tokens += int(len(product.description or "") * OUTPUT_TOKENS_PER_DESCRIPTION_CHAR)
+        if product.maker_comment:
+            tokens += OUTPUT_TOKENS_FOUNDER_INSIGHTS
+        return tokens
+    
+    def _split_batches(self, products: List[ProductInfo]) -> List[List[ProductInfo]]:
+        """按预估输出token预算顺序切分产品，避免单次输出被截断"""
+        budget = self.batch_output_tokens * OUTPUT_BUDGET_RATIO
+        batches: List[List[ProductInfo]] = []
+        current: List[ProductInfo] = []
+        current_tokens = 0
+        for product in products:
+            tokens = self._estimate_output_tokens(product)
+            if current and current_tokens + tokens > budget:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(product)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _batch_analyze_products(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        """
+        批量分析多个产品
+        
+        按输出token预算切分成多批，批次之间并发调用，结果按原顺序合并；
+        单批失败时只对该批回退到单个分析
+        """
+        batches = self._split_batches(products)
+        if len(batches) == 1:
+            return await self._analyze_batch(products)
+        
+        workers = min(self.batch_concurrency, len(batches))
+        logger.info(f"批量分析切分为 {len(batches)} 批（每批 {', '.join(str(len(b)) for b in batches)} 个），并发 {workers}")
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(workers)
+        
+        async def analyze(number: int, batch: List[ProductInfo]) -> List[ProductInfo]:
+            async with semaphore:
+                try:
+                    return await self._analyze_batch(batch)
+                except Exception as e:
+                    logger.error(f"第 {number} 批分析失败，该批回退到单个分析: {e}")
+            return await self._fallback_single_analysis(batch)
+        
+        results = await asyncio.gather(*[analyze(number, batch) for number, batch in enumerate(batches, 1)])
+        
+        analyzed_ids = {id(product) for result in results for product in result}
+        logger.info(f"分批分析完成，耗时 {time.perf_counter() - start:.1f}s")
+        return [product for product in products if id(product) in analyzed_ids]
     
-    def _batch_analyze_products(self, products: List[ProductInfo]) -> List[ProductInfo]:
-        """批量分析多个产品"""
+    async def _analyze_batch(self, products: List[ProductInfo], recover_missing: bool = True) -> List[ProductInfo]:
+        """
+        单次调用分析一批产品
+        
+        结果被截断或缺少部分产品时，只对缺失的产品补充请求一次；
+        补充请求后仍缺失的产品才回退到单个分析
+        """
+        if self.stream:
+            analyzed_products = [product async for product in self.iter_batch_analysis(products)]
+        else:
+            # 调用AI API进行批量分析
+            messages = self._build_batch_messages(products)
+            response = await self._call_ai_api(messages, temperature=0.1, max_tokens=self.batch_output_tokens,
+                                               call_site="batch")
+            
+            if not response:
+                raise Exception("AI批量分析返回空结果")
+            
+            # 解析批量分析结果
+            try:
+                analyzed_products = self._parse_batch_analysis_result(response, products)
+            except Exception:
+                mark_parse("failed")
+                raise
+            mark_parse(self._batch_parse_outcome(len(analyzed_products), len(products)))
+        
+        if not analyzed_products:
+            raise Exception("AI批量分析返回空结果")
+        
+        analyzed_ids = {id(product) for product in analyzed_products}
+        missing = [product for product in products if id(product) not in analyzed_ids]
+        if not missing or not recover_missing:
+            return analyzed_products
+        
+        logger.warning(f"批量分析缺少 {len(missing)}/{len(products)} 个产品的结果，补充请求缺失的产品")
+        try:
+            recovered = await self._analyze_batch(missing, recover_missing=False)
+        except Exception as e:
+            logger.error(f"补充批量分析失败: {e}")
+            recovered = []
+        
+        recovered_ids = {id(product) for product in recovered}
+        still_missing = [product for product in missing if id(product) not in recovered_ids]
+        if still_missing:
+            recovered += await self._fallback_single_analysis(still_missing)
+        
+        analyzed_ids.update(id(product) for product in recovered)
+        return [product for product in products if id(product) in analyzed_ids]
+    
+    async def iter_batch_analysis(self, products: List[ProductInfo]) -> AsyncIterator[ProductInfo]:
+        """
+        流式分析一批产品
+        
+        模型每输出完一个产品的分析对象就立即回填并返回该产品，
+        调用方可以在模型仍在生成时开始处理前面的产品
+        """
+        parser = IncrementalArrayParser("products")
+        messages = self._build_batch_messages(products)
+        applied = 0
+        async for content in self._stream_ai_api(messages, temperature=0.1, max_tokens=self.batch_output_tokens,
+                                                 call_site="batch"):
+            for analysis in parser.feed(content):
+                product = self._apply_batch_analysis(analysis, products)
+                if product is not None:
+                    applied += 1
+                    yield product
+        
+        mark_parse(self._batch_parse_outcome(applied, len(products)))
+        if parser.items and not parser.complete:
+            logger.warning(f"流式批量分析结果不完整，已解析 {len(parser.items)}/{len(products)} 个产品")
+    
+    @staticmethod
+    def _batch_parse_outcome(parsed: int, expected: int) -> str:
+        if parsed >= expected:
+            return "ok"
+        return "partial" if parsed else "failed"
+    
+    def _build_batch_messages(self, products: List[ProductInfo]) -> List[Dict]:
+        """构建一批产品的批量分析消息，长字段按token预算压缩"""
         # 构建批量分析的输入数据
         products_data = []
+        saved = 0
         for i, product in enumerate(products, 1):
+            skip_translation = self._known_translation(product) is not None
+            description = product.description or ""
+            maker_comment = product.maker_comment or ""
+            # 需要翻译的描述原样保留，译文才完整；无需翻译时描述只用于评分，可以压缩
+            compact_description = summarize(description, self.prompt_description_tokens) if skip_translation else description
+            compact_comment = summarize(maker_comment, self.prompt_comment_tokens)
+            saved += (estimate_tokens(description) - estimate_tokens(compact_description)
+                      + estimate_tokens(maker_comment) - estimate_tokens(compact_comment))
             product_data = {
                 "index": i,
                 "name": product.name,
                 "tagline": product.tagline,
-                "description": product.description,
+                "description": compact_description,
                 "tags": product.tags,
-                "maker_comment": product.maker_comment or "无"
+                "maker_comment": compact_comment or "无",
+                "skip_translation": skip_translation
             }
             products_data.append(product_data)
         
         # 构建批量分析的提示词
         prompt = self._build_batch_analysis_prompt(products_data)
-        
-        # 调用AI API进行批量分析
-        messages = [{"role": "user", "content": prompt}]
-        response = self._call_ai_api(messages, temperature=0.1, max_tokens=8000)
-        
-        if not response:
-            raise Exception("AI批量分析返回空结果")
-        
-        # 解析批量分析结果
-        analyzed_products = self._parse_batch_analysis_result(response, products)
-        
-        return analyzed_products
+        with self._stats_lock:
+            self.prompt_tokens += estimate_tokens(prompt)
+            self.prompt_tokens_saved += saved
+        return [{"role": "user", "content": prompt}]
     
     def _build_batch_analysis_prompt(self, products_data: list) -> str:
         """构建批量分析的提示词"""
@@ -158,47 +563,21 @@ class AIAnalyzer:
 - 标签: {', '.join(product['tags']) if product['tags'] else '无'}
 - 创始人评论: {product['maker_comment']}
 """
+            if product.get('skip_translation'):
+                products_text += "- 无需翻译（translated_description 返回空字符串）\n"
         
         prompt = f"""请对以下 {len(products_data)} 个Product Hunt产品进行批量分析。
-
 {products_text}
+按以下JSON格式返回，每个产品一个对象，index 与上文编号一致：
+{{"products": [{{"index": 1, "ai_relevance_score": 0.8, "translated_description": "中文描述", "application_scenarios": ["场景1", "场景2", "场景3"], "founder_insights": "创始人洞察"}}]}}
 
-请严格按照以下JSON格式返回分析结果，每个产品一个对象：
-
-{{
-  "products": [
-    {{
-      "index": 1,
-      "ai_relevance_score": 0.8,
-      "translated_description": "中文翻译的产品描述",
-      "application_scenarios": ["场景1", "场景2", "场景3"],
-      "founder_insights": "创始人洞察分析"
-    }},
-    {{
-      "index": 2,
-      "ai_relevance_score": 0.2,
-      "translated_description": "中文翻译的产品描述",
-      "application_scenarios": ["场景1", "场景2", "场景3"],
-      "founder_insights": "创始人洞察分析"
-    }}
-  ]
-}}
-
-分析要求：
-1. ai_relevance_score: 0-1之间的AI相关性评分
-   - 0.9-1.0: 核心AI产品（AI模型、机器学习平台、智能助手等）
-   - 0.7-0.8: 重度使用AI技术（AI生成内容、智能分析等）
-   - 0.5-0.6: 轻度使用AI功能（部分AI功能、智能推荐等）
-   - 0.3-0.4: 间接相关（AI训练数据、开发工具等）
-   - 0.0-0.2: 不相关或仅提及AI概念
-
-2. translated_description: 将产品描述翻译成中文，保持专业性和准确性
-
-3. application_scenarios: 列出3个具体应用场景，每个场景15字以内，贴合产品实际功能
+要求：
+1. ai_relevance_score（0-1）：0.9+ 核心AI产品；0.7 重度使用AI；0.5 轻度AI功能；0.3 间接相关；0.0-0.2 不相关
+2. translated_description：描述的专业中文翻译；标注“无需翻译”的返回空字符串
+3. application_scenarios：3个贴合实际功能的场景，各15字以内
+4. founder_insights：有创始人评论时分析其动机、要解决的问题和方案，否则返回"暂无创始人评论信息"
 
-4. founder_insights: 如果有创始人评论，分析创始人的动机（为什么做这个产品）、要解决的问题、采用的解决方案；如果没有创始人评论则返回"暂无创始人评论信息"
-
-请确保返回有效的JSON格式，不要包含markdown代码块标记。"""
+只返回有效JSON，不要包含markdown代码块标记。"""
         
         return prompt
     
@@ -225,24 +604,23 @@ class AIAnalyzer:
             
             # 按照索引匹配原始产品和分析结果
             for analysis in products_analysis:
-                index = analysis.get('index', 0) - 1  # 转换为0基索引
-                
-                if 0 <= index < len(original_products):
-                    product = original_products[index]
-                    
-                    # 更新产品信息
-                    product.ai_relevance_score = analysis.get('ai_relevance_score', 0.0)
-                    product.translated_description = analysis.get('translated_description', product.description)
-                    product.application_scenarios = analysis.get('application_scenarios', [])
-                    product.founder_insights = analysis.get('founder_insights', '暂无创始人评论信息')
-                    
+                product = self._apply_batch_analysis(analysis, original_products)
+                if product is not None:
                     analyzed_products.append(product)
-                    
-                    logger.info(f"分析产品: {product.name} (AI相关性: {product.ai_relevance_score:.2f})")
             
             return analyzed_products
             
         except json.JSONDecodeError as e:
+            # 响应被截断或格式有误时，取回其中所有完整的产品对象
+            parser = IncrementalArrayParser("products")
+            parser.feed(response)
+            salvaged = [product for product in
+                        (self._apply_batch_analysis(analysis, original_products) for analysis in parser.items)
+                        if product is not None]
+            if salvaged:
+                logger.warning(f"批量分析JSON不完整（{e}），已取回 {len(salvaged)}/{len(original_products)} 个产品")
+                return salvaged
+            
             logger.error(f"批量分析JSON解析失败: {e}")
             logger.debug(f"原始响应: {response}")
             raise Exception(f"批量分析结果解析失败: {e}")
@@ -250,30 +628,139 @@ class AIAnalyzer:
             logger.error(f"批量分析结果处理失败: {e}")
             raise
     
-    def _fallback_single_analysis(self, products: List[ProductInfo]) -> List[ProductInfo]:
-        """回退到单个产品分析的方法"""
-        logger.info("使用单个产品分析模式作为备选方案")
-        analyzed_products = []
+    def _apply_batch_analysis(self, analysis: Dict[str, Any], products: List[ProductInfo]) -> Optional[ProductInfo]:
+        """按 index 将单个分析对象回填到对应产品"""
+        try:
+            index = int(analysis.get('index', 0)) - 1  # 转换为0基索引
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= index < len(products):
+            return None
         
-        for product in products:
-            try:
-                # 计算AI相关性评分（仅用于参考，不过滤）
-                relevance_score = self._calculate_ai_relevance(product)
-                
-                # 对所有产品进行详细分析
-                analyzed_product = self._analyze_single_product(product)
-                analyzed_product.ai_relevance_score = relevance_score
-                analyzed_products.append(analyzed_product)
-                
-                logger.info(f"分析产品: {product.name} (AI相关性: {relevance_score:.2f})")
-                    
-            except Exception as e:
-                logger.error(f"分析产品 {product.name} 失败: {e}")
-                continue
-                
-        return analyzed_products
+        product = products[index]
+        
+        # 更新产品信息
+        product.ai_relevance_score = analysis.get('ai_relevance_score', 0.0)
+        product.translated_description = self._resolve_translation(product, analysis.get('translated_description'))
+        product.application_scenarios = analysis.get('application_scenarios', [])
+        product.founder_insights = analysis.get('founder_insights', '暂无创始人评论信息')
+        
+        logger.info(f"分析产品: {product.name} (AI相关性: {product.ai_relevance_score:.2f})")
+        return product
+    
+    async def _fallback_single_analysis(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        """回退到单个产品分析的方法，每个产品一次调用，按配置并发执行"""
+        if not products:
+            return []
+        
+        workers = min(self.single_concurrency, len(products))
+        logger.info(f"使用单个产品分析模式作为备选方案，{len(products)} 个产品，并发 {workers}")
+        semaphore = asyncio.Semaphore(workers)
+        
+        async def analyze(product: ProductInfo) -> Optional[ProductInfo]:
+            async with semaphore:
+                try:
+                    analyzed_product = await self._analyze_single_product_combined(product)
+                    if analyzed_product is None:
+                        return None
+                    logger.info(f"分析产品: {product.name} (AI相关性: {analyzed_product.ai_relevance_score:.2f})")
+                    return analyzed_product
+                except Exception as e:
+                    logger.error(f"分析产品 {product.name} 失败: {e}")
+                    return None
+        
+        results = await asyncio.gather(*[analyze(product) for product in products])
+        
+        return [product for product in results if product is not None]
+    
+    async def _analyze_single_product_combined(self, product: ProductInfo) -> Optional[ProductInfo]:
+        """
+        一次调用完成单个产品的评分、翻译、应用场景与创始人洞察
+        
+        返回了内容但无法解析时，退回到逐项调用的分析方式；调用失败（重试用尽后仍无返回）时
+        返回 None，不再追加逐项调用，避免服务故障或大量限流时每个产品多出 2-3 次调用。
+        未分析的产品不能带着默认的 0 分混入结果，否则会被当作真实评分展示并用于训练本地相关性模型
+        """
+        maker_comment = summarize(product.maker_comment or "", self.prompt_comment_tokens)
+        prompt = f"""请对以下Product Hunt产品进行分析：
+
+产品名称: {product.name}
+产品介绍: {product.tagline}
+产品描述: {product.description}
+产品标签: {', '.join(product.tags) if product.tags else '无'}
+创始人评论: {maker_comment or '无'}
+{'产品描述无需翻译，translated_description 返回空字符串' if self._known_translation(product) is not None else ''}
+请严格按照以下JSON格式返回分析结果，不要添加任何额外文字：
+
+{{
+  "ai_relevance_score": 0.8,
+  "translated_description": "中文翻译的产品描述",
+  "application_scenarios": ["场景1", "场景2", "场景3"],
+  "founder_insights": "创始人洞察分析"
+}}
+
+分析要求：
+- ai_relevance_score: 0-1之间的AI相关性评分（0.9-1.0 核心AI产品；0.7-0.8 重度使用AI技术；0.5-0.6 轻度使用AI功能；0.3-0.4 间接相关；0.0-0.2 不相关或仅提及AI概念）
+- translated_description: 将产品描述翻译成中文，保持专业性和准确性
+- application_scenarios: 列出3个具体应用场景，每个场景15字以内，贴合产品实际功能
+- founder_insights: 如果有创始人评论，分析创始人的动机（为什么做这个产品）、要解决的问题、采用的解决方案；如果没有创始人评论则返回"暂无创始人评论信息"
+
+请确保返回有效的JSON格式，不要包含markdown代码块标记。"""
+        
+        messages = [{"role": "user", "content": prompt}]
+        response = await self._call_ai_api(messages, temperature=0.1, call_site="combined")
+        if not response:
+            mark_parse("failed")
+            logger.warning(f"单次分析未返回结果，跳过该产品: {product.name}")
+            return None
+        
+        try:
+            analysis_result = json.loads(self._strip_code_fence(response))
+            score = float(analysis_result.get('ai_relevance_score', 0.0))
+        except (ValueError, TypeError, AttributeError) as e:
+            mark_parse("failed")
+            logger.warning(f"单次分析结果解析失败，改为逐项分析 {product.name}: {e}")
+            relevance_score, product = await asyncio.gather(
+                self._calculate_ai_relevance(product), self._analyze_single_product(product))
+            product.ai_relevance_score = relevance_score
+            return product
+        
+        mark_parse("ok")
+        product.ai_relevance_score = max(0.0, min(1.0, score))
+        product.translated_description = self._resolve_translation(product, analysis_result.get('translated_description'))
+        product.application_scenarios = analysis_result.get('application_scenarios', [])
+        product.founder_insights = analysis_result.get('founder_insights', '暂无创始人评论信息')
+        return product
+    
+    def _known_translation(self, product: ProductInfo) -> Optional[str]:
+        """描述已是中文或翻译记忆中已有译文时返回译文，否则返回 None"""
+        text = product.description
+        if not text or is_chinese(text):
+            return text
+        if translation_memory:
+            return translation_memory.lookup_text(text)
+        return None
+    
+    def _resolve_translation(self, product: ProductInfo, translated: Optional[str]) -> str:
+        """确定最终译文：模型给出译文时记入翻译记忆，未给出时使用已知译文"""
+        if translated:
+            if translation_memory and product.description and not is_chinese(product.description):
+                translation_memory.store({" ".join(product.description.split()): translated})
+            return translated
+        known = self._known_translation(product)
+        return known if known is not None else product.description
+    
+    @staticmethod
+    def _strip_code_fence(response: str) -> str:
+        """去掉模型输出中可能包裹的 markdown 代码块标记"""
+        response_clean = (response or "").strip()
+        if response_clean.startswith('```json'):
+            response_clean = response_clean.replace('```json', '').replace('```', '').strip()
+        elif response_clean.startswith('```'):
+            response_clean = response_clean.replace('```', '').strip()
+        return response_clean
     
-    def _calculate_ai_relevance(self, product: ProductInfo) -> float:
+    async def _calculate_ai_relevance(self, product: ProductInfo) -> float:
         """计算产品的AI相关性评分"""
         try:
             prompt = f"""请分析以下产品是否与AI/人工智能相关，并给出0-1之间的相关性评分：
@@ -293,11 +780,12 @@ class AIAnalyzer:
 请直接返回数字评分，不需要解释。"""
             
             messages = [{"role": "user", "content": prompt}]
-            response = self._call_ai_api(messages, temperature=0.1, max_tokens=10)
+            response = await self._call_ai_api(messages, temperature=0.1, max_tokens=10, call_site="relevance")
             
             if response:
                 # 尝试从响应中提取数字评分
                 score_match = re.search(r'(?:^|\s)(0?\.\d+|1\.0|0|1)(?:\s|$)', response)
+                mark_parse("ok" if score_match else "failed")
                 if score_match:
                     score = float(score_match.group(1))
                     return max(0.0, min(1.0, score))
@@ -308,7 +796,7 @@ class AIAnalyzer:
             logger.error(f"计算AI相关性失败: {e}")
             return 0.0
     
-    def _analyze_single_product(self, product: ProductInfo) -> ProductInfo:
+    async def _analyze_single_product(self, product: ProductInfo) -> ProductInfo:
         """对单个产品进行详细分析"""
         try:
             prompt = f"""请对以下产品进行分析：
@@ -334,7 +822,7 @@ class AIAnalyzer:
 请确保返回有效的JSON格式，不要包含markdown代码块标记。"""
             
             messages = [{"role": "user", "content": prompt}]
-            response = self._call_ai_api(messages, temperature=0.1)
+            response = await self._call_ai_api(messages, temperature=0.1, call_site="single")
             
             if response:
                 try:
@@ -349,6 +837,7 @@ class AIAnalyzer:
                     
                     # 尝试解析JSON
                     analysis_result = json.loads(response_clean)
+                    mark_parse("ok")
                     
                     # 更新产品信息
                     product.translated_description = analysis_result.get('translated_description', product.description)
@@ -358,16 +847,17 @@ class AIAnalyzer:
                     logger.info(f"AI分析成功: {product.name}")
                     
                 except json.JSONDecodeError as e:
+                    mark_parse("failed")
                     logger.warning(f"JSON解析失败，尝试简单分析: {e}")
                     logger.debug(f"原始响应: {response}")
                     
                     # 如果JSON解析失败，尝试简单处理
-                    product.translated_description = self._simple_translate(product.description)
+                    product.translated_description = await self._simple_translate(product.description)
                     product.founder_insights = self._extract_insights_from_text(response, product.maker_comment)
                     
             else:
                 logger.warning(f"AI分析失败，使用默认值")
-                product.translated_description = self._simple_translate(product.description)
+                product.translated_description = await self._simple_translate(product.description)
                 product.founder_insights = '暂无创始人评论信息'
             
             return product
@@ -375,7 +865,7 @@ class AIAnalyzer:
         except Exception as e:
             logger.error(f"AI分析产品失败: {e}")
             # 发生错误时，至少保证基本信息可用
-            product.translated_description = self._simple_translate(product.description)
+            product.translated_description = await self._simple_translate(product.description)
             product.founder_insights = '暂无创始人评论信息'
             return product
     
@@ -407,11 +897,37 @@ class AIAnalyzer:
         except Exception:
             return '暂无创始人评论信息'
     
-    def _simple_translate(self, text: str) -> str:
-        """简单翻译功能"""
-        if not text:
+    async def translate(self, text: str) -> str:
+        """将英文文本翻译为中文，已是中文的文本原样返回"""
+        return await self._simple_translate(text)
+    
+    async def _simple_translate(self, text: str) -> str:
+        """
+        简单翻译功能
+        
+        已是中文的文本直接返回；启用翻译记忆时按句段复用已有译文，只翻译未见过的句子
+        """
+        if not text or is_chinese(text):
             return text
-            
+        
+        if translation_memory:
+            segments = split_segments(text)
+            foreign = [segment for segment in segments if not is_chinese(segment)]
+            known = translation_memory.lookup_segments(foreign)
+            missing = list(dict.fromkeys(segment for segment in foreign if segment not in known))
+            if not missing:
+                return "".join(known.get(segment, segment) for segment in segments)
+            if len(segments) > 1:
+                if len(missing) > 1:
+                    translated = await self._translate_segments(missing)
+                else:
+                    translated = {missing[0]: await self._simple_translate(missing[0])}
+                translated = {source: target for source, target in translated.items() if target != source}
+                if translated:
+                    translation_memory.store(translated)
+                    known.update(translated)
+                    return "".join(known.get(segment, segment) for segment in segments)
+        
         try:
             prompt = f"""请将以下英文翻译为中文，要求：
 1. 保持原意和专业性
@@ -421,16 +937,43 @@ class AIAnalyzer:
 原文：{text}"""
             
             messages = [{"role": "user", "content": prompt}]
-            response = self._call_ai_api(messages, temperature=0.1, max_tokens=1000)
+            response = await self._call_ai_api(messages, temperature=0.1, max_tokens=1000, call_site="translate")
             
+            if response and translation_memory:
+                translation_memory.store({" ".join(text.split()): response})
             return response if response else text
             
         except Exception as e:
             logger.error(f"翻译失败: {e}")
             return text
     
-    def generate_daily_summary(self, products: List[ProductInfo]) -> str:
+    async def _translate_segments(self, segments: List[str]) -> Dict[str, str]:
+        """一次调用翻译多个句段，返回 {原文: 译文}；结果数量不一致时返回空字典"""
+        numbered = "\n".join(f"{i}. {segment}" for i, segment in enumerate(segments, 1))
+        prompt = f"""请将以下 {len(segments)} 个英文句子分别翻译为中文，保持原意和专业性。
+只返回一个JSON字符串数组，按顺序对应每个句子的译文，不要包含任何说明或markdown代码块标记。
+
+{numbered}"""
+        
+        messages = [{"role": "user", "content": prompt}]
+        response = await self._call_ai_api(messages, temperature=0.1, max_tokens=1000, call_site="translate")
+        try:
+            translations = json.loads(self._strip_code_fence(response))
+        except ValueError:
+            mark_parse("failed")
+            return {}
+        if not isinstance(translations, list) or len(translations) != len(segments):
+            mark_parse("failed")
+            return {}
+        mark_parse("ok")
+        return {segment: str(translation) for segment, translation in zip(segments, translations) if translation}
+    
+    async def generate_daily_summary(self, products: List[ProductInfo]) -> str:
         """生成每日AI产品趋势总结"""
+        return await self._summarize_products(products)
+    
+    async def _summarize_products(self, products: List[ProductInfo]) -> str:
+        """根据产品名称与标语生成趋势总结，调用失败时返回默认文案"""
         if not products:
             return "今日暂无AI相关产品发布。"
             
@@ -452,7 +995,7 @@ class AIAnalyzer:
 4. 值得关注的亮点"""
             
             messages = [{"role": "user", "content": prompt}]
-            response = self._call_ai_api(messages, max_tokens=500)
+            response = await self._call_ai_api(messages, max_tokens=500, call_site="summary")
             
             return response if response else f"今日发现 {len(products)} 个AI相关产品，涵盖多个应用领域。"
             
@@ -460,18 +1003,87 @@ class AIAnalyzer:
             logger.error(f"生成每日总结失败: {e}")
             return f"今日发现 {len(products)} 个AI相关产品，涵盖多个应用领域。"
     
-    def remove_duplicates(self, products: List[ProductInfo]) -> List[ProductInfo]:
-        """去除重复产品"""
-        seen_names = set()
-        unique_products = []
+    def log_stats(self):
+        """将大模型调用统计写入运行日志"""
+        if self.provider == 'volcengine_ark':
+            self.client.log_stats()
+        if self.prompt_tokens_saved:
+            total = self.prompt_tokens + self.prompt_tokens_saved
+            logger.info(f"批量分析提示词约 {self.prompt_tokens} tokens，长字段压缩节省约 "
+                        f"{self.prompt_tokens_saved} tokens（{self.prompt_tokens_saved / total:.1%}）")
+        if relevance_scorer:
+            relevance_scorer.log_stats()
+        self.telemetry.log_summary()
+    
+    def remove_duplicates(self, products: List[ProductInfo], use_history: bool = True) -> List[ProductInfo]:
+        """
+        去除重复产品：链接、去掉版本号的产品名或标语+描述近似相同即视为重复
         
-        for product in products:
-            # 简单的去重逻辑，基于产品名称
-            name_key = product.name.lower().strip()
-            if name_key not in seen_names:
-                seen_names.add(name_key)
-                unique_products.append(product)
-            else:
-                logger.info(f"发现重复产品，已跳过: {product.name}")
-                
-        return unique_products 
\ No newline at end of file
+        use_history 为 True 时还会与近几天已出现的产品比对（见 src/dedup.py）
+        """
+        return dedup_engine.remove_duplicates(products, use_history=use_history)
+
+
+class AIAnalyzer:
+    """
+    AI分析器的同步包装
+    
+    持有一个 AsyncAIAnalyzer，并在专用线程中常驻一个事件循环，所有调用都提交到该循环中运行，
+    连接池在包装器的整个生命周期内复用；不再使用时调用 close() 关闭连接池并停止事件循环。
+    需要在一个事件循环内并发多个调用时直接使用 AsyncAIAnalyzer
+    """
+    
+    def __init__(self):
+        self.analyzer = AsyncAIAnalyzer()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="ai-analyzer-loop", daemon=True)
+        self._thread.start()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @property
+    def telemetry(self) -> LLMTelemetry:
+        return self.analyzer.telemetry
+    
+    def analyze_products(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        """批量分析产品列表"""
+        return self._run(self.analyzer.analyze_products(products))
+    
+    def analyze_products_with_summary(self, products: List[ProductInfo]) -> Tuple[List[ProductInfo], str]:
+        """分析产品列表并生成每日总结"""
+        return self._run(self.analyzer.analyze_products_with_summary(products))
+    
+    def generate_daily_summary(self, products: List[ProductInfo]) -> str:
+        """生成每日AI产品趋势总结"""
+        return self._run(self.analyzer.generate_daily_summary(products))
+    
+    def translate(self, text: str) -> str:
+        """将英文文本翻译为中文"""
+        return self._run(self.analyzer.translate(text))
+    
+    def log_stats(self):
+        """将大模型调用统计写入运行日志"""
+        self.analyzer.log_stats()
+    
+    def remove_duplicates(self, products: List[ProductInfo], use_history: bool = True) -> List[ProductInfo]:
+        """去除重复产品"""
+        return self.analyzer.remove_duplicates(products, use_history=use_history)
+    
+    def close(self):
+        """关闭连接池并停止事件循环，可重复调用"""
+        if self._loop.is_closed():
+            return
+        try:
+            self._run(self.analyzer.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+    
+    def _run(self, coroutine):
+        # 调用方（包括已处于其他事件循环中的代码）阻塞等待专用循环返回结果
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
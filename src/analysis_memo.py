@@ -0,0 +1,148 @@
+"""
+跨日产品分析备忘
+同一产品常连续多天出现在 Product Hunt 首页，按规范化的帖子链接记录内容指纹和分析结果，
+内容未变化的产品直接复用上次的分析，不再送入大模型
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from .config import config
+from .models import ProductInfo
+from .translation_memory import is_chinese
+
+logger = logging.getLogger(__name__)
+
+# 备忘保存的分析字段
+ANALYSIS_FIELDS = ('ai_relevance_score', 'translated_description', 'application_scenarios', 'founder_insights')
+
+
+def canonical_url(url: str) -> str:
+    """规范化链接：统一协议与主机大小写，去掉 www、查询参数、锚点和末尾斜杠"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+    return urlunsplit(('https', host, path, '', ''))
+
+
+def content_hash(product: ProductInfo) -> str:
+    """名称、标语、描述与创始人评论的内容指纹，空白差异不计"""
+    fields = (product.name, product.tagline, product.description, product.maker_comment or "")
+    text = "\x1f".join(" ".join((field or "").split()) for field in fields)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class AnalysisMemo:
+    """基于 SQLite 的产品分析备忘，多线程共享一个连接"""
+
+    def __init__(self, path: str, retention_days: int = 30):
+        self.path = path
+        self.retention_seconds = retention_days * 24 * 3600
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " product_key TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " analysis TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        if self.retention_seconds > 0:
+            self._conn.execute("DELETE FROM analyses WHERE updated_at < ?", (time.time() - self.retention_seconds,))
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def product_key(product: ProductInfo) -> str:
+        """优先使用规范化的帖子链接，没有链接时使用产品名"""
+        return canonical_url(product.original_url or product.url) or f"name:{product.name.strip().lower()}"
+
+    def lookup(self, product: ProductInfo) -> Optional[Dict[str, Any]]:
+        """内容指纹一致时返回备忘的分析字段"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, analysis FROM analyses WHERE product_key = ?", (self.product_key(product),)
+            ).fetchone()
+            if row is None or row[0] != content_hash(product):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[1])
+
+    def split_products(self, products: List[ProductInfo]) -> Tuple[List[ProductInfo], List[ProductInfo]]:
+        """
+        将产品分为已有分析（已回填分析字段）和需要重新分析两组
+
+        Returns:
+            (复用备忘的产品, 需要分析的产品)
+        """
+        reused, pending = [], []
+        for product in products:
+            analysis = self.lookup(product)
+            if analysis is None:
+                pending.append(product)
+                continue
+            for field in ANALYSIS_FIELDS:
+                if field in analysis:
+                    setattr(product, field, analysis[field])
+            reused.append(product)
+        return reused, pending
+
+    @staticmethod
+    def _is_complete(product: ProductInfo) -> bool:
+        # 分析失败时译文会退回原文，这类结果不记入备忘；原文已是中文时译文本就与原文相同
+        if not product.translated_description:
+            return False
+        return is_chinese(product.description) or product.translated_description != product.description
+
+    def store(self, products: List[ProductInfo]) -> int:
+        """记录分析结果，返回写入条数"""
+        rows = [
+            (self.product_key(product), content_hash(product),
+             json.dumps({field: getattr(product, field) for field in ANALYSIS_FIELDS}, ensure_ascii=False),
+             time.time())
+            for product in products if self._is_complete(product)
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO analyses (product_key, content_hash, analysis, updated_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+
+def _create_analysis_memo() -> Optional[AnalysisMemo]:
+    """根据配置创建全局分析备忘，未启用或不可用时返回 None"""
+    if not config.cache.analysis_memo_enabled:
+        return None
+    try:
+        return AnalysisMemo(
+            os.path.join(config.cache.dir, "analysis_memo.sqlite3"),
+            retention_days=config.cache.analysis_memo_days
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"产品分析备忘不可用，已禁用: {e}")
+        return None
+
+
+# 全局分析备忘实例
+analysis_memo = _create_analysis_memo()
@@ -0,0 +1,142 @@
+"""
+历史日报回填
+按日期区间并行抓取、分析并保存每日报告（不推送飞书），已存在的日报自动跳过
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any
+
+import pytz
+
+from .config import config
+from .scrapers.collector import SourceCollector
+from .ai_analyzer import AIAnalyzer
+from .report_generator import ReportGenerator
+from .rate_limiter import rate_limiter
+from .llm_cache import llm_cache
+
+logger = logging.getLogger(__name__)
+
+
+class BackfillRunner:
+    """历史日报回填执行器"""
+
+    def __init__(self, workers: int = 4, force: bool = False):
+        self.workers = max(1, workers)
+        self.force = force
+        self.timezone = pytz.timezone(config.app.timezone)
+        self.report_generator = ReportGenerator()
+
+        # 每个工作线程持有独立的采集器和分析器（各自的HTTP会话），限流器全局共享
+        self._local = threading.local()
+        # 各线程创建的分析器，回填结束后统一关闭各自的事件循环
+        self._analyzers: List[AIAnalyzer] = []
+        self._analyzers_lock = threading.Lock()
+
+    def _worker_components(self):
+        if not hasattr(self._local, 'collector'):
+            self._local.collector = SourceCollector()
+            self._local.ai_analyzer = AIAnalyzer()
+            with self._analyzers_lock:
+                self._analyzers.append(self._local.ai_analyzer)
+        return self._local.collector, self._local.ai_analyzer
+
+    @staticmethod
+    def iter_days(start: date, end: date) -> List[date]:
+        """生成闭区间内的所有日期"""
+        if end < start:
+            start, end = end, start
+        return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+    def _is_done(self, day: date) -> bool:
+        """日报JSON已存在即视为完成，支持中断后续跑"""
+        return os.path.exists(self.report_generator.get_report_path(day, "json"))
+
+    def run(self, start: date, end: date) -> Dict[str, Any]:
+        """
+        回填指定日期区间的日报
+
+        Returns:
+            执行结果统计
+        """
+        days = self.iter_days(start, end)
+        pending = [day for day in days if self.force or not self._is_done(day)]
+        skipped = len(days) - len(pending)
+
+        logger.info(f"开始回填 {days[0]} ~ {days[-1]} 共 {len(days)} 天，"
+                    f"已存在 {skipped} 天，待处理 {len(pending)} 天，并发 {self.workers}")
+
+        start_time = time.perf_counter()
+        succeeded: List[date] = []
+        failed: List[date] = []
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as executor:
+            futures = {executor.submit(self._process_day, day): day for day in pending}
+            for future in as_completed(futures):
+                day = futures[future]
+                try:
+                    if future.result():
+                        succeeded.append(day)
+                    else:
+                        failed.append(day)
+                except Exception as e:
+                    logger.error(f"回填 {day} 异常: {e}")
+                    failed.append(day)
+
+        with self._analyzers_lock:
+            analyzers, self._analyzers = self._analyzers, []
+        for ai_analyzer in analyzers:
+            ai_analyzer.close()
+
+        elapsed = time.perf_counter() - start_time
+        rate_limiter.log_stats()
+        if llm_cache:
+            llm_cache.log_stats()
+        logger.info(f"回填完成: 成功 {len(succeeded)} 天，失败 {len(failed)} 天，"
+                    f"跳过 {skipped} 天，耗时 {elapsed:.1f}s")
+
+        return {
+            "total": len(days),
+            "succeeded": sorted(succeeded),
+            "failed": sorted(failed),
+            "skipped": skipped,
+            "elapsed": elapsed
+        }
+
+    def _process_day(self, day: date) -> bool:
+        """抓取、分析并保存单日报告"""
+        collector, ai_analyzer = self._worker_components()
+        logger.info(f"回填 {day}: 开始抓取")
+
+        # 传入不带时区的日期，由各抓取器按信息源所在时区解释
+        raw_products = collector.collect(datetime(day.year, day.month, day.day))
+        if not raw_products:
+            logger.warning(f"回填 {day}: 未获取到产品数据")
+            return False
+        # 后备数据是模拟产品：保存后该日会被视为已完成且不再重试，还会混入相关性模型的训练数据
+        if collector.fallback_sources:
+            logger.error(f"回填 {day}: 信息源 {', '.join(collector.fallback_sources)} 抓取失败，"
+                         f"不保存该日报告，下次回填时重试")
+            return False
+
+        # 每个工作线程依次处理多天，按天统计大模型调用
+        ai_analyzer.telemetry.reset()
+        # 回填按历史日期乱序执行，只做当日内去重，不与近期产品比对
+        unique_products = ai_analyzer.remove_duplicates(raw_products, use_history=False)
+        ai_products, analysis_summary = ai_analyzer.analyze_products_with_summary(unique_products)
+
+        report_date = self.timezone.localize(datetime(day.year, day.month, day.day))
+        report = self.report_generator.generate_daily_report(ai_products, analysis_summary, report_date,
+                                                             ai_analyzer.telemetry.summary())
+
+        # 先写Markdown再写JSON，JSON存在即表示该日已完成
+        self.report_generator.save_report(report, "markdown")
+        self.report_generator.save_report(report, "json")
+        ai_analyzer.log_stats()
+        logger.info(f"回填 {day}: 已保存 {len(ai_products)} 个产品")
+        return True
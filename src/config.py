@@ -27,6 +27,14 @@ class SourceConfig:
     url: str
     api_url: str
     rate_limit: int
+    api_token: str = ""
+    burst: int = 5
+    max_products: int = 10
+    page_size: int = 50
+    detail_pages: bool = False
+    detail_concurrency: int = 8
+    detail_timeout: int = 10
+    timeout: int = 60
 
 @dataclass
 class AIConfig:
@@ -38,12 +46,35 @@ class AIConfig:
     api_key: str
     base_url: str = ""
     endpoint_id: str = ""
+    rate_limit: int = 0
+    burst: int = 5
+    batch_output_tokens: int = 8000
+    batch_concurrency: int = 4
+    stream: bool = False
+    timeout: int = 60
+    max_retries: int = 3
+    retry_backoff: float = 1.0
+    retry_backoff_max: float = 30.0
+    pool_size: int = 10
+    single_concurrency: int = 8
+    prompt_description_tokens: int = 120
+    prompt_comment_tokens: int = 150
+    prompt_price: float = 0.0
+    completion_price: float = 0.0
+    summary_mode: str = "concurrent"
 
 @dataclass
 class FilteringConfig:
     """内容筛选配置"""
     ai_keywords: List[str]
     exclude_keywords: List[str]
+    prefilter: bool = True
+    local_relevance: bool = True
+    relevance_model_path: str = ""
+    relevance_threshold: float = 0.5
+    relevance_skip_below: float = 0.2
+    dedup_similarity: float = 0.7
+    dedup_history_days: float = 3
 
 @dataclass
 class FeishuConfig:
@@ -58,6 +89,8 @@ class ScheduleConfig:
     """定时任务配置"""
     daily_report_time: str
     data_collection_time: str
+    poll_interval_minutes: int = 0
+    poll_min_vote_delta: int = 1
 
 @dataclass
 class OutputConfig:
@@ -66,6 +99,30 @@ class OutputConfig:
     include_images: bool
     max_products: int
 
+@dataclass
+class CacheConfig:
+    """本地缓存配置"""
+    dir: str = ".cache"
+    http_enabled: bool = True
+    snapshots_enabled: bool = True
+    snapshot_compression: str = "gzip"
+    llm_enabled: bool = True
+    llm_ttl_hours: float = 168
+    llm_max_entries: int = 5000
+    analysis_memo_enabled: bool = True
+    analysis_memo_days: int = 30
+    translation_memory_enabled: bool = True
+    dedup_index_enabled: bool = True
+
+# 内置信息源的默认配置
+SOURCE_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    'product_hunt': {
+        'enabled': True,
+        'url': 'https://www.producthunt.com',
+        'api_url': 'https://api.producthunt.com/v2/api/graphql'
+    }
+}
+
 class ConfigManager:
     """配置管理器"""
     
@@ -88,14 +145,14 @@ class ConfigManager:
                 log_level=app_data.get('log_level', 'INFO')
             )
             
-            # 信息源配置
-            ph_data = config_data.get('sources', {}).get('product_hunt', {})
-            self.product_hunt = SourceConfig(
-                enabled=ph_data.get('enabled', True),
-                url=ph_data.get('url', 'https://www.producthunt.com'),
-                api_url=ph_data.get('api_url', 'https://api.producthunt.com/v2/api/graphql'),
-                rate_limit=ph_data.get('rate_limit', 60)
-            )
+            # 信息源配置（每个信息源一项，名称与抓取器注册名一致）
+            sources_data = dict(config_data.get('sources') or {})
+            sources_data.setdefault('product_hunt', {})
+            self.sources = {
+                name: self._parse_source_config(name, data or {})
+                for name, data in sources_data.items()
+            }
+            self.product_hunt = self.sources['product_hunt']
             
             # AI配置
             ai_data = config_data.get('ai', {})
@@ -114,14 +171,37 @@ class ConfigManager:
                 max_tokens=ai_data.get('max_tokens', 2000),
                 api_key=api_key,
                 base_url=ai_data.get('base_url', ''),
-                endpoint_id=ai_data.get('endpoint_id', '')
+                endpoint_id=ai_data.get('endpoint_id', ''),
+                rate_limit=ai_data.get('rate_limit', 0),
+                burst=ai_data.get('burst', 5),
+                batch_output_tokens=ai_data.get('batch_output_tokens', 8000),
+                batch_concurrency=ai_data.get('batch_concurrency', 4),
+                stream=ai_data.get('stream', False),
+                timeout=ai_data.get('timeout', 60),
+                max_retries=ai_data.get('max_retries', 3),
+                retry_backoff=ai_data.get('retry_backoff', 1.0),
+                retry_backoff_max=ai_data.get('retry_backoff_max', 30.0),
+                pool_size=ai_data.get('pool_size', 10),
+                single_concurrency=ai_data.get('single_concurrency', 8),
+                prompt_description_tokens=ai_data.get('prompt_description_tokens', 120),
+                prompt_comment_tokens=ai_data.get('prompt_comment_tokens', 150),
+                prompt_price=ai_data.get('prompt_price', 0.0),
+                completion_price=ai_data.get('completion_price', 0.0),
+                summary_mode=ai_data.get('summary_mode', 'concurrent')
             )
             
             # 筛选配置
             filtering_data = config_data.get('filtering', {})
             self.filtering = FilteringConfig(
                 ai_keywords=filtering_data.get('keywords', {}).get('ai_related', []),
-                exclude_keywords=filtering_data.get('exclude_keywords', [])
+                exclude_keywords=filtering_data.get('exclude_keywords', []),
+                prefilter=filtering_data.get('prefilter', True),
+                local_relevance=filtering_data.get('local_relevance', True),
+                relevance_model_path=filtering_data.get('relevance_model_path', ''),
+                relevance_threshold=filtering_data.get('relevance_threshold', 0.5),
+                relevance_skip_below=filtering_data.get('relevance_skip_below', 0.2),
+                dedup_similarity=filtering_data.get('dedup_similarity', 0.7),
+                dedup_history_days=filtering_data.get('dedup_history_days', 3)
             )
             
             # 飞书配置
@@ -137,7 +217,9 @@ class ConfigManager:
             schedule_data = config_data.get('schedule', {})
             self.schedule = ScheduleConfig(
                 daily_report_time=schedule_data.get('daily_report_time', '09:00'),
-                data_collection_time=schedule_data.get('data_collection_time', '08:00')
+                data_collection_time=schedule_data.get('data_collection_time', '08:00'),
+                poll_interval_minutes=schedule_data.get('poll_interval_minutes', 0),
+                poll_min_vote_delta=schedule_data.get('poll_min_vote_delta', 1)
             )
             
             # 输出配置
@@ -148,6 +230,22 @@ class ConfigManager:
                 max_products=output_data.get('max_products', 10)
             )
             
+            # 缓存配置
+            cache_data = config_data.get('cache', {})
+            self.cache = CacheConfig(
+                dir=self._resolve_cache_dir(cache_data.get('dir', '.cache')),
+                http_enabled=cache_data.get('http_enabled', True),
+                snapshots_enabled=cache_data.get('snapshots_enabled', True),
+                snapshot_compression=cache_data.get('snapshot_compression', 'gzip'),
+                llm_enabled=cache_data.get('llm_enabled', True),
+                llm_ttl_hours=cache_data.get('llm_ttl_hours', 168),
+                llm_max_entries=cache_data.get('llm_max_entries', 5000),
+                analysis_memo_enabled=cache_data.get('analysis_memo_enabled', True),
+                analysis_memo_days=cache_data.get('analysis_memo_days', 30),
+                translation_memory_enabled=cache_data.get('translation_memory_enabled', True),
+                dedup_index_enabled=cache_data.get('dedup_index_enabled', True)
+            )
+            
         except Exception as e:
             print(f"配置加载失败: {e}")
             self._load_default_config()
@@ -155,8 +253,8 @@ class ConfigManager:
     def _load_default_config(self):
         """加载默认配置"""
         self.app = AppConfig("彩虹一号", "1.0.0", "Asia/Shanghai", "INFO")
-        self.product_hunt = SourceConfig(True, "https://www.producthunt.com", 
-                                       "https://api.producthunt.com/v2/api/graphql", 60)
+        self.product_hunt = self._parse_source_config('product_hunt', {})
+        self.sources = {'product_hunt': self.product_hunt}
         self.ai = AIConfig("volcengine_ark", "deepseek-v3", 0.3, 2000, 
                           os.getenv('AI_API_KEY', os.getenv('VOLCENGINE_ARK_API_KEY', '')),
                           "https://ark.cn-beijing.volces.com/api/v3",
@@ -173,6 +271,33 @@ class ConfigManager:
         )
         self.schedule = ScheduleConfig("09:00", "08:00")
         self.output = OutputConfig("markdown", True, 10)
+        self.cache = CacheConfig(self._resolve_cache_dir(".cache"))
+    
+    @staticmethod
+    def _parse_source_config(name: str, data: Dict[str, Any]) -> SourceConfig:
+        """解析单个信息源配置，API令牌通过环境变量 <名称>_API_TOKEN 提供"""
+        defaults = SOURCE_DEFAULTS.get(name, {})
+        return SourceConfig(
+            enabled=data.get('enabled', defaults.get('enabled', False)),
+            url=data.get('url', defaults.get('url', '')),
+            api_url=data.get('api_url', defaults.get('api_url', '')),
+            rate_limit=data.get('rate_limit', 60),
+            api_token=os.getenv(f"{name.upper()}_API_TOKEN", data.get('api_token', '')),
+            burst=data.get('burst', 5),
+            max_products=data.get('max_products', 10),
+            page_size=data.get('page_size', 50),
+            detail_pages=data.get('detail_pages', False),
+            detail_concurrency=data.get('detail_concurrency', 8),
+            detail_timeout=data.get('detail_timeout', 10),
+            timeout=data.get('timeout', 60)
+        )
+    
+    @staticmethod
+    def _resolve_cache_dir(cache_dir: str) -> str:
+        """serverless 环境中只有 /tmp 可写"""
+        if os.environ.get('VERCEL') or os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+            return os.path.join("/tmp", os.path.basename(cache_dir.rstrip('/')) or ".cache")
+        return cache_dir
 
 # 全局配置实例
 config = ConfigManager() 
\ No newline at end of file
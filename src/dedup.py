@@ -0,0 +1,256 @@
+"""
+产品去重
+同一产品可能带版本号重新发布（"Tabl 1.0" 与 "Tabl"），或同时出现在多个信息源。
+按规范化链接、规范化产品名以及标语+描述的 MinHash 相似度识别重复；
+MinHash 签名按 LSH 分桶持久化，新产品只需查询同桶的近期产品即可与历史比对
+"""
+
+import os
+import re
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import numpy as np
+
+from .config import config
+from .models import ProductInfo
+from .analysis_memo import AnalysisMemo
+
+logger = logging.getLogger(__name__)
+
+# 不影响页面内容的跟踪参数
+TRACKING_PARAMS = {'ref', 'via', 'source', 'fbclid', 'gclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga'}
+# 产品名末尾的版本号，如 "1.0"、"v2"、"2.0 beta"
+_VERSION_SUFFIX = re.compile(r'(\s+v?\d+(\.\d+)*(\s*(alpha|beta|pro))?)+$', re.I)
+_NON_WORD = re.compile(r'[\W_]+')
+
+# 标语+描述少于该字符数时不做相似度比对，过短的文本容易误判
+MIN_SHINGLE_TEXT = 40
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+# 32 个桶每桶 4 行：相似度约 0.42 以上的两段文本有一半以上概率落入同一桶
+LSH_BANDS = 32
+
+# MinHash 使用的梅森素数，取值范围内乘法不会溢出 uint64
+_PRIME = (1 << 31) - 1
+
+
+def canonical_product_url(url: str) -> str:
+    """规范化产品链接：统一协议与主机，去掉 www、跟踪参数、锚点和末尾斜杠，其余参数排序"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host:
+        return ""
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS)
+    return urlunsplit(('https', host, parts.path.rstrip('/'), urlencode(query), ''))
+
+
+def name_key(name: str) -> str:
+    """规范化产品名：小写、去掉版本号后缀与标点空白"""
+    name = _VERSION_SUFFIX.sub('', (name or '').strip())
+    return _NON_WORD.sub('', name.lower())
+
+
+def shingle_text(product: ProductInfo) -> str:
+    return " ".join(f"{product.tagline or ''} {product.description or ''}".lower().split())
+
+
+class MinHasher:
+    """字符 shingle 的 MinHash 签名"""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = LSH_BANDS, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """文本过短时返回 None"""
+        if len(text) < MIN_SHINGLE_TEXT:
+            return None
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+        hashes = np.array([zlib.crc32(shingle.encode('utf-8')) & _PRIME for shingle in shingles], dtype=np.uint64)
+        return ((np.outer(self.a, hashes) + self.b[:, None]) % _PRIME).min(axis=1)
+
+    def buckets(self, signature: np.ndarray) -> List[str]:
+        """LSH 分桶：每个桶号由桶序号与该段签名的哈希组成"""
+        return [f"{band}:{zlib.crc32(signature[band * self.rows:(band + 1) * self.rows].tobytes()):08x}"
+                for band in range(self.bands)]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """由签名估算 Jaccard 相似度"""
+    return float(np.mean(a == b))
+
+
+class DedupIndex:
+    """近期产品的持久化去重索引（SQLite），多线程共享一个连接"""
+
+    def __init__(self, path: str, retention_days: int = 30):
+        self.path = path
+        self.retention_seconds = retention_days * 24 * 3600
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS products ("
+            " product_key TEXT PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " signature BLOB,"
+            " seen_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS identities ("
+            " identity TEXT NOT NULL,"
+            " product_key TEXT NOT NULL,"
+            " PRIMARY KEY (identity, product_key));"
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " bucket TEXT NOT NULL,"
+            " product_key TEXT NOT NULL,"
+            " PRIMARY KEY (bucket, product_key));"
+        )
+        if self.retention_seconds > 0:
+            self._expire(time.time() - self.retention_seconds)
+        self._conn.commit()
+
+    def _expire(self, cutoff: float):
+        expired = "SELECT product_key FROM products WHERE seen_at < ?"
+        self._conn.execute(f"DELETE FROM identities WHERE product_key IN ({expired})", (cutoff,))
+        self._conn.execute(f"DELETE FROM buckets WHERE product_key IN ({expired})", (cutoff,))
+        self._conn.execute("DELETE FROM products WHERE seen_at < ?", (cutoff,))
+
+    def find(self, key: str, identities: Set[str], buckets: List[str], signature: Optional[np.ndarray],
+             threshold: float, since: float) -> Optional[str]:
+        """
+        查找 since 之后出现过、与给定产品重复的其他产品
+
+        Returns:
+            重复产品的名称，没有重复时返回 None
+        """
+        with self._lock:
+            if identities:
+                row = self._conn.execute(
+                    f"SELECT p.name FROM identities i JOIN products p ON p.product_key = i.product_key"
+                    f" WHERE i.identity IN ({','.join('?' * len(identities))}) AND i.product_key != ?"
+                    f" AND p.seen_at >= ? LIMIT 1",
+                    [*identities, key, since]
+                ).fetchone()
+                if row:
+                    return row[0]
+            if signature is None:
+                return None
+            rows = self._conn.execute(
+                f"SELECT DISTINCT p.name, p.signature FROM buckets b JOIN products p ON p.product_key = b.product_key"
+                f" WHERE b.bucket IN ({','.join('?' * len(buckets))}) AND b.product_key != ?"
+                f" AND p.seen_at >= ? AND p.signature IS NOT NULL",
+                [*buckets, key, since]
+            ).fetchall()
+        for name, blob in rows:
+            if similarity(signature, np.frombuffer(blob, dtype=np.uint64)) >= threshold:
+                return name
+        return None
+
+    def add(self, entries: List[Tuple[str, str, Set[str], List[str], Optional[np.ndarray]]]):
+        """记录产品：(产品键, 名称, 链接与名称标识, LSH 桶, 签名)"""
+        now = time.time()
+        with self._lock:
+            for key, name, identities, buckets, signature in entries:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO products (product_key, name, signature, seen_at) VALUES (?, ?, ?, ?)",
+                    (key, name, signature.tobytes() if signature is not None else None, now)
+                )
+                self._conn.executemany("INSERT OR IGNORE INTO identities (identity, product_key) VALUES (?, ?)",
+                                       [(identity, key) for identity in identities])
+                self._conn.executemany("INSERT OR IGNORE INTO buckets (bucket, product_key) VALUES (?, ?)",
+                                       [(bucket, key) for bucket in buckets])
+            self._conn.commit()
+
+
+class DedupEngine:
+    """本次采集内去重，并与持久化索引中的近期产品比对"""
+
+    def __init__(self, index: Optional[DedupIndex] = None, threshold: float = 0.7, history_days: float = 3):
+        self.index = index
+        self.threshold = threshold
+        self.history_seconds = history_days * 24 * 3600
+        self.hasher = MinHasher()
+
+    @staticmethod
+    def identities(product: ProductInfo) -> Set[str]:
+        """链接与产品名标识，任一相同即视为同一产品"""
+        identities = {f"url:{url}" for url in (canonical_product_url(product.url),
+                                               canonical_product_url(product.original_url)) if url}
+        name = name_key(product.name)
+        if name:
+            identities.add(f"name:{name}")
+        return identities
+
+    def remove_duplicates(self, products: List[ProductInfo], use_history: bool = True) -> List[ProductInfo]:
+        """
+        去除重复产品，保留最先出现的一个
+
+        Args:
+            use_history: 是否与索引中的近期产品比对；按历史日期回填时应关闭，
+                         索引记录的是处理时间而不是日报日期
+        """
+        unique: List[ProductInfo] = []
+        entries = []
+        seen_identities: Dict[str, str] = {}
+        seen_buckets: Dict[str, List[int]] = {}
+        signatures: List[Optional[np.ndarray]] = []
+        since = time.time() - self.history_seconds
+
+        for product in products:
+            key = AnalysisMemo.product_key(product)
+            identities = self.identities(product)
+            signature = self.hasher.signature(shingle_text(product))
+            buckets = self.hasher.buckets(signature) if signature is not None else []
+
+            duplicate = next((seen_identities[identity] for identity in identities if identity in seen_identities), None)
+            if duplicate is None and signature is not None:
+                candidates = {i for bucket in buckets for i in seen_buckets.get(bucket, [])}
+                duplicate = next((unique[i].name for i in sorted(candidates)
+                                  if similarity(signature, signatures[i]) >= self.threshold), None)
+            if duplicate is None and use_history and self.index:
+                duplicate = self.index.find(key, identities, buckets, signature, self.threshold, since)
+            if duplicate is not None:
+                logger.info(f"发现重复产品，已跳过: {product.name}（与 {duplicate} 重复）")
+                continue
+
+            for identity in identities:
+                seen_identities[identity] = product.name
+            for bucket in buckets:
+                seen_buckets.setdefault(bucket, []).append(len(unique))
+            signatures.append(signature)
+            unique.append(product)
+            entries.append((key, product.name, identities, buckets, signature))
+
+        if use_history and self.index:
+            self.index.add(entries)
+        return unique
+
+
+def _create_dedup_engine() -> DedupEngine:
+    """根据配置创建全局去重引擎，持久化索引未启用或不可用时只做本次采集内去重"""
+    index = None
+    if config.cache.dedup_index_enabled:
+        try:
+            index = DedupIndex(os.path.join(config.cache.dir, "dedup_index.sqlite3"))
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"去重索引不可用，只做本次采集内去重: {e}")
+    return DedupEngine(index, config.filtering.dedup_similarity, config.filtering.dedup_history_days)
+
+
+# 全局去重引擎
+dedup_engine = _create_dedup_engine()
@@ -0,0 +1,190 @@
+"""
+日内增量轮询
+每隔N分钟重新抓取一次，与上一次快照按产品键比对，
+只输出变化的记录（新上线、排名变化、票数变化），且只有新产品会交给AI分析
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+from .config import config
+from .models import ProductInfo
+from .scrapers.collector import SourceCollector
+from .ai_analyzer import AIAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# 超过该时长未再出现的产品从状态中移除
+STATE_RETENTION_SECONDS = 48 * 3600
+
+
+def product_key(product: ProductInfo) -> str:
+    """产品键：信息源 + 原始链接（无链接时退化为产品名）"""
+    identity = product.original_url or product.url or product.name.strip().lower()
+    return f"{product.source}:{identity.rstrip('/')}"
+
+
+@dataclass
+class ProductChange:
+    """一次轮询中单个产品的变化"""
+    kind: str  # new / rank / votes
+    product: ProductInfo
+    previous_rank: Optional[int] = None
+    previous_votes: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'key': product_key(self.product),
+            'name': self.product.name,
+            'ranking': self.product.ranking,
+            'votes': self.product.votes,
+            'previous_rank': self.previous_rank,
+            'previous_votes': self.previous_votes
+        }
+
+
+class IncrementalPoller:
+    """
+    增量轮询器
+
+    状态（每个产品最近一次的排名、票数和分析结果）持久化在缓存目录中，
+    进程重启后不会把已分析过的产品再次送入AI分析
+    """
+
+    def __init__(self, collector: Optional[SourceCollector] = None,
+                 ai_analyzer: Optional[AIAnalyzer] = None,
+                 min_vote_delta: int = 1, state_file: Optional[str] = None):
+        self.collector = collector or SourceCollector()
+        self.ai_analyzer = ai_analyzer or AIAnalyzer()
+        self.min_vote_delta = max(1, min_vote_delta)
+        self.state_file = state_file or os.path.join(config.cache.dir, "poll_state.json")
+
+        self._lock = threading.Lock()
+        # key -> {"ranking", "votes", "last_seen", "source"}
+        self.seen: Dict[str, Dict[str, Any]] = {}
+        # key -> 通过AI筛选的产品
+        self.analyzed: Dict[str, ProductInfo] = {}
+        # 最近一次轮询出现的产品键
+        self.current_keys: List[str] = []
+        self._load_state()
+
+    def _load_state(self):
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.seen = state.get('seen', {})
+            self.analyzed = {key: ProductInfo.from_dict(data) for key, data in state.get('analyzed', {}).items()}
+            self.current_keys = state.get('current_keys', [])
+            logger.info(f"已加载轮询状态: {len(self.seen)} 个产品，{len(self.analyzed)} 个AI相关产品")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"读取轮询状态失败，从空状态开始: {e}")
+
+    def _save_state(self):
+        state = {
+            'seen': self.seen,
+            'analyzed': {key: product.to_dict() for key, product in self.analyzed.items()},
+            'current_keys': self.current_keys
+        }
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            with open(f"{self.state_file}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(f"{self.state_file}.tmp", self.state_file)
+        except OSError as e:
+            logger.warning(f"保存轮询状态失败: {e}")
+
+    def diff(self, products: List[ProductInfo]) -> List[ProductChange]:
+        """与上一次快照比对，返回新上线、排名变化和票数变化的记录"""
+        changes = []
+        for product in products:
+            previous = self.seen.get(product_key(product))
+            if previous is None:
+                changes.append(ProductChange('new', product))
+            elif product.ranking != previous['ranking']:
+                changes.append(ProductChange('rank', product, previous['ranking'], previous['votes']))
+            elif abs(product.votes - previous['votes']) >= self.min_vote_delta:
+                changes.append(ProductChange('votes', product, previous['ranking'], previous['votes']))
+        return changes
+
+    def poll(self) -> List[ProductChange]:
+        """
+        执行一次轮询
+
+        Returns:
+            本次轮询的变化记录
+        """
+        with self._lock:
+            start = time.perf_counter()
+            products = self.collector.collect()
+            # 抓取失败的信息源返回的是后备（模拟）数据，不能当作新上线产品分析，
+            # 这些信息源在快照中的记录保持不变
+            failed_sources = set(self.collector.fallback_sources)
+            if failed_sources:
+                logger.warning(f"信息源 {', '.join(sorted(failed_sources))} 抓取失败，本次轮询跳过，保留其上一次快照")
+                products = [product for product in products if product.source not in failed_sources]
+            products = self.ai_analyzer.remove_duplicates(products)
+            if not products:
+                # 抓取失败时保留上一次快照，避免下次把所有产品当成新产品
+                logger.warning("本次轮询未获取到产品，保留上一次快照")
+                return []
+
+            changes = self.diff(products)
+            new_products = [change.product for change in changes if change.kind == 'new']
+
+            # 只有新产品进入AI分析
+            if new_products:
+                for product in self.ai_analyzer.analyze_products(new_products):
+                    self.analyzed[product_key(product)] = product
+
+            # 已分析产品同步最新排名与票数
+            now = time.time()
+            for product in products:
+                key = product_key(product)
+                self.seen[key] = {'ranking': product.ranking, 'votes': product.votes, 'last_seen': now,
+                                  'source': product.source}
+                if key in self.analyzed:
+                    self.analyzed[key].ranking = product.ranking
+                    self.analyzed[key].votes = product.votes
+            current_keys = [product_key(product) for product in products]
+            # 抓取失败的信息源沿用上一次在榜的产品
+            current_keys += [key for key in self.current_keys if key not in current_keys
+                             and self._source_of(key) in failed_sources]
+            self.current_keys = current_keys
+
+            expired = [key for key, entry in self.seen.items() if now - entry['last_seen'] > STATE_RETENTION_SECONDS]
+            for key in expired:
+                self.seen.pop(key, None)
+                self.analyzed.pop(key, None)
+
+            self._save_state()
+
+            counts = {kind: sum(1 for change in changes if change.kind == kind) for kind in ('new', 'rank', 'votes')}
+            logger.info(f"增量轮询完成: {len(products)} 个产品，新上线 {counts['new']}，排名变化 {counts['rank']}，"
+                        f"票数变化 {counts['votes']}，AI分析 {len(new_products)} 个，"
+                        f"耗时 {time.perf_counter() - start:.1f}s")
+            for change in changes:
+                if change.kind == 'rank':
+                    logger.info(f"排名变化: {change.product.name} {change.previous_rank} -> {change.product.ranking}")
+                elif change.kind == 'new':
+                    logger.info(f"新上线: {change.product.name} (排名: {change.product.ranking})")
+            return changes
+
+    def _source_of(self, key: str) -> Optional[str]:
+        """快照中产品所属的信息源（旧版本状态未记录信息源时取分析结果中的信息源）"""
+        source = self.seen.get(key, {}).get('source')
+        if source is None and key in self.analyzed:
+            source = self.analyzed[key].source
+        return source
+
+    def current_products(self) -> List[ProductInfo]:
+        """最近一次轮询中仍在榜的AI相关产品，按排名排序"""
+        products = [self.analyzed[key] for key in self.current_keys if key in self.analyzed]
+        return sorted(products, key=lambda product: product.ranking)
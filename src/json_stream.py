@@ -0,0 +1,99 @@
+"""
+增量 JSON 解析
+大模型以流式输出 {"products": [{...}, {...}]} 时，每当数组中的一个对象闭合就立即解析返回，
+不必等待完整响应；响应被截断时也能取回所有已完整输出的对象
+"""
+
+import json
+import logging
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalArrayParser:
+    """
+    从流式文本中逐个提取顶层对象中指定数组（默认 products）的元素对象
+
+    只做括号与字符串状态的扫描，元素闭合后才对其片段调用 json.loads，
+    因此前后的 markdown 代码块标记或说明文字不影响解析
+    """
+
+    def __init__(self, array_key: str = "products"):
+        self.array_key = array_key
+        self.buffer = ""
+        self.items: List[Dict[str, Any]] = []
+
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        # 目标数组所在的栈深度，以及当前元素对象的起始位置
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """追加一段文本，返回其中新闭合的数组元素"""
+        self.buffer += text
+        completed = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._item_start is None:
+                        self._last_string = buffer[self._string_start + 1:i]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ':':
+                self._pending_key = self._last_string
+            elif char in '{[':
+                if (char == '[' and self._array_depth is None and self._stack == ['{']
+                        and self._pending_key == self.array_key):
+                    self._array_depth = len(self._stack) + 1
+                elif char == '{' and self._array_depth is not None and len(self._stack) == self._array_depth:
+                    self._item_start = i
+                self._stack.append(char)
+                self._pending_key = None
+            elif char in '}]':
+                if self._stack:
+                    self._stack.pop()
+                if (char == '}' and self._item_start is not None
+                        and self._array_depth is not None and len(self._stack) == self._array_depth):
+                    item = self._load_item(buffer[self._item_start:i + 1])
+                    if item is not None:
+                        self.items.append(item)
+                        completed.append(item)
+                    self._item_start = None
+                elif char == ']' and self._array_depth is not None and len(self._stack) < self._array_depth:
+                    self._array_depth = None
+            elif char == ',':
+                self._pending_key = None
+
+        self._pos = len(buffer)
+        return completed
+
+    @staticmethod
+    def _load_item(fragment: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(fragment)
+        except json.JSONDecodeError as e:
+            logger.warning(f"流式结果中的对象解析失败，已跳过: {e}")
+            return None
+        return item if isinstance(item, dict) else None
+
+    @property
+    def complete(self) -> bool:
+        """顶层对象是否已闭合（用于判断响应是否被截断）"""
+        return self._pos > 0 and not self._stack and '{' in self.buffer
@@ -0,0 +1,102 @@
+"""
+关键词预筛选
+将配置中的 AI 关键词与排除关键词预编译为带词边界的正则，在调用大模型前快速剔除明显无关的产品
+"""
+
+import re
+import logging
+from typing import List, Iterable, Tuple, Pattern
+
+from .models import ProductInfo
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# 英文关键词两侧不能紧挨字母或数字（"ai" 不会命中 "said"），中文关键词直接子串匹配
+_WORD_CHAR = r'0-9a-z'
+
+
+def _keyword_pattern(keyword: str) -> str:
+    """
+    生成单个关键词的正则（关键词已转小写）
+
+    词边界的后顾断言放在字面量之后，使正则以字面量开头，
+    sre 可以直接按字面量快速定位，而不是在每个位置先做断言
+    """
+    escaped = re.escape(keyword)
+    prefix = f'(?<![{_WORD_CHAR}]{escaped})' if re.match(f'[{_WORD_CHAR}]', keyword) else ''
+    suffix = f'(?![{_WORD_CHAR}])' if re.search(f'[{_WORD_CHAR}]$', keyword) else ''
+    return f'{escaped}{prefix}{suffix}'
+
+
+def _compile(keywords: Iterable[str]) -> List[Tuple[str, Pattern]]:
+    # 长关键词优先，find_keywords 时优先返回完整短语
+    unique = sorted({k.strip().lower() for k in keywords if k and k.strip()}, key=len, reverse=True)
+    return [(keyword, re.compile(_keyword_pattern(keyword))) for keyword in unique]
+
+
+def _search(compiled: List[Tuple[str, Pattern]], lowered: str) -> bool:
+    # 先用 C 实现的子串查找排除绝大多数关键词，只对候选关键词做词边界校验
+    return any(keyword in lowered and pattern.search(lowered) for keyword, pattern in compiled)
+
+
+class KeywordMatcher:
+    """编译后的多关键词匹配器"""
+
+    def __init__(self, keywords: Iterable[str], exclude_keywords: Iterable[str] = ()):
+        self.keywords = list(keywords)
+        self.exclude_keywords = list(exclude_keywords)
+        self._include = _compile(self.keywords)
+        self._exclude = _compile(self.exclude_keywords)
+        self._include_all = re.compile('|'.join(p.pattern for _, p in self._include)) if self._include else None
+
+    @staticmethod
+    def product_text(product: ProductInfo) -> str:
+        """拼接参与匹配的产品文本"""
+        return " ".join(filter(None, [
+            product.name,
+            product.tagline,
+            product.description,
+            " ".join(product.tags or []),
+            product.maker_comment
+        ]))
+
+    def find_keywords(self, text: str) -> List[str]:
+        """返回文本中命中的 AI 关键词"""
+        if not self._include_all or not text:
+            return []
+        return [m.group(0) for m in self._include_all.finditer(text.lower())]
+
+    def is_excluded(self, text: str) -> bool:
+        return bool(self._exclude and text and _search(self._exclude, text.lower()))
+
+    def matches(self, text: str) -> bool:
+        """命中任一 AI 关键词且未命中排除关键词"""
+        if not text:
+            return False
+        lowered = text.lower()
+        if self._exclude and _search(self._exclude, lowered):
+            return False
+        # 未配置关键词时不做筛选
+        if not self._include:
+            return True
+        return _search(self._include, lowered)
+
+    def is_ai_related(self, product: ProductInfo) -> bool:
+        return self.matches(self.product_text(product))
+
+    def split_products(self, products: List[ProductInfo]) -> Tuple[List[ProductInfo], List[ProductInfo]]:
+        """
+        将产品分为候选与剔除两组
+
+        Returns:
+            (需要进一步分析的产品, 被预筛选剔除的产品)
+        """
+        kept, dropped = [], []
+        for product in products:
+            (kept if self.is_ai_related(product) else dropped).append(product)
+        return kept, dropped
+
+
+# 全局关键词匹配器实例
+keyword_matcher = KeywordMatcher(config.filtering.ai_keywords, config.filtering.exclude_keywords)
@@ -0,0 +1,134 @@
+"""
+大模型响应缓存
+以 (provider, 模型/端点, messages, temperature, max_tokens) 的哈希为键，将响应持久化到 SQLite，
+支持过期时间（TTL）与按最近访问时间淘汰（LRU）的容量上限
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """基于 SQLite 的大模型响应缓存，多线程共享一个连接"""
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+        """生成缓存键，messages 按规范化 JSON 参与哈希"""
+        payload = json.dumps(
+            [provider, model, messages, temperature, max_tokens],
+            ensure_ascii=False, sort_keys=True, separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """读取未过期的缓存响应，命中时刷新最近访问时间"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str):
+        """写入响应，超出容量时淘汰最久未访问的记录"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                overflow = count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中统计"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+    def log_stats(self):
+        """将缓存命中情况写入运行日志"""
+        stats = self.get_stats()
+        if not stats["hits"] and not stats["misses"]:
+            return
+        logger.info(
+            f"大模型响应缓存统计: 命中 {stats['hits']} 次, 未命中 {stats['misses']} 次 "
+            f"({stats['hit_ratio']:.0%}), 淘汰 {stats['evictions']} 条, 现有 {stats['entries']} 条"
+        )
+
+
+def _create_llm_cache() -> Optional[LLMResponseCache]:
+    """根据配置创建全局响应缓存，未启用或不可用时返回 None"""
+    if not config.cache.llm_enabled:
+        return None
+    try:
+        return LLMResponseCache(
+            os.path.join(config.cache.dir, "llm_cache.sqlite3"),
+            ttl_seconds=config.cache.llm_ttl_hours * 3600,
+            max_entries=config.cache.llm_max_entries
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"大模型响应缓存不可用，已禁用: {e}")
+        return None
+
+
+# 全局响应缓存实例
+llm_cache = _create_llm_cache()
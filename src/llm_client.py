@@ -0,0 +1,206 @@
+"""
+大模型 HTTP 客户端
+复用连接池（keep-alive）发送 chat/completions 请求，对限流、服务端错误和超时分类重试，
+采用带抖动的指数退避并遵循 Retry-After，同时统计每次调用的延迟与重试次数。
+AsyncLLMClient 基于 aiohttp，供事件循环内并发调用
+"""
+
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+import aiohttp
+
+from .rate_limiter import rate_limiter
+from .stats import percentile
+
+logger = logging.getLogger(__name__)
+
+# 可重试的HTTP状态码
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class BaseLLMClient:
+    """重试策略与调用统计"""
+
+    def __init__(self, api_url: str, api_key: str, max_retries: int = 3, backoff_base: float = 1.0,
+                 backoff_max: float = 30.0):
+        self.api_url = api_url
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.retry_reasons: Counter = Counter()
+        self.latencies: List[float] = []
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """指数退避 + 全抖动；服务端给出 Retry-After 时至少等待该时长"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    @staticmethod
+    def _retry_after(headers) -> Optional[float]:
+        """解析 Retry-After（秒数或HTTP日期）"""
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _retry_delay(self, attempt: int, reason: str, retry_after: Optional[float]) -> float:
+        delay = self._backoff(attempt, retry_after)
+        with self._lock:
+            self.retry_reasons[reason] += 1
+        logger.warning(f"大模型请求失败（{reason}），{delay:.1f}s 后进行第 {attempt + 1} 次重试")
+        return delay
+
+    def _record(self, latency: float, retries: int, failed: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            self.latencies.append(latency)
+            if failed:
+                self.failures += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取调用延迟分位数与重试统计"""
+        with self._lock:
+            latencies = list(self.latencies)
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "retry_reasons": dict(self.retry_reasons),
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "max": max(latencies) if latencies else 0.0
+            }
+
+    def log_stats(self):
+        """将调用统计写入运行日志"""
+        stats = self.get_stats()
+        if not stats["calls"]:
+            return
+        reasons = ", ".join(f"{reason}×{count}" for reason, count in stats["retry_reasons"].items()) or "无"
+        logger.info(
+            f"大模型调用统计: 调用 {stats['calls']} 次, 失败 {stats['failures']} 次, 重试 {stats['retries']} 次 "
+            f"({reasons}), 延迟 p50={stats['p50']:.2f}s p90={stats['p90']:.2f}s max={stats['max']:.2f}s"
+        )
+
+
+class AsyncLLMClient(BaseLLMClient):
+    """
+    基于 aiohttp 的大模型客户端
+
+    每个事件循环使用各自的连接池，同步包装在不同线程中各自运行事件循环时互不影响；
+    事件循环结束前应调用 close() 关闭该循环的连接池
+    """
+
+    def __init__(self, api_url: str, api_key: str, pool_size: int = 10, max_retries: int = 3,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0, timeout: float = 60,
+                 connect_timeout: float = 10):
+        super().__init__(api_url, api_key, max_retries, backoff_base, backoff_max)
+        self.pool_size = pool_size
+        # sock_read 作用于相邻两次读取之间，流式响应不受总时长限制
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=connect_timeout, sock_read=timeout)
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+    def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                session = aiohttp.ClientSession(
+                    headers=self.headers, timeout=self.timeout,
+                    connector=aiohttp.TCPConnector(limit=self.pool_size)
+                )
+                self._sessions[loop] = session
+            return session
+
+    async def close(self):
+        """关闭当前事件循环的连接池"""
+        with self._lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    async def post(self, payload: Dict[str, Any]) -> aiohttp.ClientResponse:
+        """
+        发送请求，可重试的错误按退避策略重试
+
+        只在收到响应头之前重试；调用方负责读取并释放响应（async with response）
+
+        Returns:
+            状态码为2xx的响应，额外带有 attempts 与 latency 属性；重试次数用尽时抛出的异常带有 attempts 属性
+
+        Raises:
+            aiohttp.ClientError: 不可重试的错误或重试次数用尽
+            asyncio.TimeoutError: 超时且重试次数用尽
+        """
+        session = self._session()
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            await rate_limiter.acquire_async(self.api_url)
+            reason = None
+            retry_after = None
+            try:
+                response = await session.post(self.api_url, json=payload)
+                if response.status in RETRYABLE_STATUS:
+                    reason = str(response.status)
+                    retry_after = self._retry_after(response.headers)
+                    error = aiohttp.ClientResponseError(
+                        response.request_info, response.history, status=response.status,
+                        message=response.reason or "", headers=response.headers)
+                    response.release()
+                elif response.status >= 400:
+                    response.release()
+                    response.raise_for_status()
+            except asyncio.TimeoutError as e:
+                reason, error = "timeout", e
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+                reason, error = "connection", e
+            except aiohttp.ClientError:
+                # 其余4xx等不可重试的错误
+                self._record(time.perf_counter() - start, attempt, failed=True)
+                raise
+
+            if reason is None:
+                latency = time.perf_counter() - start
+                self._record(latency, attempt)
+                response.attempts = attempt + 1
+                response.latency = latency
+                return response
+
+            if attempt >= self.max_retries:
+                self._record(time.perf_counter() - start, attempt, failed=True)
+                error.attempts = attempt + 1
+                raise error
+
+            await asyncio.sleep(self._retry_delay(attempt, reason, retry_after))
+            attempt += 1
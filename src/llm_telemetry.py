@@ -0,0 +1,149 @@
+"""
+大模型调用遥测
+记录每次调用的调用点（批量分析、相关性评分、翻译、每日总结等）、提示词与输出token、
+耗时、重试次数、是否命中缓存以及响应解析结果，按调用点汇总后写入运行日志和日报JSON，
+用于观察产品数量增长时哪类提示词占用了主要的成本与延迟
+"""
+
+import logging
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+from .stats import percentile
+
+logger = logging.getLogger(__name__)
+
+# 调用结果：ok 正常返回；empty 返回空内容；truncated 输出被截断；error 请求失败
+OUTCOMES = ("ok", "empty", "truncated", "error")
+# 解析结果：ok 完整解析；partial 只解析出部分产品；failed 无法解析
+PARSE_OUTCOMES = ("ok", "partial", "failed")
+
+
+@dataclass
+class LLMCall:
+    """单次大模型调用记录"""
+    call_site: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated: bool = False  # 响应未带 usage 时按文本估算token
+    latency: float = 0.0
+    retries: int = 0
+    cache_hit: bool = False
+    outcome: str = "ok"
+    parse: Optional[str] = None  # 纯文本结果（翻译、总结）不解析，保持为 None
+
+
+# 当前任务中最近一次调用，供调用方在解析响应后补记解析结果
+_current_call: ContextVar[Optional[LLMCall]] = ContextVar("llm_current_call", default=None)
+
+
+def mark_parse(outcome: str):
+    """
+    为当前任务中最近一次大模型调用记录解析结果
+
+    asyncio 任务各自持有上下文，并发的调用之间互不影响；请求失败或返回空内容的调用不记录解析结果
+    """
+    call = _current_call.get()
+    if call is not None and call.outcome in ("ok", "truncated"):
+        call.parse = outcome
+
+
+class LLMTelemetry:
+    """一次运行内的大模型调用记录，多个并发任务共享"""
+
+    def __init__(self, prompt_price: float = 0.0, completion_price: float = 0.0):
+        # 每百万token的价格（元），均为 0 时不计算费用
+        self.prompt_price = prompt_price
+        self.completion_price = completion_price
+        self._lock = threading.Lock()
+        self.calls: List[LLMCall] = []
+
+    def start(self, call_site: str) -> LLMCall:
+        """开始一次调用记录，并设为当前任务的最近一次调用"""
+        call = LLMCall(call_site)
+        _current_call.set(call)
+        return call
+
+    def record(self, call: LLMCall):
+        """调用结束后保存记录；解析结果可在之后通过 mark_parse 补记"""
+        with self._lock:
+            self.calls.append(call)
+        logger.debug(
+            f"大模型调用 [{call.call_site}] {call.outcome}{'（缓存）' if call.cache_hit else ''}: "
+            f"提示词 {call.prompt_tokens} / 输出 {call.completion_tokens} tokens"
+            f"{'（估算）' if call.estimated else ''}, 耗时 {call.latency:.2f}s, 重试 {call.retries} 次"
+        )
+
+    def reset(self):
+        """清空记录，开始新一轮统计"""
+        with self._lock:
+            self.calls = []
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.prompt_price + completion_tokens * self.completion_price) / 1_000_000
+
+    @staticmethod
+    def _aggregate(calls: List[LLMCall]) -> Dict[str, Any]:
+        latencies = [call.latency for call in calls if not call.cache_hit]
+        return {
+            "calls": len(calls),
+            "cache_hits": sum(call.cache_hit for call in calls),
+            "prompt_tokens": sum(call.prompt_tokens for call in calls),
+            "completion_tokens": sum(call.completion_tokens for call in calls),
+            "estimated_calls": sum(call.estimated for call in calls),
+            "retries": sum(call.retries for call in calls),
+            "latency_total": round(sum(latencies), 3),
+            "latency_p50": round(percentile(latencies, 50), 3),
+            "latency_p90": round(percentile(latencies, 90), 3),
+            "latency_max": round(max(latencies), 3) if latencies else 0.0,
+            "outcomes": {outcome: count for outcome in OUTCOMES
+                         if (count := sum(call.outcome == outcome for call in calls))},
+            "parse": {outcome: count for outcome in PARSE_OUTCOMES
+                      if (count := sum(call.parse == outcome for call in calls))}
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """按调用点汇总，调用点按耗时从高到低排列"""
+        with self._lock:
+            calls = list(self.calls)
+        sites: Dict[str, List[LLMCall]] = {}
+        for call in calls:
+            sites.setdefault(call.call_site, []).append(call)
+
+        by_site = {}
+        for site, site_calls in sorted(sites.items(), key=lambda item: -sum(c.latency for c in item[1])):
+            stats = self._aggregate(site_calls)
+            stats["cost"] = round(self.cost(stats["prompt_tokens"], stats["completion_tokens"]), 6)
+            by_site[site] = stats
+
+        total = self._aggregate(calls)
+        total["cost"] = round(self.cost(total["prompt_tokens"], total["completion_tokens"]), 6)
+        return {"total": total, "call_sites": by_site}
+
+    def log_summary(self):
+        """将各调用点的汇总写入运行日志"""
+        summary = self.summary()
+        total = summary["total"]
+        if not total["calls"]:
+            return
+        priced = self.prompt_price or self.completion_price
+        logger.info(
+            f"大模型调用遥测: {total['calls']} 次（缓存命中 {total['cache_hits']}），"
+            f"提示词 {total['prompt_tokens']} / 输出 {total['completion_tokens']} tokens，"
+            f"累计耗时 {total['latency_total']:.1f}s" + (f"，费用约 {total['cost']:.4f} 元" if priced else "")
+        )
+        for site, stats in summary["call_sites"].items():
+            problems = {**{k: v for k, v in stats["outcomes"].items() if k != "ok"},
+                        **{f"解析{k}": v for k, v in stats["parse"].items() if k != "ok"}}
+            logger.info(
+                f"  [{site}] {stats['calls']} 次（缓存 {stats['cache_hits']}）, "
+                f"提示词 {stats['prompt_tokens']} / 输出 {stats['completion_tokens']} tokens"
+                f"{'（含估算 %d 次）' % stats['estimated_calls'] if stats['estimated_calls'] else ''}, "
+                f"耗时 p50={stats['latency_p50']:.2f}s p90={stats['latency_p90']:.2f}s "
+                f"累计 {stats['latency_total']:.1f}s, 重试 {stats['retries']} 次"
+                + (f", 异常 {', '.join(f'{k}×{v}' for k, v in problems.items())}" if problems else "")
+                + (f", 费用约 {stats['cost']:.4f} 元" if priced else "")
+            )
+
@@ -10,10 +10,13 @@ import pytz
 
 from .config import config
 from .models import ProductInfo, DailyReport
-from .scrapers.product_hunt import ProductHuntScraper
+from .scrapers.collector import SourceCollector
 from .ai_analyzer import AIAnalyzer
 from .report_generator import ReportGenerator
 from .feishu_sender import FeishuSender
+from .rate_limiter import rate_limiter
+from .llm_cache import llm_cache
+from .incremental import IncrementalPoller, ProductChange
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +24,7 @@ class RainbowOneService:
     """彩虹一号主服务"""
     
     def __init__(self):
-        self.scraper = ProductHuntScraper()
+        self.collector = SourceCollector()
         self.ai_analyzer = AIAnalyzer()
         self.report_generator = ReportGenerator()
         
@@ -35,14 +38,21 @@ class RainbowOneService:
         # 缓存最新的产品数据和报告
         self.latest_products: List[ProductInfo] = []
         self.latest_report: Optional[DailyReport] = None
+        # 与 latest_products 对应的每日总结，产品列表变化后置空
+        self.latest_summary: Optional[str] = None
+        
+        # 日内增量轮询器（首次轮询时创建）
+        self.poller: Optional[IncrementalPoller] = None
         
     def collect_and_analyze_data(self) -> bool:
         """收集并分析数据"""
         try:
-            logger.info("开始收集Product Hunt数据")
+            logger.info(f"开始收集数据，信息源: {', '.join(self.collector.scrapers)}")
+            # 新一轮日报，重新统计大模型调用
+            self.ai_analyzer.telemetry.reset()
             
-            # 1. 抓取Product Hunt数据
-            raw_products = self.scraper.get_daily_products()
+            # 1. 并发抓取各信息源数据
+            raw_products = self.collector.collect()
             
             if not raw_products:
                 logger.warning("未获取到任何产品数据")
@@ -54,9 +64,9 @@ class RainbowOneService:
             unique_products = self.ai_analyzer.remove_duplicates(raw_products)
             logger.info(f"去重后剩余 {len(unique_products)} 个产品")
             
-            # 3. AI分析和筛选
+            # 3. AI分析和筛选，每日总结随分析一并生成（见 ai.summary_mode）
             logger.info("开始AI分析和筛选")
-            ai_products = self.ai_analyzer.analyze_products(unique_products)
+            ai_products, summary = self.ai_analyzer.analyze_products_with_summary(unique_products)
             
             if not ai_products:
                 logger.info("今日无AI相关产品")
@@ -66,6 +76,11 @@ class RainbowOneService:
             
             # 4. 缓存结果
             self.latest_products = ai_products
+            self.latest_summary = summary
+            rate_limiter.log_stats()
+            self.ai_analyzer.log_stats()
+            if llm_cache:
+                llm_cache.log_stats()
             
             return True
             
@@ -73,6 +88,20 @@ class RainbowOneService:
             logger.error(f"数据收集和分析失败: {e}")
             return False
     
+    def poll_updates(self) -> List[ProductChange]:
+        """增量轮询一次，只分析新上线的产品，并用在榜的AI相关产品更新缓存"""
+        if self.poller is None:
+            self.poller = IncrementalPoller(self.collector, self.ai_analyzer, config.schedule.poll_min_vote_delta)
+        
+        changes = self.poller.poll()
+        self.latest_products = self.poller.current_products()
+        self.latest_summary = None
+        rate_limiter.log_stats()
+        self.ai_analyzer.log_stats()
+        if llm_cache:
+            llm_cache.log_stats()
+        return changes
+    
     def generate_and_send_report(self) -> bool:
         """生成并发送日报"""
         try:
@@ -83,16 +112,23 @@ class RainbowOneService:
                     logger.error("数据收集失败，无法生成报告")
                     return False
             
-            # 生成AI趋势分析总结
-            logger.info("生成AI趋势分析")
-            analysis_summary = self.ai_analyzer.generate_daily_summary(self.latest_products)
+            # 生成AI趋势分析总结（采集分析时已一并生成的直接使用）
+            analysis_summary = self.latest_summary
+            if analysis_summary is None:
+                logger.info("生成AI趋势分析")
+                analysis_summary = self.ai_analyzer.generate_daily_summary(self.latest_products)
+                if llm_cache:
+                    llm_cache.log_stats()
+            self.ai_analyzer.telemetry.log_summary()
             
-            # 生成日报
+            # 生成日报（附带自上一份日报以来的大模型调用汇总，增量轮询的调用也计入）
             logger.info("生成每日报告")
             report = self.report_generator.generate_daily_report(
                 self.latest_products, 
-                analysis_summary
+                analysis_summary,
+                llm_usage=self.ai_analyzer.telemetry.summary()
             )
+            self.ai_analyzer.telemetry.reset()
             
             # 保存报告到文件
             try:
@@ -158,6 +194,10 @@ class RainbowOneService:
         """发送错误通知"""
         return self.feishu_sender.send_error_notification(error_message)
     
+    def close(self):
+        """关闭AI分析器的连接池与事件循环"""
+        self.ai_analyzer.close()
+    
     def get_status(self) -> dict:
         """获取系统状态"""
         return {
@@ -178,28 +218,35 @@ class RainbowOneService:
             if target_date:
                 logger.info(f"指定日期: {target_date}")
                 # 获取指定日期的数据
-                raw_products = self.scraper.get_daily_products(target_date)
+                raw_products = self.collector.collect(target_date)
             else:
                 # 获取今日数据
-                raw_products = self.scraper.get_daily_products()
+                raw_products = self.collector.collect()
             
             if not raw_products:
                 logger.warning("未获取到产品数据")
                 return False
             
             # 进行AI分析
+            self.ai_analyzer.telemetry.reset()
             unique_products = self.ai_analyzer.remove_duplicates(raw_products)
-            ai_products = self.ai_analyzer.analyze_products(unique_products)
+            ai_products, analysis_summary = self.ai_analyzer.analyze_products_with_summary(unique_products)
             
             # 生成报告
-            analysis_summary = self.ai_analyzer.generate_daily_summary(ai_products)
-            report = self.report_generator.generate_daily_report(ai_products, analysis_summary)
+            report = self.report_generator.generate_daily_report(
+                ai_products, analysis_summary, llm_usage=self.ai_analyzer.telemetry.summary())
+            
+            rate_limiter.log_stats()
+            self.ai_analyzer.log_stats()
+            if llm_cache:
+                llm_cache.log_stats()
             
             # 发送报告
             success = self.feishu_sender.send_daily_report(report)
             
             if success:
                 self.latest_products = ai_products
+                self.latest_summary = analysis_summary
                 self.latest_report = report
                 logger.info("手动任务执行成功")
                 return True
@@ -3,7 +3,7 @@
 定义产品信息和日报的数据结构
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import json
@@ -25,6 +25,7 @@ class ProductInfo:
     screenshot_url: Optional[str] = None  # 截图链接
     logo_url: Optional[str] = None  # Logo链接
     created_at: Optional[datetime] = None  # 创建时间
+    source: str = "product_hunt"  # 信息源名称
     
     # AI分析结果
     ai_relevance_score: float = 0.0  # AI相关性评分
@@ -54,6 +55,7 @@ class ProductInfo:
             'screenshot_url': self.screenshot_url,
             'logo_url': self.logo_url,
             'created_at': self.created_at.isoformat() if self.created_at else None,
+            'source': self.source,
             'ai_relevance_score': self.ai_relevance_score,
             'application_scenarios': self.application_scenarios,
             'translated_description': self.translated_description
@@ -81,6 +83,7 @@ class ProductInfo:
             screenshot_url=data.get('screenshot_url'),
             logo_url=data.get('logo_url'),
             created_at=created_at,
+            source=data.get('source', 'product_hunt'),
             ai_relevance_score=data.get('ai_relevance_score', 0.0),
             application_scenarios=data.get('application_scenarios', []),
             translated_description=data.get('translated_description', '')
@@ -95,6 +98,7 @@ class DailyReport:
     ai_trend_analysis: str = ""  # AI趋势分析
     total_products_analyzed: int = 0  # 分析的产品总数
     ai_relevant_products: int = 0  # AI相关产品数量
+    llm_usage: Dict[str, Any] = field(default_factory=dict)  # 大模型调用遥测汇总（见 src/llm_telemetry.py）
     
     def __post_init__(self):
         self.ai_relevant_products = len(self.products)
@@ -107,7 +111,8 @@ class DailyReport:
             'summary': self.summary,
             'ai_trend_analysis': self.ai_trend_analysis,
             'total_products_analyzed': self.total_products_analyzed,
-            'ai_relevant_products': self.ai_relevant_products
+            'ai_relevant_products': self.ai_relevant_products,
+            'llm_usage': self.llm_usage
         }
     
     def to_json(self) -> str:
@@ -123,5 +128,6 @@ class DailyReport:
             summary=data['summary'],
             ai_trend_analysis=data.get('ai_trend_analysis', ''),
             total_products_analyzed=data.get('total_products_analyzed', 0),
-            ai_relevant_products=data.get('ai_relevant_products', 0)
+            ai_relevant_products=data.get('ai_relevant_products', 0),
+            llm_usage=data.get('llm_usage', {})
         ) 
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+提示词token预估与字段预算
+按字符类型粗略估算token数，超出预算的长字段（创始人评论等）做抽取式摘要：
+按句子切分，保留首句与词频得分最高的句子并维持原有顺序，单句仍超出时在词边界截断
+"""
+
+import re
+import math
+import logging
+from collections import Counter
+from typing import List
+
+from .translation_memory import split_segments
+
+logger = logging.getLogger(__name__)
+
+_CJK_PATTERN = re.compile(r'[㐀-䶿一-鿿豈-﫿　-〿＀-￯]')
+_WORD_PATTERN = re.compile(r'[A-Za-z0-9]+|[㐀-䶿一-鿿]')
+# 句子切分：英文句末标点后的空白、中文句末标点之后，或换行
+_SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+|(?<=[。！？；])|\n+')
+
+# 中文每个字符约0.6个token，其余字符约4个字符一个token
+TOKENS_PER_CJK_CHAR = 0.6
+CHARS_PER_TOKEN = 4
+
+# 不计入句子得分的常见英文虚词
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "to", "of", "in", "on", "for", "with", "is", "are", "was",
+    "were", "be", "it", "its", "this", "that", "we", "our", "you", "your", "i", "my", "me", "us",
+    "at", "as", "by", "from", "so", "all", "have", "has", "had", "will", "can", "just", "about"
+}
+
+ELLIPSIS = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算文本的token数"""
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    return math.ceil(cjk * TOKENS_PER_CJK_CHAR + (len(text) - cjk) / CHARS_PER_TOKEN)
+
+
+def _split_sentences(text: str) -> List[str]:
+    sentences = []
+    for segment in split_segments(text):
+        sentences.extend(part.strip() for part in _SENTENCE_PATTERN.split(segment) if part and part.strip())
+    return sentences
+
+
+def _cut(text: str, budget: int) -> str:
+    """在词边界把文本截断到预算内"""
+    if estimate_tokens(text) <= budget:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) + 1 <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    cut = text[:low]
+    # 英文尽量不在单词中间截断
+    if low < len(text) and text[low].isalnum() and ' ' in cut:
+        cut = cut[:cut.rfind(' ')]
+    return cut.rstrip(" ,;:，；：") + ELLIPSIS
+
+
+def summarize(text: str, budget: int) -> str:
+    """
+    把文本压缩到 budget 个token以内
+
+    未超出预算时原样返回；否则保留首句，再按句内重复出现的实词词频得分从高到低补充句子，
+    最终按原文顺序拼接
+    """
+    text = " ".join((text or "").split())
+    if budget <= 0 or estimate_tokens(text) <= budget:
+        return text
+
+    sentences = _split_sentences(text)
+    if len(sentences) <= 1:
+        return _cut(text, budget)
+
+    words = [[word.lower() for word in _WORD_PATTERN.findall(sentence) if word.lower() not in _STOPWORDS]
+             for sentence in sentences]
+    frequency = Counter(word for sentence_words in words for word in sentence_words)
+
+    # 只有在多个句子中出现的词才计分，按句长的平方根归一，避免只偏好短句
+    def score(index: int) -> float:
+        if not words[index]:
+            return 0.0
+        return sum(frequency[word] for word in words[index] if frequency[word] > 1) / math.sqrt(len(words[index]))
+
+    first = _cut(sentences[0], budget)
+    chosen = {0}
+    used = estimate_tokens(first) + 1
+    for index in sorted(range(1, len(sentences)), key=lambda i: (-score(i), i)):
+        tokens = estimate_tokens(sentences[index]) + 1
+        if used + tokens <= budget:
+            chosen.add(index)
+            used += tokens
+
+    summary = ""
+    for index in sorted(chosen):
+        sentence = first if index == 0 else sentences[index]
+        summary = _join(summary, sentence)
+    if len(chosen) < len(sentences) and not summary.endswith(ELLIPSIS):
+        summary = _join(summary, ELLIPSIS)
+    return summary
+
+
+def _join(left: str, right: str) -> str:
+    """拼接句子：中文句末标点之后不加空格"""
+    if not left:
+        return right
+    if _CJK_PATTERN.match(left[-1]) or _CJK_PATTERN.match(right[0]):
+        return left + right
+    return left + " " + right
@@ -0,0 +1,148 @@
+"""
+进程级限流器
+按主机维护令牌桶，抓取器与AI客户端在发出请求前统一从这里申请令牌
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    采用预约方式：申请时立即扣减令牌（允许为负），并返回需要等待的时间，
+    这样并发的申请者会按到达顺序依次排队，而不是同时醒来争抢
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        # 等待时间指标
+        self.acquisitions = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self, tokens: int = 1) -> float:
+        """预约令牌，返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= tokens
+
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.acquisitions += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_minute": self.rate * 60,
+                "burst": self.capacity,
+                "acquisitions": self.acquisitions,
+                "throttled": self.throttled,
+                "total_wait": self.total_wait,
+                "avg_wait": self.total_wait / self.acquisitions if self.acquisitions else 0.0,
+                "max_wait": self.max_wait
+            }
+
+
+class RateLimiter:
+    """按主机划分令牌桶的限流器，未配置的主机不限流"""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url_or_host: str) -> str:
+        if '://' in url_or_host:
+            return (urlparse(url_or_host).hostname or '').lower()
+        return url_or_host.lower()
+
+    def configure(self, url_or_host: str, rate_per_minute: float, burst: int = 1):
+        """为主机设置限流参数，rate_per_minute <= 0 表示不限流"""
+        host = self._host(url_or_host)
+        if not host:
+            return
+        with self._lock:
+            if rate_per_minute and rate_per_minute > 0:
+                self._buckets[host] = TokenBucket(rate_per_minute, burst)
+            else:
+                self._buckets.pop(host, None)
+
+    def _bucket(self, url_or_host: str) -> Optional[TokenBucket]:
+        with self._lock:
+            return self._buckets.get(self._host(url_or_host))
+
+    def acquire(self, url_or_host: str, tokens: int = 1) -> float:
+        """阻塞式申请令牌，返回实际等待的秒数"""
+        bucket = self._bucket(url_or_host)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(tokens)
+        if wait > 0:
+            logger.debug(f"限流等待 {wait:.2f}s: {self._host(url_or_host)}")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url_or_host: str, tokens: int = 1) -> float:
+        """异步申请令牌，等待期间不阻塞事件循环"""
+        bucket = self._bucket(url_or_host)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(tokens)
+        if wait > 0:
+            logger.debug(f"限流等待 {wait:.2f}s: {self._host(url_or_host)}")
+            await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各主机的等待时间指标"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: bucket.get_stats() for host, bucket in buckets.items()}
+
+    def log_stats(self):
+        """将限流等待情况写入运行日志"""
+        for host, stats in self.get_stats().items():
+            if not stats["acquisitions"]:
+                continue
+            logger.info(
+                f"限流统计 {host}: 请求 {stats['acquisitions']} 次, 被限流 {stats['throttled']} 次, "
+                f"累计等待 {stats['total_wait']:.2f}s, 平均 {stats['avg_wait']:.2f}s, 最长 {stats['max_wait']:.2f}s"
+            )
+
+
+def _create_rate_limiter() -> RateLimiter:
+    """根据配置创建全局限流器"""
+    limiter = RateLimiter()
+    for source in config.sources.values():
+        for url in (source.url, source.api_url):
+            if url:
+                limiter.configure(url, source.rate_limit, source.burst)
+    if config.ai.base_url:
+        limiter.configure(config.ai.base_url, config.ai.rate_limit, config.ai.burst)
+    return limiter
+
+
+# 全局限流器实例
+rate_limiter = _create_rate_limiter()
@@ -0,0 +1,294 @@
+"""
+本地AI相关性模型
+用历史日报 reports/*.json 中大模型给出的 ai_relevance_score 作为标签，
+在名称、标语和描述上训练 TF-IDF + 逻辑回归（纯 NumPy），
+分析时把模型有把握判为无关的产品挡在大模型之外，只有其余产品进入大模型分析
+"""
+
+import os
+import re
+import glob
+import json
+import logging
+from typing import List, Dict, Any, Tuple, Optional, Union
+
+import numpy as np
+
+from .config import config
+from .models import ProductInfo
+from .analysis_memo import AnalysisMemo
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+_CJK_PATTERN = re.compile(r'[一-鿿]+')
+
+# 最少训练样本数，样本过少时拒绝训练
+MIN_TRAINING_SAMPLES = 20
+
+
+def tokenize(text: str) -> List[str]:
+    """英文按单词切分，中文按单字与相邻双字切分"""
+    text = (text or "").lower()
+    tokens = _WORD_PATTERN.findall(text)
+    for run in _CJK_PATTERN.findall(text):
+        tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def product_text(product: Union[ProductInfo, Dict[str, Any]]) -> str:
+    """参与打分的产品文本：名称、标语与描述"""
+    if isinstance(product, dict):
+        fields = (product.get('name'), product.get('tagline'), product.get('description'))
+    else:
+        fields = (product.name, product.tagline, product.description)
+    return " ".join(field for field in fields if field)
+
+
+def load_training_data(reports_dir: str = "reports") -> Tuple[List[str], List[float]]:
+    """从历史日报JSON中读取 (产品文本, 大模型相关性评分)，同一产品只保留最新一次"""
+    samples: Dict[str, Tuple[str, float]] = {}
+    for path in sorted(glob.glob(os.path.join(reports_dir, "*.json"))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取日报失败 {path}: {e}")
+            continue
+        for product in report.get('products', []):
+            score = product.get('ai_relevance_score')
+            text = product_text(product)
+            if score is None or not text:
+                continue
+            key = product.get('original_url') or product.get('name', '').lower()
+            samples[key] = (text, float(score))
+    texts = [text for text, _ in samples.values()]
+    scores = [score for _, score in samples.values()]
+    return texts, scores
+
+
+class RelevanceModel:
+    """TF-IDF + 逻辑回归二分类器，输出产品为AI相关的概率"""
+
+    def __init__(self, max_features: int = 5000, l2: float = 1e-3):
+        self.max_features = max_features
+        self.l2 = l2
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.bias = 0.0
+        self.metadata: Dict[str, Any] = {}
+
+    def _build_vocabulary(self, documents: List[List[str]]):
+        document_frequency: Dict[str, int] = {}
+        for tokens in documents:
+            for token in set(tokens):
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+        ranked = sorted(document_frequency, key=lambda token: (-document_frequency[token], token))
+        self.vocabulary = {token: i for i, token in enumerate(ranked[:self.max_features])}
+        frequencies = np.array([document_frequency[token] for token in ranked[:self.max_features]], dtype=float)
+        self.idf = np.log((1 + len(documents)) / (1 + frequencies)) + 1.0
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """文本转为按行L2归一化的 TF-IDF 矩阵"""
+        matrix = np.zeros((len(texts), len(self.vocabulary)))
+        for row, text in enumerate(texts):
+            tokens = [self.vocabulary[token] for token in tokenize(text) if token in self.vocabulary]
+            if not tokens:
+                continue
+            np.add.at(matrix[row], tokens, 1.0)
+            matrix[row] *= self.idf / len(tokens)
+            norm = np.linalg.norm(matrix[row])
+            if norm:
+                matrix[row] /= norm
+        return matrix
+
+    def fit(self, texts: List[str], labels: List[int], epochs: int = 500, learning_rate: float = 1.0):
+        """按类别加权的批量梯度下降训练逻辑回归"""
+        self._build_vocabulary([tokenize(text) for text in texts])
+        features = self.transform(texts)
+        y = np.asarray(labels, dtype=float)
+
+        # 正负样本数量悬殊时按类别频率加权
+        positives = max(1.0, y.sum())
+        negatives = max(1.0, len(y) - y.sum())
+        sample_weights = np.where(y == 1, len(y) / (2 * positives), len(y) / (2 * negatives))
+
+        self.weights = np.zeros(features.shape[1])
+        self.bias = 0.0
+        for _ in range(epochs):
+            error = (self._sigmoid(features @ self.weights + self.bias) - y) * sample_weights
+            self.weights -= learning_rate * (features.T @ error / len(y) + self.l2 * self.weights)
+            self.bias -= learning_rate * error.mean()
+        return self
+
+    @staticmethod
+    def _sigmoid(values: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.exp(-np.clip(values, -30, 30)))
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """预测每段文本为AI相关的概率"""
+        if not texts:
+            return np.zeros(0)
+        return self._sigmoid(self.transform(texts) @ self.weights + self.bias)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "vocabulary": vocabulary,
+                "idf": self.idf.tolist(),
+                "weights": self.weights.tolist(),
+                "bias": self.bias,
+                "metadata": self.metadata
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> 'RelevanceModel':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        model = cls()
+        model.vocabulary = {token: i for i, token in enumerate(data["vocabulary"])}
+        model.idf = np.asarray(data["idf"], dtype=float)
+        model.weights = np.asarray(data["weights"], dtype=float)
+        model.bias = float(data["bias"])
+        model.metadata = data.get("metadata", {})
+        return model
+
+
+def evaluate(probabilities: np.ndarray, labels: np.ndarray, skip_below: float) -> Dict[str, Any]:
+    """
+    统计本地模型与大模型标签的一致性，以及被挡在大模型之外的产品比例
+
+    Returns:
+        agreement: 以0.5为界的判定与大模型标签一致的比例
+        skipped: 概率低于 skip_below、不再送入大模型的产品数
+        skipped_correct: 其中大模型也判为无关的产品数
+    """
+    predictions = probabilities >= 0.5
+    skipped = probabilities < skip_below
+    return {
+        "samples": int(len(labels)),
+        "agreement": float((predictions == (labels == 1)).mean()) if len(labels) else 0.0,
+        "skipped": int(skipped.sum()),
+        "skipped_correct": int((skipped & (labels == 0)).sum())
+    }
+
+
+def train_from_reports(reports_dir: str, model_path: str, threshold: float = 0.5,
+                       skip_below: float = 0.2, folds: int = 5) -> Dict[str, Any]:
+    """
+    用历史日报训练模型并保存
+
+    先做 k 折交叉验证统计与大模型的一致率和可节省的调用，再用全部样本训练最终模型
+
+    Returns:
+        训练报告
+    """
+    texts, scores = load_training_data(reports_dir)
+    labels = np.asarray([1 if score >= threshold else 0 for score in scores])
+    if len(texts) < MIN_TRAINING_SAMPLES or labels.min(initial=1) == labels.max(initial=0):
+        raise ValueError(f"训练样本不足：共 {len(texts)} 个产品（正例 {int(labels.sum())} 个），"
+                         f"至少需要 {MIN_TRAINING_SAMPLES} 个且同时包含相关与无关产品")
+
+    # k 折交叉验证：每个样本恰好被预测一次
+    order = np.random.default_rng(42).permutation(len(texts))
+    folds = max(2, min(folds, len(texts)))
+    held_out = np.zeros(len(texts))
+    for fold in range(folds):
+        test_index = order[fold::folds]
+        train_index = np.setdiff1d(order, test_index)
+        fold_model = RelevanceModel().fit([texts[i] for i in train_index], labels[train_index].tolist())
+        held_out[test_index] = fold_model.predict_proba([texts[i] for i in test_index])
+
+    report = evaluate(held_out, labels, skip_below)
+    report.update({
+        "positives": int(labels.sum()),
+        "negatives": int(len(labels) - labels.sum()),
+        "threshold": threshold,
+        "skip_below": skip_below,
+        "folds": folds
+    })
+
+    model = RelevanceModel().fit(texts, labels.tolist())
+    model.metadata = report
+    model.save(model_path)
+    return report
+
+
+class RelevanceScorer:
+    """分析前用本地模型挡掉有把握判为无关的产品，并统计与大模型评分的一致性"""
+
+    def __init__(self, model: RelevanceModel, threshold: float = 0.5, skip_below: float = 0.2):
+        self.model = model
+        self.threshold = threshold
+        self.skip_below = skip_below
+        # 候选产品的本地预测概率，按产品键（规范化的帖子链接）记录，同一产品再次出现时覆盖
+        self._probabilities: Dict[str, float] = {}
+
+        self.skipped = 0
+        self.compared = 0
+        self.agreed = 0
+
+    def split_products(self, products: List[ProductInfo]) -> Tuple[List[ProductInfo], List[ProductInfo]]:
+        """
+        将产品分为需要大模型分析与本地判定无关两组
+
+        Returns:
+            (候选产品, 跳过的产品)
+        """
+        probabilities = self.model.predict_proba([product_text(product) for product in products])
+        candidates, skipped = [], []
+        for product, probability in zip(products, probabilities):
+            if probability < self.skip_below:
+                # 跳过的产品不会得到大模型评分，无需记录
+                skipped.append(product)
+                continue
+            self._probabilities[AnalysisMemo.product_key(product)] = float(probability)
+            candidates.append(product)
+        self.skipped += len(skipped)
+        return candidates, skipped
+
+    def record(self, products: List[ProductInfo]):
+        """对比本地判定与大模型给出的相关性评分"""
+        for product in products:
+            probability = self._probabilities.pop(AnalysisMemo.product_key(product), None)
+            if probability is None or product.ai_relevance_score is None:
+                continue
+            self.compared += 1
+            if (probability >= 0.5) == (product.ai_relevance_score >= self.threshold):
+                self.agreed += 1
+
+    def log_stats(self):
+        """将跳过数量与一致率写入运行日志"""
+        if not self.skipped and not self.compared:
+            return
+        agreement = f"{self.agreed / self.compared:.1%}" if self.compared else "无"
+        logger.info(f"本地相关性模型: 跳过 {self.skipped} 个产品, "
+                    f"与大模型评分一致率 {agreement}（{self.agreed}/{self.compared}）")
+
+
+def default_model_path() -> str:
+    return config.filtering.relevance_model_path or os.path.join(config.cache.dir, "relevance_model.json")
+
+
+def _create_relevance_scorer() -> Optional[RelevanceScorer]:
+    """根据配置加载已训练的模型，未启用或尚未训练时返回 None"""
+    if not config.filtering.local_relevance:
+        return None
+    path = default_model_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        model = RelevanceModel.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"本地相关性模型加载失败，已禁用: {e}")
+        return None
+    logger.info(f"已加载本地相关性模型: {path}（{len(model.vocabulary)} 个特征）")
+    return RelevanceScorer(model, config.filtering.relevance_threshold, config.filtering.relevance_skip_below)
+
+
+# 全局相关性打分器
+relevance_scorer = _create_relevance_scorer()
@@ -4,7 +4,8 @@
 """
 
 import logging
-from typing import List
+import os
+from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 import pytz
 
@@ -19,16 +20,22 @@ class ReportGenerator:
     def __init__(self):
         self.timezone = pytz.timezone(config.app.timezone)
         
-    def generate_daily_report(self, products: List[ProductInfo], analysis_summary: str) -> DailyReport:
-        """生成每日日报"""
-        current_time = datetime.now(self.timezone)
+    def generate_daily_report(self, products: List[ProductInfo], analysis_summary: str,
+                              report_date: Optional[datetime] = None,
+                              llm_usage: Optional[Dict[str, Any]] = None) -> DailyReport:
+        """
+        生成每日日报，report_date 为空时使用当前时间（回填历史日报时指定日期）；
+        llm_usage 为本轮大模型调用遥测汇总，随日报JSON保存
+        """
+        current_time = report_date or datetime.now(self.timezone)
         
         report = DailyReport(
             date=current_time,
             products=products,
             summary=analysis_summary,
             total_products_analyzed=len(products),
-            ai_relevant_products=len(products)
+            ai_relevant_products=len(products),
+            llm_usage=llm_usage or {}
         )
         
         return report
@@ -184,6 +191,14 @@ class ReportGenerator:
             
         return content
     
+    @staticmethod
+    def get_report_path(date: datetime, format_type: str = "markdown") -> str:
+        """获取指定日期报告的保存路径"""
+        # 在 serverless 环境中使用 /tmp 目录，本地环境使用 reports 目录
+        is_serverless = os.environ.get('VERCEL') or os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
+        base_dir = "/tmp" if is_serverless else "reports"
+        return f"{base_dir}/ai_daily_report_{date.strftime('%Y%m%d')}.{format_type}"
+    
     def save_report(self, report: DailyReport, format_type: str = "markdown") -> str:
         """保存报告到文件"""
         date_str = report.date.strftime("%Y%m%d")
@@ -196,20 +211,8 @@ class ReportGenerator:
             raise ValueError(f"不支持的格式类型: {format_type}")
         
         try:
-            import os
-            
-            # 检查是否在 serverless 环境中
-            is_serverless = os.environ.get('VERCEL') or os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
-            
-            if is_serverless:
-                # 在 serverless 环境中，使用 /tmp 目录
-                base_dir = "/tmp"
-                filename = f"{base_dir}/ai_daily_report_{date_str}.{format_type}"
-            else:
-                # 在本地环境中，使用 reports 目录
-                base_dir = "reports"
-                os.makedirs(base_dir, exist_ok=True)
-                filename = f"{base_dir}/ai_daily_report_{date_str}.{format_type}"
+            filename = self.get_report_path(report.date, format_type)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
             
             with open(filename, 'w', encoding='utf-8') as f:
                 f.write(content)
@@ -218,7 +221,6 @@ class ReportGenerator:
             return filename
             
         except Exception as e:
-            import os
             # 检查是否在 serverless 环境中
             is_serverless = os.environ.get('VERCEL') or os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
             
@@ -36,10 +36,17 @@ class TaskScheduler:
         # 每小时系统健康检查（可选）
         schedule.every().hour.do(self._health_check)
         
+        # 日内增量轮询（可选）
+        poll_interval = config.schedule.poll_interval_minutes
+        if poll_interval > 0:
+            schedule.every(poll_interval).minutes.do(self._run_poll)
+        
         logger.info(f"定时任务已设置:")
         logger.info(f"- 数据收集时间: 每日 {data_collection_time}")
         logger.info(f"- 报告发送时间: 每日 {report_time}")
         logger.info(f"- 健康检查: 每小时执行")
+        if poll_interval > 0:
+            logger.info(f"- 增量轮询: 每 {poll_interval} 分钟执行")
     
     def _run_data_collection(self):
         """执行数据收集任务"""
@@ -60,6 +67,21 @@ class TaskScheduler:
             logger.error(f"数据收集任务异常: {e}")
             self.service.send_error_notification(f"数据收集任务异常: {str(e)}")
     
+    def _run_poll(self):
+        """执行一次日内增量轮询"""
+        try:
+            changes = self.service.poll_updates()
+            logger.info(f"增量轮询任务完成，变化 {len(changes)} 条")
+        except Exception as e:
+            logger.error(f"增量轮询任务异常: {e}")
+    
+    def start_polling(self, interval_minutes: int):
+        """只运行增量轮询：立即轮询一次，之后每隔 interval_minutes 分钟轮询"""
+        schedule.every(max(1, interval_minutes)).minutes.do(self._run_poll)
+        logger.info(f"增量轮询模式，间隔 {interval_minutes} 分钟")
+        self._run_poll()
+        self.start()
+    
     def _run_daily_report(self):
         """执行每日报告生成和发送任务"""
         try:
@@ -138,6 +160,7 @@ class TaskScheduler:
         logger.info("彩虹一号任务调度器停止")
         self.is_running = False
         schedule.clear()
+        self.service.close()
     
     def get_next_run_time(self) -> Optional[str]:
         """获取下次运行时间"""
@@ -0,0 +1,46 @@
+"""
+信息源抓取器基类与注册表
+新增信息源时继承 BaseScraper，并用 register_source 以 config.yaml 中 sources 下的名称注册
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+from datetime import datetime
+
+try:
+    from ..models import ProductInfo
+except ImportError:
+    # 兼容直接运行的情况
+    from models import ProductInfo
+
+# 信息源名称 -> 抓取器类
+SOURCE_REGISTRY: Dict[str, Type['BaseScraper']] = {}
+
+
+def register_source(name: str):
+    """注册信息源抓取器的类装饰器"""
+    def decorator(cls: Type['BaseScraper']) -> Type['BaseScraper']:
+        cls.source_name = name
+        SOURCE_REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+class BaseScraper(ABC):
+    """信息源抓取器接口"""
+
+    source_name: str = ""
+    # 最近一次 get_daily_products 是否因抓取失败返回了后备（模拟）数据
+    used_fallback: bool = False
+
+    @abstractmethod
+    def get_daily_products(self, date: Optional[datetime] = None) -> List[ProductInfo]:
+        """
+        获取指定日期的产品列表
+
+        Args:
+            date: 指定日期，默认为今天
+
+        Returns:
+            产品信息列表
+        """
@@ -0,0 +1,137 @@
+"""
+多信息源并发采集
+按 config.yaml 的 sources 配置创建已注册的抓取器并发执行，
+每个信息源有独立超时，单个信息源失败或超时不影响其他信息源
+"""
+
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+
+try:
+    from ..models import ProductInfo
+    from ..config import config
+    from .base import BaseScraper, SOURCE_REGISTRY
+    # 导入内置抓取器以完成注册
+    from . import product_hunt, hacker_news  # noqa: F401
+except ImportError:
+    # 兼容直接运行的情况
+    from models import ProductInfo
+    from config import config
+    from scrapers.base import BaseScraper, SOURCE_REGISTRY
+    from scrapers import product_hunt, hacker_news  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+class SourceCollector:
+    """多信息源并发采集器"""
+
+    def __init__(self, source_names: Optional[List[str]] = None):
+        """
+        Args:
+            source_names: 指定要启用的信息源，默认使用配置中 enabled 的信息源
+        """
+        self.scrapers: Dict[str, BaseScraper] = {}
+        names = source_names or [name for name, source in config.sources.items() if source.enabled]
+
+        for name in names:
+            scraper_cls = SOURCE_REGISTRY.get(name)
+            if scraper_cls is None:
+                logger.warning(f"未找到信息源 {name} 对应的抓取器，已跳过")
+                continue
+            try:
+                self.scrapers[name] = scraper_cls()
+            except Exception as e:
+                logger.error(f"初始化信息源 {name} 失败: {e}")
+
+        # 最近一次采集的各信息源状态
+        self.last_run: Dict[str, Dict[str, Any]] = {}
+        # 超时后仍在后台运行的采集任务：线程无法中断，结束前不再提交同一个抓取器，
+        # 避免两个线程共用其 HTTP 会话与 used_fallback 标记
+        self._running: Dict[str, Future] = {}
+
+    def get_scraper(self, name: str) -> Optional[BaseScraper]:
+        return self.scrapers.get(name)
+
+    def collect(self, date: Optional[datetime] = None) -> List[ProductInfo]:
+        """
+        并发采集所有信息源
+
+        总耗时取决于最慢的正常信息源；超时的信息源直接放弃等待，不阻塞其他结果，
+        其后台任务结束前的后续采集跳过该信息源（状态记为 busy）
+
+        Returns:
+            按配置顺序合并的产品列表
+        """
+        if not self.scrapers:
+            logger.warning("没有可用的信息源")
+            return []
+
+        self.last_run = {}
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(self.scrapers), thread_name_prefix="source")
+        futures = {}
+        deadlines = {}
+        for name, scraper in self.scrapers.items():
+            running = self._running.get(name)
+            if running is not None:
+                if not running.done():
+                    self._record(name, "busy", 0, 0.0)
+                    logger.warning(f"信息源 {name} 上次超时的采集仍在运行，本次跳过")
+                    continue
+                del self._running[name]
+            futures[executor.submit(scraper.get_daily_products, date)] = name
+            deadlines[name] = start + config.sources[name].timeout
+
+        results: Dict[str, List[ProductInfo]] = {}
+        pending = set(futures)
+        try:
+            while pending:
+                now = time.monotonic()
+                # 已超过截止时间的信息源不再等待
+                for future in [f for f in pending if deadlines[futures[f]] <= now]:
+                    pending.discard(future)
+                    if not future.cancel():
+                        self._running[futures[future]] = future
+                    self._record(futures[future], "timeout", 0, now - start)
+                    logger.error(f"信息源 {futures[future]} 超时（{config.sources[futures[future]].timeout}s），已跳过")
+                if not pending:
+                    break
+
+                next_deadline = min(deadlines[futures[f]] for f in pending)
+                done, pending = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures[future]
+                    elapsed = time.monotonic() - start
+                    try:
+                        products = future.result() or []
+                        for product in products:
+                            product.source = name
+                        results[name] = products
+                        if self.scrapers[name].used_fallback:
+                            self._record(name, "fallback", len(products), elapsed)
+                            logger.warning(f"信息源 {name} 抓取失败，返回了 {len(products)} 个后备产品")
+                        else:
+                            self._record(name, "ok", len(products), elapsed)
+                            logger.info(f"信息源 {name} 获取 {len(products)} 个产品，耗时 {elapsed:.2f}s")
+                    except Exception as e:
+                        self._record(name, "error", 0, elapsed, str(e))
+                        logger.error(f"信息源 {name} 采集失败: {e}")
+        finally:
+            # 不等待超时线程结束，由其在后台自行退出
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        products = [product for name in self.scrapers if name in results for product in results[name]]
+        logger.info(f"多信息源采集完成: {len(products)} 个产品，总耗时 {time.monotonic() - start:.2f}s")
+        return products
+
+    @property
+    def fallback_sources(self) -> List[str]:
+        """最近一次采集中抓取失败、返回后备（模拟）数据的信息源"""
+        return [name for name, run in self.last_run.items() if run["status"] == "fallback"]
+
+    def _record(self, name: str, status: str, count: int, elapsed: float, error: str = ""):
+        self.last_run[name] = {"status": status, "products": count, "elapsed": elapsed, "error": error}
@@ -0,0 +1,138 @@
+"""
+产品详情页并发抓取器
+基于 aiohttp 并发访问各产品的 Product Hunt 页面，补全创始人评论、标签、Logo 和截图
+"""
+
+import time
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+
+import aiohttp
+
+try:
+    from ..models import ProductInfo
+    from ..rate_limiter import rate_limiter
+    from ..stats import percentile
+    from .ph_html_parser import parse_post_detail_html
+except ImportError:
+    # 兼容直接运行的情况
+    from models import ProductInfo
+    from rate_limiter import rate_limiter
+    from stats import percentile
+    from scrapers.ph_html_parser import parse_post_detail_html
+
+logger = logging.getLogger(__name__)
+
+
+class ProductDetailFetcher:
+    """
+    详情页并发抓取器
+
+    - 通过信号量限制并发数
+    - 每个请求独立超时，单页失败不影响其他产品
+    - 每次请求前向全局限流器申请令牌
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, concurrency: int = 8, timeout: float = 10,
+                 archive=None):
+        self.headers = dict(headers or {})
+        # aiohttp 默认不解码 br，避免服务端返回无法解压的内容
+        self.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        # 可选的页面快照归档（SnapshotArchive）
+        self.archive = archive
+
+        self.latencies: List[float] = []
+        self.failures = 0
+
+    def enrich(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        """同步入口：并发补全产品详情，返回原列表"""
+        if not products:
+            return products
+        try:
+            asyncio.run(self.enrich_async(products))
+        except RuntimeError as e:
+            # 已处于事件循环中时无法嵌套 asyncio.run，保持原数据
+            logger.warning(f"详情页抓取未执行: {e}")
+        return products
+
+    async def enrich_async(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        """并发补全产品详情"""
+        self.latencies = []
+        self.failures = 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        start = time.perf_counter()
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout) as session:
+            results = await asyncio.gather(
+                *[self._enrich_one(session, semaphore, product) for product in products],
+                return_exceptions=True
+            )
+
+        for product, result in zip(products, results):
+            if isinstance(result, BaseException):
+                self.failures += 1
+                logger.warning(f"详情页抓取失败 {product.name}: {type(result).__name__} {result}")
+
+        elapsed = time.perf_counter() - start
+        self.log_stats(len(products), elapsed)
+        return products
+
+    async def _enrich_one(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                          product: ProductInfo):
+        url = product.original_url
+        if not url:
+            raise ValueError("缺少Product Hunt链接")
+
+        async with semaphore:
+            await rate_limiter.acquire_async(url)
+            request_start = time.perf_counter()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                content = await response.read()
+            self.latencies.append(time.perf_counter() - request_start)
+
+        if self.archive:
+            try:
+                self.archive.store(url, response.status, content, "product_hunt", response.charset)
+            except OSError as e:
+                logger.warning(f"写入详情页快照失败: {e}")
+
+        # 响应头未声明字符集时 charset 为 None，由 lxml 按页面 <meta charset> 识别
+        detail = parse_post_detail_html(content, response.charset)
+        self._apply_detail(product, detail)
+
+    @staticmethod
+    def _apply_detail(product: ProductInfo, detail: Dict[str, Any]):
+        """只填补缺失字段，不覆盖列表页已有的数据"""
+        if detail.get('maker_comment') and not product.maker_comment:
+            product.maker_comment = detail['maker_comment']
+        for topic in detail.get('topics', []):
+            if topic not in product.tags:
+                product.tags.append(topic)
+        if detail.get('logo_url') and not product.logo_url:
+            product.logo_url = detail['logo_url']
+        if detail.get('screenshot_url') and not product.screenshot_url:
+            product.screenshot_url = detail['screenshot_url']
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取单页延迟分位数"""
+        return {
+            "pages": len(self.latencies),
+            "failures": self.failures,
+            "p50": percentile(self.latencies, 50),
+            "p90": percentile(self.latencies, 90),
+            "p99": percentile(self.latencies, 99),
+            "max": max(self.latencies) if self.latencies else 0.0
+        }
+
+    def log_stats(self, total: int, elapsed: float):
+        stats = self.get_stats()
+        logger.info(
+            f"详情页抓取完成: {total - stats['failures']}/{total} 成功, 失败 {stats['failures']}, 总耗时 {elapsed:.2f}s, "
+            f"单页延迟 p50={stats['p50'] * 1000:.0f}ms p90={stats['p90'] * 1000:.0f}ms "
+            f"p99={stats['p99'] * 1000:.0f}ms max={stats['max'] * 1000:.0f}ms"
+        )
@@ -0,0 +1,93 @@
+"""
+Hacker News 抓取器
+通过 Algolia 搜索接口获取指定日期得分最高的 Show HN 帖子
+"""
+
+import re
+import html
+import logging
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+try:
+    from ..models import ProductInfo
+    from ..config import config
+    from ..rate_limiter import rate_limiter
+    from .base import BaseScraper, register_source
+except ImportError:
+    # 兼容直接运行的情况
+    from models import ProductInfo
+    from config import config
+    from rate_limiter import rate_limiter
+    from scrapers.base import BaseScraper, register_source
+
+logger = logging.getLogger(__name__)
+
+SHOW_HN_PREFIX = "Show HN:"
+
+
+@register_source("hacker_news")
+class HackerNewsScraper(BaseScraper):
+    """Hacker News Show HN 抓取器"""
+
+    def __init__(self):
+        self.source_config = config.sources[self.source_name]
+        self.base_url = self.source_config.url.rstrip('/') or "https://news.ycombinator.com"
+        self.api_url = self.source_config.api_url or "https://hn.algolia.com/api/v1/search"
+        self.session = requests.Session()
+
+    def get_daily_products(self, date: Optional[datetime] = None) -> List[ProductInfo]:
+        """获取指定日期（UTC自然日）发布的 Show HN 帖子，按得分排序"""
+        day = (date or datetime.now(timezone.utc)).date()
+        start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        end = start + timedelta(days=1)
+        max_products = self.source_config.max_products
+
+        params = {
+            "tags": "show_hn",
+            "numericFilters": f"created_at_i>={int(start.timestamp())},created_at_i<{int(end.timestamp())}",
+            # 一天的 Show HN 通常在几百条以内，一次取回后本地按得分排序
+            "hitsPerPage": 1000
+        }
+
+        rate_limiter.acquire(self.api_url)
+        response = self.session.get(self.api_url, params=params, timeout=15)
+        response.raise_for_status()
+        hits = response.json().get("hits", [])
+
+        hits.sort(key=lambda hit: hit.get("points") or 0, reverse=True)
+        products = [self._hit_to_product(hit, rank) for rank, hit in enumerate(hits[:max_products], 1)]
+        logger.info(f"Hacker News 获取到 {len(products)} 个 Show HN 产品")
+        return products
+
+    def _hit_to_product(self, hit: dict, rank: int) -> ProductInfo:
+        title = (hit.get("title") or "").strip()
+        if title.startswith(SHOW_HN_PREFIX):
+            title = title[len(SHOW_HN_PREFIX):].strip()
+
+        # "Name – tagline" 形式的标题拆成名称与一句话介绍
+        name, tagline = title, title
+        for separator in (" – ", " — ", " - ", ": "):
+            if separator in title:
+                name, tagline = [part.strip() for part in title.split(separator, 1)]
+                break
+
+        item_url = f"{self.base_url}/item?id={hit.get('objectID')}"
+        # story_text 为 HTML 片段
+        story_text = html.unescape(re.sub(r'<[^>]+>', ' ', hit.get("story_text") or ""))
+        story_text = " ".join(story_text.split())
+        return ProductInfo(
+            name=name,
+            tagline=tagline,
+            description=story_text or tagline,
+            url=hit.get("url") or item_url,
+            original_url=item_url,
+            ranking=rank,
+            votes=hit.get("points") or 0,
+            maker_comment=story_text or None,
+            tags=["Show HN"],
+            created_at=datetime.fromtimestamp(hit["created_at_i"], timezone.utc) if hit.get("created_at_i") else None,
+            source=self.source_name
+        )
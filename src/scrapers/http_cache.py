@@ -0,0 +1,152 @@
+"""
+HTTP 条件请求缓存
+在磁盘上保存响应体与校验信息（ETag / Last-Modified），
+重复抓取时携带 If-None-Match / If-Modified-Since，收到 304 时直接返回缓存内容。
+流式请求（stream=True）不在 get 中读取响应体，由调用方边下载边处理，读完后调用 record 写入缓存
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPCache:
+    """基于磁盘的条件请求缓存"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"读取HTTP缓存元数据失败: {e}")
+            return None
+
+    def _store(self, url: str, response: requests.Response, body: bytes):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": response.headers.get('Content-Type', ''),
+            "encoding": response.encoding,
+            "size": len(body),
+            "stored_at": time.time()
+        }
+        try:
+            # 先写临时文件再替换，避免并发运行时读到半截内容
+            with open(f"{body_path}.tmp", 'wb') as f:
+                f.write(body)
+            os.replace(f"{body_path}.tmp", body_path)
+            with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except OSError as e:
+            logger.warning(f"写入HTTP缓存失败: {e}")
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """
+        带条件校验的 GET 请求
+
+        stream=True 时未命中缓存的响应体不在这里读取，调用方读完后需调用 record(url, response, body)
+
+        Returns:
+            requests.Response；命中缓存时状态码为200，且 from_cache 属性为 True
+        """
+        stream = kwargs.get('stream', False)
+        meta = self._load(url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = session.get(url, headers=headers, **kwargs)
+        with self._lock:
+            self.requests += 1
+
+        if response.status_code == 304 and meta:
+            _, body_path = self._paths(url)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+
+            response.status_code = 200
+            response._content = body
+            response._content_consumed = True
+            response.encoding = meta.get('encoding') or response.encoding
+            if meta.get('content_type'):
+                response.headers['Content-Type'] = meta['content_type']
+            response.from_cache = True
+
+            with self._lock:
+                self.hits += 1
+                self.bytes_saved += len(body)
+            logger.info(f"HTTP缓存命中(304): {url}")
+            return response
+
+        response.from_cache = False
+        if not stream:
+            self.record(url, response, response.content)
+        return response
+
+    def record(self, url: str, response: requests.Response, body: bytes):
+        """记录一次未命中缓存的下载，成功的响应写入缓存"""
+        if getattr(response, 'from_cache', False) or not response.ok:
+            return
+        with self._lock:
+            self.bytes_downloaded += len(body)
+        self._store(url, response, body)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            hit_ratio = self.hits / self.requests if self.requests else 0.0
+            return {
+                "requests": self.requests,
+                "hits": self.hits,
+                "hit_ratio": hit_ratio,
+                "bytes_saved": self.bytes_saved,
+                "bytes_downloaded": self.bytes_downloaded
+            }
+
+    def log_stats(self):
+        """将缓存命中情况写入运行日志"""
+        stats = self.get_stats()
+        if not stats["requests"]:
+            return
+        logger.info(
+            f"HTTP缓存统计: 请求 {stats['requests']} 次, 命中 {stats['hits']} 次 "
+            f"({stats['hit_ratio']:.0%}), 节省 {stats['bytes_saved'] / 1024:.1f} KB, "
+            f"下载 {stats['bytes_downloaded'] / 1024:.1f} KB"
+        )
@@ -0,0 +1,550 @@
+"""
+Product Hunt 页面流式解析器
+基于 lxml 的增量解析（HTMLPullParser），边读取边提取产品信息，
+不再构建完整的 BeautifulSoup 文档树
+"""
+
+import json
+import re
+import logging
+from typing import List, Dict, Any, Optional, Iterable, Union
+
+from lxml import etree
+
+try:
+    from ..models import ProductInfo
+except ImportError:
+    # 兼容直接运行的情况
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from models import ProductInfo
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_HUNT_URL = "https://www.producthunt.com"
+THUMBNAIL_URL_TEMPLATE = "https://ph-files.imgix.net/{uuid}"
+
+# 内嵌状态脚本的识别标记
+APOLLO_MARKERS = ("ApolloSSRDataTransport", "__APOLLO_STATE__")
+
+# 每次喂给解析器的字节块大小
+CHUNK_SIZE = 64 * 1024
+
+_DIGITS_RE = re.compile(r'\d[\d,]*')
+_JS_UNDEFINED_RE = re.compile(r'(?<=[:\[,])\s*undefined\s*(?=[,\]}])')
+
+
+class ProductHuntHTMLParser:
+    """
+    Product Hunt 首页增量解析器
+
+    同时从两处提取数据：
+    1. 内嵌的 Apollo / Next.js JSON 状态（信息最完整）
+    2. 首页的 post-item 区块（JSON 状态缺失时兜底）
+    """
+
+    def __init__(self, base_url: str = PRODUCT_HUNT_URL, encoding: Optional[str] = 'utf-8'):
+        self.base_url = base_url.rstrip('/')
+        self._parser = etree.HTMLPullParser(events=('start', 'end'), recover=True, encoding=encoding)
+        self.bytes_parsed = 0
+        self.title = ""
+
+        self._state_posts: List[Dict[str, Any]] = []
+        self._dom_posts: List[Dict[str, Any]] = []
+
+        # DOM 解析状态
+        self._current_item: Optional[Dict[str, Any]] = None
+        self._item_element = None
+        self._capture_depth = 0
+
+    def feed(self, chunk: bytes):
+        """增量喂入页面内容"""
+        if not chunk:
+            return
+        self.bytes_parsed += len(chunk)
+        self._parser.feed(chunk)
+        self._drain_events()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """结束解析，返回合并后的产品记录（按排名排序）"""
+        try:
+            self._parser.close()
+        except etree.LxmlError as e:
+            logger.debug(f"HTML解析器关闭时出现错误: {e}")
+        self._drain_events()
+        return self._merge_posts()
+
+    def _drain_events(self):
+        """处理解析器中积压的事件，并及时释放已处理的节点"""
+        for event, element in self._parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ""
+
+            if event == 'start':
+                self._on_start(element, tag)
+                continue
+
+            self._on_end(element, tag)
+
+            # 不在提取区域内的节点处理完即可释放，保持内存占用平稳
+            if self._capture_depth == 0 and self._current_item is None:
+                element.clear()
+                parent = element.getparent()
+                while parent is not None and element.getprevious() is not None:
+                    del parent[0]
+
+    def _on_start(self, element, tag: str):
+        data_test = element.get('data-test') or ""
+
+        if self._current_item is None and tag == 'section' and data_test.startswith('post-item-'):
+            self._current_item = {"id": data_test[len('post-item-'):], "topics": []}
+            self._item_element = element
+            return
+
+        if self._is_capture_target(tag, data_test):
+            self._capture_depth += 1
+
+    def _on_end(self, element, tag: str):
+        data_test = element.get('data-test') or ""
+
+        if tag == 'title' and not self.title:
+            self.title = (element.text or "").strip()
+        elif tag == 'script':
+            self._handle_script(element)
+
+        if self._current_item is not None:
+            self._collect_item_field(element, tag, data_test)
+
+        if self._is_capture_target(tag, data_test):
+            self._capture_depth = max(0, self._capture_depth - 1)
+
+        if element is self._item_element:
+            if self._current_item.get('name'):
+                self._dom_posts.append(self._current_item)
+            self._current_item = None
+            self._item_element = None
+
+    @staticmethod
+    def _is_capture_target(tag: str, data_test: str) -> bool:
+        return (data_test.startswith('post-name')
+                or data_test.startswith('post-tagline')
+                or data_test == 'vote-button'
+                or tag in ('script', 'title'))
+
+    def _collect_item_field(self, element, tag: str, data_test: str):
+        """从 post-item 区块中提取字段"""
+        item = self._current_item
+        href = element.get('href') or ""
+
+        if data_test.startswith('post-name'):
+            name = _clean_text(element)
+            # 首页名称形如 "1. Cursor"
+            name = re.sub(r'^\d+\.\s*', '', name)
+            if name:
+                item['name'] = name
+            if href and 'post_url' not in item:
+                item['post_url'] = self._absolute(href)
+        elif data_test.startswith('post-tagline'):
+            item['tagline'] = _clean_text(element)
+        elif data_test == 'vote-button':
+            item['votes'] = _parse_int(_clean_text(element))
+        elif tag == 'a' and href.startswith('/topics/'):
+            topic = _clean_text(element)
+            if topic and topic not in item['topics']:
+                item['topics'].append(topic)
+        elif tag == 'a' and href.startswith(('/posts/', '/products/')) and 'post_url' not in item:
+            item['post_url'] = self._absolute(href)
+        elif tag in ('img', 'video') and 'thumbnail_url' not in item:
+            src = element.get('src') or element.get('poster')
+            if src:
+                item['thumbnail_url'] = src
+
+    def _handle_script(self, element):
+        """解析内嵌的 JSON 状态"""
+        text = element.text or ""
+        if not text:
+            return
+
+        state = None
+        if element.get('id') == '__NEXT_DATA__':
+            state = _loads_lenient(text)
+        elif any(marker in text for marker in APOLLO_MARKERS):
+            start = text.find('{')
+            if start >= 0:
+                state = _loads_lenient(text[start:])
+
+        if state is not None:
+            posts = _extract_posts_from_state(state)
+            logger.debug(f"从内嵌状态中提取到 {len(posts)} 个产品")
+            self._state_posts.extend(posts)
+
+    def _merge_posts(self) -> List[Dict[str, Any]]:
+        """合并 JSON 状态与 DOM 数据，以 JSON 状态为准"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        order: List[str] = []
+
+        for source in (self._state_posts, self._dom_posts):
+            for post in source:
+                record = self._normalize(post)
+                key = record['slug'] or record['name'].lower()
+                if key in merged:
+                    existing = merged[key]
+                    for field, value in record.items():
+                        if value and not existing.get(field):
+                            existing[field] = value
+                else:
+                    merged[key] = record
+                    order.append(key)
+
+        records = [merged[key] for key in order]
+
+        # 没有排名信息时按页面出现顺序补齐
+        for position, record in enumerate(records, 1):
+            if not record['rank']:
+                record['rank'] = position
+        records.sort(key=lambda r: r['rank'])
+        return records
+
+    def _normalize(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        post_url = post.get('post_url') or ""
+        slug = post.get('slug') or ""
+        if not slug and post_url:
+            slug = post_url.rstrip('/').rsplit('/', 1)[-1]
+        if not post_url and slug:
+            post_url = f"{self.base_url}/posts/{slug}"
+
+        return {
+            "name": (post.get('name') or "").strip(),
+            "tagline": (post.get('tagline') or "").strip(),
+            "description": (post.get('description') or "").strip(),
+            "votes": post.get('votes') or 0,
+            "rank": post.get('rank') or 0,
+            "slug": slug,
+            "post_url": post_url,
+            "website": post.get('website') or "",
+            "thumbnail_url": post.get('thumbnail_url') or "",
+            "topics": list(post.get('topics') or []),
+        }
+
+    def _absolute(self, href: str) -> str:
+        if href.startswith('http'):
+            return href.split('?')[0]
+        return f"{self.base_url}{href.split('?')[0]}"
+
+
+def declared_charset(content_type: Optional[str]) -> Optional[str]:
+    """
+    取 Content-Type 中显式声明的字符集
+
+    未声明时返回 None，由 lxml 按 BOM 与 <meta charset> 自行识别；
+    不能使用 requests 对 text/* 默认推断的 ISO-8859-1，否则会覆盖页面声明的 UTF-8
+    """
+    for param in (content_type or "").split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            return value.strip().strip('"\'') or None
+    return None
+
+
+def _clean_text(element) -> str:
+    return " ".join("".join(element.itertext()).split())
+
+
+def _parse_int(text: str) -> int:
+    match = _DIGITS_RE.search(text or "")
+    return int(match.group(0).replace(',', '')) if match else 0
+
+
+def _loads_lenient(text: str) -> Optional[Any]:
+    """解析脚本中的 JSON，容忍尾随的 JS 代码和 undefined 字面量"""
+    decoder = json.JSONDecoder()
+    for candidate in (text, _JS_UNDEFINED_RE.sub('null', text)):
+        try:
+            value, _ = decoder.raw_decode(candidate.strip())
+            return value
+        except ValueError:
+            continue
+    logger.debug("内嵌状态JSON解析失败")
+    return None
+
+
+def _extract_posts_from_state(state: Any) -> List[Dict[str, Any]]:
+    """遍历 JSON 状态，找出所有 Post 对象"""
+    refs = _collect_refs(state)
+    posts: List[Dict[str, Any]] = []
+    seen = set()
+
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            node = _resolve(node, refs)
+            if node.get('__typename') == 'Post' and node.get('name'):
+                key = node.get('id') or node.get('slug') or node.get('name')
+                if key not in seen:
+                    seen.add(key)
+                    posts.append(_post_from_state(node, refs))
+            stack.extend(reversed([v for v in node.values() if isinstance(v, (dict, list))]))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return posts
+
+
+def _collect_refs(state: Any) -> Dict[str, Dict[str, Any]]:
+    """收集 Apollo 规范化缓存中的对象（形如 "Post:123": {...}）"""
+    refs: Dict[str, Dict[str, Any]] = {}
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, dict):
+                    if ':' in key and '__typename' in value:
+                        refs[key] = value
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(node)
+    return refs
+
+
+def _resolve(node: Dict[str, Any], refs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    if '__ref' in node and len(node) == 1:
+        return refs.get(node['__ref'], {})
+    return node
+
+
+def _post_from_state(node: Dict[str, Any], refs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    thumbnail = node.get('thumbnail')
+    if isinstance(thumbnail, dict):
+        thumbnail_url = _resolve(thumbnail, refs).get('url', '')
+    elif node.get('thumbnailImageUuid'):
+        thumbnail_url = THUMBNAIL_URL_TEMPLATE.format(uuid=node['thumbnailImageUuid'])
+    else:
+        thumbnail_url = ""
+
+    post_url = node.get('url') or ""
+    if post_url and 'producthunt.com' not in post_url:
+        post_url = ""
+
+    return {
+        "name": node.get('name'),
+        "tagline": node.get('tagline'),
+        "description": node.get('description'),
+        "votes": node.get('votesCount') or node.get('latestScore') or 0,
+        "rank": node.get('dailyRank') or node.get('rank') or 0,
+        "slug": node.get('slug'),
+        "post_url": post_url.split('?')[0],
+        "website": node.get('website') or "",
+        "thumbnail_url": thumbnail_url,
+        "topics": _extract_topic_names(node.get('topics'), refs),
+    }
+
+
+def _extract_topic_names(value: Any, refs: Dict[str, Dict[str, Any]]) -> List[str]:
+    """兼容 edges/node、普通列表和 __ref 三种话题结构"""
+    if isinstance(value, dict):
+        value = _resolve(value, refs)
+        value = value.get('edges') or value.get('nodes') or []
+    if not isinstance(value, list):
+        return []
+
+    names = []
+    for entry in value:
+        if not isinstance(entry, dict):
+            continue
+        entry = _resolve(entry, refs)
+        if 'node' in entry and isinstance(entry['node'], dict):
+            entry = _resolve(entry['node'], refs)
+        name = entry.get('name')
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def parse_products_html(source: Union[bytes, Iterable[bytes]],
+                        base_url: str = PRODUCT_HUNT_URL,
+                        encoding: Optional[str] = 'utf-8') -> List[Dict[str, Any]]:
+    """
+    流式解析 Product Hunt 首页
+
+    Args:
+        source: 完整页面字节，或按块产出的字节迭代器（如 response.iter_content()）
+        base_url: 用于拼接相对链接
+        encoding: 页面编码，默认按 UTF-8 解码
+
+    Returns:
+        产品记录列表，按排名排序
+    """
+    parser = ProductHuntHTMLParser(base_url, encoding)
+    if isinstance(source, (bytes, bytearray)):
+        for offset in range(0, len(source), CHUNK_SIZE):
+            parser.feed(bytes(source[offset:offset + CHUNK_SIZE]))
+    else:
+        for chunk in source:
+            parser.feed(chunk)
+    return parser.close()
+
+
+def records_to_products(records: List[Dict[str, Any]], max_products: int) -> List[ProductInfo]:
+    """将解析得到的产品记录转换为 ProductInfo"""
+    products = []
+    for record in records[:max_products]:
+        try:
+            product = ProductInfo(
+                name=record['name'],
+                tagline=record['tagline'],
+                description=record['description'] or record['tagline'],
+                url=record['website'] or record['post_url'],
+                original_url=record['post_url'],
+                ranking=record['rank'],
+                votes=record['votes'],
+                tags=record['topics'],
+                logo_url=record['thumbnail_url'] or None
+            )
+            products.append(product)
+        except Exception as e:
+            logger.error(f"处理产品数据时出错: {e}")
+            continue
+    return products
+
+
+class ProductHuntPostParser:
+    """
+    Product Hunt 产品详情页增量解析器
+
+    提取创始人评论、话题标签、Logo 和截图，优先使用内嵌 JSON 状态，
+    缺失时回退到 og:image 等 meta 信息和话题链接
+    """
+
+    def __init__(self, encoding: Optional[str] = 'utf-8'):
+        self._parser = etree.HTMLPullParser(events=('end',), recover=True, encoding=encoding)
+        self.detail: Dict[str, Any] = {"maker_comment": "", "topics": [], "logo_url": "", "screenshot_url": ""}
+
+    def feed(self, chunk: bytes):
+        if not chunk:
+            return
+        self._parser.feed(chunk)
+        self._drain_events()
+
+    def close(self) -> Dict[str, Any]:
+        try:
+            self._parser.close()
+        except etree.LxmlError as e:
+            logger.debug(f"HTML解析器关闭时出现错误: {e}")
+        self._drain_events()
+        return self.detail
+
+    def _drain_events(self):
+        for _, element in self._parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ""
+            detail = self.detail
+
+            if tag == 'script':
+                self._handle_script(element)
+            elif tag == 'meta':
+                prop = element.get('property') or element.get('name') or ""
+                if prop in ('og:image', 'twitter:image') and not detail['screenshot_url']:
+                    detail['screenshot_url'] = element.get('content') or ""
+            elif tag == 'a' and (element.get('href') or "").startswith('/topics/'):
+                topic = _clean_text(element)
+                if topic and topic not in detail['topics']:
+                    detail['topics'].append(topic)
+
+            # 链接内的节点要留给链接取文本，其余节点处理完即释放
+            if next(element.iterancestors('a'), None) is None:
+                element.clear(keep_tail=True)
+
+    def _handle_script(self, element):
+        text = element.text or ""
+        state = None
+        if element.get('id') == '__NEXT_DATA__':
+            state = _loads_lenient(text)
+        elif any(marker in text for marker in APOLLO_MARKERS):
+            start = text.find('{')
+            if start >= 0:
+                state = _loads_lenient(text[start:])
+        if state is None:
+            return
+
+        refs = _collect_refs(state)
+        detail = self.detail
+        for node in _iter_typed_nodes(state, refs):
+            typename = node.get('__typename')
+            if typename == 'Post':
+                post = _post_from_state(node, refs)
+                for topic in post['topics']:
+                    if topic not in detail['topics']:
+                        detail['topics'].append(topic)
+                if post['thumbnail_url'] and not detail['logo_url']:
+                    detail['logo_url'] = post['thumbnail_url']
+                screenshot = _first_media_url(node.get('media'), refs)
+                if screenshot:
+                    detail['screenshot_url'] = screenshot
+            elif typename == 'Comment' and not detail['maker_comment'] and _is_maker_comment(node, refs):
+                detail['maker_comment'] = _html_to_text(node.get('body') or node.get('bodyHtml') or "")
+
+
+def _iter_typed_nodes(state: Any, refs: Dict[str, Dict[str, Any]]):
+    """按文档顺序遍历带 __typename 的对象"""
+    seen = set()
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            node = _resolve(node, refs)
+            if '__typename' in node and id(node) not in seen:
+                seen.add(id(node))
+                yield node
+            stack.extend(reversed([v for v in node.values() if isinstance(v, (dict, list))]))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _is_maker_comment(node: Dict[str, Any], refs: Dict[str, Dict[str, Any]]) -> bool:
+    if node.get('isMaker') or node.get('isSticky'):
+        return True
+    user = node.get('user')
+    if isinstance(user, dict):
+        user = _resolve(user, refs)
+        return bool(user.get('isMaker'))
+    return False
+
+
+def _first_media_url(value: Any, refs: Dict[str, Dict[str, Any]]) -> str:
+    if not isinstance(value, list):
+        return ""
+    for entry in value:
+        if not isinstance(entry, dict):
+            continue
+        entry = _resolve(entry, refs)
+        if entry.get('url'):
+            return entry['url']
+        if entry.get('imageUuid'):
+            return THUMBNAIL_URL_TEMPLATE.format(uuid=entry['imageUuid'])
+    return ""
+
+
+def _html_to_text(html: str) -> str:
+    if '<' not in html:
+        return html.strip()
+    fragment = etree.fromstring(f"<div>{html}</div>", etree.HTMLParser())
+    return " ".join("".join(fragment.itertext()).split())
+
+
+def parse_post_detail_html(source: Union[bytes, Iterable[bytes]], encoding: Optional[str] = 'utf-8') -> Dict[str, Any]:
+    """
+    解析产品详情页
+
+    Returns:
+        包含 maker_comment、topics、logo_url、screenshot_url 的字典
+    """
+    parser = ProductHuntPostParser(encoding)
+    if isinstance(source, (bytes, bytearray)):
+        for offset in range(0, len(source), CHUNK_SIZE):
+            parser.feed(bytes(source[offset:offset + CHUNK_SIZE]))
+    else:
+        for chunk in source:
+            parser.feed(chunk)
+    return parser.close()
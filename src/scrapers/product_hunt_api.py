@@ -0,0 +1,149 @@
+"""
+Product Hunt GraphQL API 客户端
+按日期分页拉取当天发布的全部产品，只请求日报需要的字段
+"""
+
+import logging
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+
+import pytz
+import requests
+
+try:
+    from ..rate_limiter import rate_limiter
+except ImportError:
+    from rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Product Hunt 的"一天"以太平洋时间划分
+PRODUCT_HUNT_TIMEZONE = pytz.timezone('America/Los_Angeles')
+
+# 单页最大条数，超过后 API 会因复杂度限制拒绝请求
+MAX_PAGE_SIZE = 50
+
+DAILY_POSTS_QUERY = """
+query DailyPosts($postedAfter: DateTime!, $postedBefore: DateTime!, $first: Int!, $after: String) {
+  posts(postedAfter: $postedAfter, postedBefore: $postedBefore, order: RANKING, first: $first, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    edges {
+      node {
+        id
+        name
+        tagline
+        description
+        slug
+        url
+        website
+        votesCount
+        thumbnail { url }
+        topics(first: 5) { edges { node { name } } }
+      }
+    }
+  }
+}
+"""
+
+
+class ProductHuntGraphQLClient:
+    """Product Hunt GraphQL API 客户端"""
+
+    def __init__(self, api_url: str, api_token: str, session: Optional[requests.Session] = None,
+                 page_size: int = MAX_PAGE_SIZE, timeout: int = 15):
+        self.api_url = api_url
+        self.api_token = api_token
+        self.page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+        # 本次运行的请求次数，用于观察分页轮次
+        self.requests_made = 0
+
+    @staticmethod
+    def day_window(date: Optional[datetime] = None) -> Dict[str, str]:
+        """计算指定日期在 Product Hunt 时区下的起止时间"""
+        if date is None:
+            day = datetime.now(PRODUCT_HUNT_TIMEZONE).date()
+        elif date.tzinfo is not None:
+            day = date.astimezone(PRODUCT_HUNT_TIMEZONE).date()
+        else:
+            day = date.date()
+
+        start = PRODUCT_HUNT_TIMEZONE.localize(datetime(day.year, day.month, day.day))
+        end = PRODUCT_HUNT_TIMEZONE.localize(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+        return {"postedAfter": start.isoformat(), "postedBefore": end.isoformat()}
+
+    def fetch_daily_posts(self, date: Optional[datetime] = None, max_posts: int = 10) -> List[Dict[str, Any]]:
+        """
+        分页拉取指定日期的产品
+
+        Args:
+            date: 指定日期，默认为今天
+            max_posts: 最多拉取的产品数量
+
+        Returns:
+            产品记录列表（字段与首页解析器一致），按排名排序
+        """
+        variables: Dict[str, Any] = self.day_window(date)
+        records: List[Dict[str, Any]] = []
+        cursor = None
+
+        while len(records) < max_posts:
+            variables["first"] = min(self.page_size, max_posts - len(records))
+            variables["after"] = cursor
+
+            connection = self._execute(DAILY_POSTS_QUERY, variables)["posts"]
+            for edge in connection.get("edges", []):
+                records.append(self._record_from_node(edge["node"], rank=len(records) + 1))
+
+            page_info = connection.get("pageInfo", {})
+            if not page_info.get("hasNextPage") or not page_info.get("endCursor"):
+                break
+            cursor = page_info["endCursor"]
+
+        logger.info(f"GraphQL API 拉取到 {len(records)} 个产品，共 {self.requests_made} 次请求")
+        return records[:max_posts]
+
+    def _execute(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """执行一次 GraphQL 查询"""
+        headers = {
+            "Authorization": f"Bearer {self.api_token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        self.requests_made += 1
+        rate_limiter.acquire(self.api_url)
+        response = self.session.post(
+            self.api_url,
+            json={"query": query, "variables": variables},
+            headers=headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        if result.get("errors"):
+            messages = "; ".join(error.get("message", str(error)) for error in result["errors"])
+            raise Exception(f"Product Hunt GraphQL 查询失败: {messages}")
+        if not result.get("data"):
+            raise Exception("Product Hunt GraphQL 返回格式异常：缺少data字段")
+        return result["data"]
+
+    @staticmethod
+    def _record_from_node(node: Dict[str, Any], rank: int) -> Dict[str, Any]:
+        topics = [edge["node"]["name"] for edge in (node.get("topics") or {}).get("edges", [])
+                  if edge.get("node", {}).get("name")]
+        thumbnail = node.get("thumbnail") or {}
+        return {
+            "name": node.get("name") or "",
+            "tagline": node.get("tagline") or "",
+            "description": node.get("description") or "",
+            "votes": node.get("votesCount") or 0,
+            "rank": rank,
+            "slug": node.get("slug") or "",
+            "post_url": (node.get("url") or "").split('?')[0],
+            "website": node.get("website") or "",
+            "thumbnail_url": thumbnail.get("url") or "",
+            "topics": topics,
+        }
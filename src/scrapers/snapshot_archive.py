@@ -0,0 +1,156 @@
+"""
+原始页面快照归档
+按内容哈希保存抓取到的页面（gzip 或 zstd 压缩），相同内容只存一份，
+清单文件 manifest.jsonl 记录每次抓取的 URL、时间和状态码，用于离线重放解析
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.jsonl"
+
+# 按归档根目录共享的锁：回填的各工作线程各自创建归档实例，但写入同一个清单文件
+_root_locks: Dict[str, threading.Lock] = {}
+_root_locks_guard = threading.Lock()
+
+
+def _root_lock(root: str) -> threading.Lock:
+    key = os.path.realpath(root)
+    with _root_locks_guard:
+        return _root_locks.setdefault(key, threading.Lock())
+
+
+def _zstd():
+    """zstandard 为可选依赖，未安装时回退到 gzip"""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+class SnapshotArchive:
+    """内容寻址的页面快照归档"""
+
+    def __init__(self, root: str, compression: str = "gzip"):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifest_path = os.path.join(root, MANIFEST_FILE)
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        if compression == "zstd" and _zstd() is None:
+            logger.warning("未安装 zstandard，快照归档改用 gzip 压缩")
+            compression = "gzip"
+        self.compression = compression
+        self._lock = _root_lock(root)
+
+    def _blob_path(self, digest: str, compression: str) -> str:
+        suffix = "zst" if compression == "zstd" else "gz"
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.{suffix}")
+
+    def _compress(self, body: bytes) -> bytes:
+        if self.compression == "zstd":
+            return _zstd().ZstdCompressor(level=10).compress(body)
+        return gzip.compress(body, compresslevel=6)
+
+    def store(self, url: str, status: int, body: bytes, source: str = "",
+              encoding: Optional[str] = None) -> str:
+        """
+        保存一次抓取结果
+
+        Returns:
+            页面内容的 sha256 摘要
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest, self.compression)
+        entry = {
+            "url": url,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "status": status,
+            "digest": digest,
+            "size": len(body),
+            "compression": self.compression,
+            "source": source,
+            "encoding": encoding
+        }
+
+        if not os.path.exists(blob_path):
+            self._write_blob(blob_path, self._compress(body))
+
+        # 每条记录以一次 write 写入完整的一行，同一根目录下的写入由共享锁串行化
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+        with self._lock:
+            with open(self.manifest_path, 'ab') as f:
+                f.write(line)
+
+        return digest
+
+    @staticmethod
+    def _write_blob(blob_path: str, data: bytes):
+        """先写入唯一命名的临时文件再原子替换，并发写入同一内容时互不干扰"""
+        directory = os.path.dirname(blob_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, blob_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def read(self, digest: str, compression: Optional[str] = None) -> bytes:
+        """按摘要读取页面原始内容"""
+        for candidate in ([compression] if compression else ["gzip", "zstd"]):
+            path = self._blob_path(digest, candidate)
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            if candidate == "zstd":
+                zstandard = _zstd()
+                if zstandard is None:
+                    raise RuntimeError("读取 zstd 快照需要安装 zstandard")
+                return zstandard.ZstdDecompressor().decompress(data, max_output_size=256 * 1024 * 1024)
+            return gzip.decompress(data)
+        raise FileNotFoundError(f"快照不存在: {digest}")
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """按抓取顺序遍历清单记录"""
+        if not os.path.exists(self.manifest_path):
+            return
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning("快照清单中存在损坏的记录，已跳过")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """统计抓取次数、去重后的快照数和磁盘占用"""
+        entries = list(self.iter_entries())
+        unique = {entry["digest"] for entry in entries}
+        stored_bytes = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            stored_bytes += sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames)
+        return {
+            "fetches": len(entries),
+            "unique_snapshots": len(unique),
+            "raw_bytes": sum(entry["size"] for entry in {e["digest"]: e for e in entries}.values()),
+            "stored_bytes": stored_bytes
+        }
@@ -0,0 +1,16 @@
+"""
+统计工具
+延迟分位数等与具体模块无关的小工具，抓取器与大模型调用统计共用
+"""
+
+import math
+from typing import List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算百分位数（最近秩法）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
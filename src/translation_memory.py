@@ -0,0 +1,134 @@
+"""
+语言检测与翻译记忆
+按中日韩字符占比快速判断文本是否已是中文，已是中文的文本不再翻译；
+已翻译过的句子按哈希持久化，重复出现的标语和模板化描述只翻译一次
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# 中日韩统一表意文字及常用中文标点
+_CJK_PATTERN = re.compile(r'[㐀-䶿一-鿿豈-﫿　-〿＀-￯]')
+# 计入占比分母的字符：CJK 与拉丁字母数字（空白和符号不计）
+_COUNTED_PATTERN = re.compile(r'[㐀-䶿一-鿿豈-﫿　-〿＀-￯A-Za-z0-9]')
+# 句子切分：句末标点后的空白，或换行
+_SEGMENT_PATTERN = re.compile(r'(?<=[.!?。！？])\s+|\n+')
+
+# CJK 字符占比超过该值即视为中文（中文里常夹杂英文产品名）
+CHINESE_RATIO_THRESHOLD = 0.3
+
+
+def cjk_ratio(text: str) -> float:
+    """CJK 字符在文字字符中的占比"""
+    if not text:
+        return 0.0
+    counted = len(_COUNTED_PATTERN.findall(text))
+    if not counted:
+        return 0.0
+    return len(_CJK_PATTERN.findall(text)) / counted
+
+
+def is_chinese(text: str) -> bool:
+    """文本是否已是中文"""
+    return cjk_ratio(text) >= CHINESE_RATIO_THRESHOLD
+
+
+def split_segments(text: str) -> List[str]:
+    """按句子切分文本，合并多余空白"""
+    return [" ".join(segment.split()) for segment in _SEGMENT_PATTERN.split(text or "") if segment.strip()]
+
+
+def _segment_key(segment: str) -> str:
+    return hashlib.sha256(" ".join(segment.split()).encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """基于 SQLite 的句段级翻译记忆，多线程共享一个连接"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            " segment_hash TEXT PRIMARY KEY,"
+            " source TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup_segments(self, segments: List[str]) -> Dict[str, str]:
+        """批量查询句段译文，返回 {句段: 译文}"""
+        if not segments:
+            return {}
+        keys = {_segment_key(segment): segment for segment in segments}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT segment_hash, translation FROM segments WHERE segment_hash IN ({','.join('?' * len(keys))})",
+                list(keys)
+            ).fetchall()
+            found = {keys[key]: translation for key, translation in rows}
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def store(self, pairs: Dict[str, str]):
+        """记录 {原文句段: 译文}"""
+        rows = [(_segment_key(source), source, translation, time.time())
+                for source, translation in pairs.items() if source and translation]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO segments (segment_hash, source, translation, created_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def lookup_text(self, text: str) -> Optional[str]:
+        """
+        查询整段文本的译文
+
+        先按整段查询，再按句段拼接；任一句段既非中文也无记忆时返回 None
+        """
+        whole = self.lookup_segments([text]).get(text) if text else None
+        if whole:
+            return whole
+        segments = split_segments(text)
+        foreign = [segment for segment in segments if not is_chinese(segment)]
+        found = self.lookup_segments(foreign)
+        if len(found) < len(set(foreign)):
+            return None
+        return "".join(segment if is_chinese(segment) else found[segment] for segment in segments)
+
+
+def _create_translation_memory() -> Optional[TranslationMemory]:
+    """根据配置创建全局翻译记忆，未启用或不可用时返回 None"""
+    if not config.cache.translation_memory_enabled:
+        return None
+    try:
+        return TranslationMemory(os.path.join(config.cache.dir, "translation_memory.sqlite3"))
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"翻译记忆不可用，已禁用: {e}")
+        return None
+
+
+# 全局翻译记忆实例
+translation_memory = _create_translation_memory()
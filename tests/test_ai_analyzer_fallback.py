@@ -0,0 +1,34 @@
+"""单产品分析：调用未返回结果的产品不计入分析结果"""
+
+import asyncio
+
+from src.ai_analyzer import AsyncAIAnalyzer
+from src.models import ProductInfo
+
+
+def _product(name: str) -> ProductInfo:
+    return ProductInfo(
+        name=name, tagline="AI writing assistant", description="Writes drafts with AI",
+        url=f"https://{name}.example.com", original_url=f"https://www.producthunt.com/posts/{name}",
+        ranking=1, votes=100
+    )
+
+
+def test_empty_combined_response_drops_product(monkeypatch):
+    analyzer = AsyncAIAnalyzer()
+    calls = []
+
+    async def fake_call(messages, temperature=None, max_tokens=None, call_site="other"):
+        calls.append(call_site)
+        if "Broken" in messages[0]["content"]:
+            return ""
+        return ('{"ai_relevance_score": 0.9, "translated_description": "用AI撰写草稿", '
+                '"application_scenarios": ["写作"], "founder_insights": "暂无创始人评论信息"}')
+
+    monkeypatch.setattr(analyzer, "_call_ai_api", fake_call)
+    analyzed = asyncio.run(analyzer._fallback_single_analysis([_product("Broken"), _product("Works")]))
+
+    assert [product.name for product in analyzed] == ["Works"]
+    assert analyzed[0].ai_relevance_score == 0.9
+    # 未返回结果时不再追加逐项调用
+    assert calls == ["combined", "combined"]
@@ -0,0 +1,33 @@
+"""跨日分析备忘：原文已是中文的产品同样记入备忘"""
+
+from src.analysis_memo import AnalysisMemo
+from src.models import ProductInfo
+
+
+def _product(description: str, translated: str) -> ProductInfo:
+    return ProductInfo(
+        name="Demo", tagline="tagline", description=description,
+        url="https://demo.example.com", original_url="https://www.producthunt.com/posts/demo/",
+        ranking=1, votes=100, ai_relevance_score=0.8,
+        application_scenarios=["场景"], translated_description=translated
+    )
+
+
+def test_chinese_description_is_stored(tmp_path):
+    memo = AnalysisMemo(str(tmp_path / "memo.sqlite3"))
+    description = "一款帮助团队整理会议纪要的智能助手"
+
+    assert memo.store([_product(description, description)]) == 1
+
+    reused, pending = memo.split_products([_product(description, "")])
+    assert not pending
+    assert reused[0].translated_description == description
+    assert reused[0].ai_relevance_score == 0.8
+
+
+def test_untranslated_english_description_is_skipped(tmp_path):
+    memo = AnalysisMemo(str(tmp_path / "memo.sqlite3"))
+    description = "An assistant that keeps meeting notes organized"
+
+    assert memo.store([_product(description, description)]) == 0
+    assert memo.store([_product(description, "整理会议纪要的助手")]) == 1
@@ -0,0 +1,38 @@
+"""多信息源采集：超时后仍在运行的抓取器不会被再次提交"""
+
+import threading
+
+from src.config import config
+from src.scrapers.base import BaseScraper
+from src.scrapers.collector import SourceCollector
+
+
+class BlockingScraper(BaseScraper):
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def get_daily_products(self, date=None):
+        self.calls += 1
+        self.release.wait(5)
+        return []
+
+
+def test_timed_out_source_is_skipped_until_finished(monkeypatch):
+    monkeypatch.setattr(config.sources['product_hunt'], 'timeout', 0.1)
+    collector = SourceCollector(['product_hunt'])
+    scraper = BlockingScraper()
+    collector.scrapers = {'product_hunt': scraper}
+
+    collector.collect()
+    assert collector.last_run['product_hunt']['status'] == "timeout"
+
+    collector.collect()
+    assert collector.last_run['product_hunt']['status'] == "busy"
+    assert scraper.calls == 1
+
+    scraper.release.set()
+    collector._running['product_hunt'].result(timeout=5)
+    collector.collect()
+    assert collector.last_run['product_hunt']['status'] == "ok"
+    assert scraper.calls == 2
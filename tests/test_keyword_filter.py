@@ -0,0 +1,58 @@
+"""关键词预筛选：已知的AI产品不会在调用大模型前被剔除"""
+
+import glob
+import json
+import os
+
+import pytest
+
+from src.config import config
+from src.keyword_filter import KeywordMatcher
+from src.models import ProductInfo
+
+REPORTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "reports")
+
+
+@pytest.fixture
+def matcher():
+    return KeywordMatcher(config.filtering.ai_keywords, config.filtering.exclude_keywords)
+
+
+def _product(name: str, tagline: str, description: str = "") -> ProductInfo:
+    return ProductInfo(name=name, tagline=tagline, description=description, url="", original_url="",
+                       ranking=1, votes=0)
+
+
+@pytest.mark.parametrize("name, tagline, description", [
+    ("SmythOS", "The open source agent OS", "Open source operating system designed specifically for AI agents"),
+    ("Cekura", "Launch reliable voice & chat AI agents 10x faster", ""),
+    ("Runbear", "Your best new hire, but AI — in Slack!", ""),
+    ("Pokecut", "Create photos with just a few clicks", "Pokecut是一个AI驱动的全能网页编辑器"),
+    ("CodeAssist", "Your intelligent coding companion", "程序员的智能编程伙伴，提供代码补全与错误检测"),
+    ("Prompt Lab", "Evaluate LLM prompts side by side", ""),
+])
+def test_known_ai_products_are_kept(matcher, name, tagline, description):
+    assert matcher.is_ai_related(_product(name, tagline, description))
+
+
+def test_unrelated_products_are_dropped(matcher):
+    kept, dropped = matcher.split_products([
+        _product("Sockify", "Subscription socks, said to be the comfiest"),
+        _product("Trailhead", "Plan hiking trips with friends"),
+    ])
+    assert not kept
+    assert len(dropped) == 2
+
+
+def test_reports_recall(matcher):
+    """历史日报中大模型评为高相关的产品，预筛选至少保留九成"""
+    relevant = []
+    for path in glob.glob(os.path.join(REPORTS_DIR, "*.json")):
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        relevant += [p for p in report.get("products", []) if (p.get("ai_relevance_score") or 0) >= 0.7]
+    if not relevant:
+        pytest.skip("没有历史日报")
+    kept = [p for p in relevant if matcher.is_ai_related(
+        _product(p.get("name", ""), p.get("tagline", ""), p.get("description", "")))]
+    assert len(kept) / len(relevant) >= 0.9
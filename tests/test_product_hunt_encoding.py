@@ -0,0 +1,56 @@
+"""列表页字符集：响应头未声明 charset 时按页面 <meta charset> 解码"""
+
+import requests
+
+from src.scrapers.ph_html_parser import declared_charset
+from src.scrapers.product_hunt import ProductHuntScraper
+
+TAGLINE = "中文 ✓ 智能助手"
+
+
+def _page() -> bytes:
+    items = "".join(
+        f'<section data-test="post-item-{i}">'
+        f'<a href="/posts/demo-{i}" data-test="post-name-{i}">{i}. Demo {i}</a>'
+        f'<a data-test="post-tagline-{i}">{TAGLINE}</a>'
+        f'<button data-test="vote-button">{100 - i}</button>'
+        f'</section>'
+        for i in range(1, 4)
+    )
+    padding = "<p>" + "Product Hunt " * 200 + "</p>"
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>今日产品 ✓</title></head>'
+            f'<body>{items}{padding}</body></html>').encode('utf-8')
+
+
+def _response(body: bytes, content_type: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = "https://www.producthunt.com"
+    response.headers['Content-Type'] = content_type
+    response._content = body
+    response._content_consumed = True
+    # 与 HTTPAdapter.build_response 一致，按响应头推断编码
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def test_declared_charset():
+    assert declared_charset("text/html") is None
+    assert declared_charset(None) is None
+    assert declared_charset("text/html; charset=UTF-8") == "UTF-8"
+    assert declared_charset('text/html; Charset="gbk"') == "gbk"
+
+
+def test_charsetless_header_uses_meta_charset(monkeypatch):
+    response = _response(_page(), "text/html")
+    # requests 对未声明字符集的 text/* 推断为 ISO-8859-1，不能据此解码
+    assert response.encoding == "ISO-8859-1"
+
+    scraper = ProductHuntScraper()
+    scraper.archive = None
+    monkeypatch.setattr(scraper, "_fetch", lambda url, **kwargs: response)
+
+    products = scraper._scrape_with_requests(10)
+
+    assert [product.name for product in products] == ["Demo 1", "Demo 2", "Demo 3"]
+    assert all(product.tagline == TAGLINE for product in products)
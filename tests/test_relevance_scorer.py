@@ -0,0 +1,34 @@
+"""本地相关性打分器：预测概率按产品键记录，跳过的产品不留记录"""
+
+from src.models import ProductInfo
+from src.relevance_model import RelevanceScorer
+
+
+class FixedModel:
+    def __init__(self, probabilities):
+        self.probabilities = probabilities
+
+    def predict_proba(self, texts):
+        return [self.probabilities[text.split()[0]] for text in texts]
+
+
+def _product(name: str, score: float = 0.0) -> ProductInfo:
+    return ProductInfo(
+        name=name, tagline="tagline", description="description",
+        url=f"https://{name}.example.com", original_url=f"https://www.producthunt.com/posts/{name}",
+        ranking=1, votes=100, ai_relevance_score=score
+    )
+
+
+def test_probabilities_keyed_by_product():
+    scorer = RelevanceScorer(FixedModel({"agent": 0.9, "socks": 0.05}), threshold=0.5, skip_below=0.2)
+
+    candidates, skipped = scorer.split_products([_product("agent"), _product("socks")])
+    assert [p.name for p in candidates] == ["agent"]
+    assert [p.name for p in skipped] == ["socks"]
+    assert len(scorer._probabilities) == 1
+
+    # 分析结果可能是另一个对象（如复用、重新采集），按产品键仍能对上
+    scorer.record([_product("agent", score=0.8), _product("socks", score=0.9)])
+    assert (scorer.compared, scorer.agreed) == (1, 1)
+    assert not scorer._probabilities
@@ -0,0 +1,28 @@
+"""页面快照归档：多个实例并发写入同一根目录"""
+
+import os
+import threading
+
+from src.scrapers.snapshot_archive import SnapshotArchive
+
+
+def test_concurrent_instances_share_manifest(tmp_path):
+    root = str(tmp_path / "archive")
+    archives = [SnapshotArchive(root) for _ in range(4)]
+    body = ("<html>" + "产品 " * 5000 + "</html>").encode('utf-8')
+
+    def worker(archive):
+        for i in range(50):
+            archive.store(f"https://www.producthunt.com/?page={i}", 200, body, source="product_hunt")
+
+    threads = [threading.Thread(target=worker, args=(archive,)) for archive in archives]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    entries = list(archives[0].iter_entries())
+    assert len(entries) == 200
+    assert archives[0].read(entries[0]["digest"]) == body
+    leftovers = [name for _, _, names in os.walk(archives[0].objects_dir) for name in names if name.endswith(".tmp")]
+    assert not leftovers